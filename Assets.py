@@ -0,0 +1,75 @@
+# Assets.py —— 字体与图标资源：同步加载，或先显示界面再在后台加载
+import os, sys, threading
+from PyQt5.QtCore import QObject, QSize, pyqtSignal
+from PyQt5.QtGui import QFontDatabase, QFont, QIcon
+
+import StartupProfile as prof
+
+EN_FAMILY = "SVGASYS"
+ZH_FALLBACK = "SimHei"
+ICON_SMALL = "sticky_note_icon_64.png"   # 托盘 / 任务栏用的小图，几 KB
+ICON_LARGE = "sticky_note_icon.ico"      # 1024px 原图，只在需要大尺寸时才解码
+
+def base_dir():
+    # 兼容打包后的路径
+    if getattr(sys, "frozen", False):
+        return sys._MEIPASS
+    return os.path.dirname(os.path.abspath(__file__))
+
+def deferred_mode():
+    return os.environ.get("STICKYNOTES_DEFERRED")=="1" or "--deferred" in sys.argv
+
+def apply_fonts(app, zh_fam):
+    f = QFont(EN_FAMILY, 12)
+    f.setStyleStrategy(QFont.PreferDefault)
+    app.setFont(f)
+    app.setStyleSheet(f"""
+        * {{
+            font-family: "{EN_FAMILY}", "{zh_fam}";
+            font-size: 12pt;
+        }}
+    """)
+
+def _families(font_id):
+    fams = QFontDatabase.applicationFontFamilies(font_id) if font_id!=-1 else []
+    return fams[0] if fams else ZH_FALLBACK
+
+def load_fonts(app):
+    zh_id = QFontDatabase.addApplicationFont(os.path.join(base_dir(), "fonts", "SimHei.ttf"))
+    apply_fonts(app, _families(zh_id))
+    prof.mark("font registration")
+
+
+class _FontLoader(QObject):
+    loaded = pyqtSignal(bytes)
+
+
+def load_fonts_deferred(app):
+    # 先用系统里的同名字体把界面画出来；字体文件在后台线程读入，
+    # 读完后回到 GUI 线程注册并刷新一次全局样式
+    apply_fonts(app, ZH_FALLBACK)
+    loader = _FontLoader(app)
+
+    def register(data):
+        if data:
+            apply_fonts(app, _families(QFontDatabase.addApplicationFontFromData(data)))
+        prof.mark("font registration (deferred)")
+        loader.deleteLater()
+
+    def read():
+        try:
+            with open(os.path.join(base_dir(), "fonts", "SimHei.ttf"), "rb") as f:
+                data = f.read()
+        except OSError:
+            data = b""
+        loader.loaded.emit(data)
+
+    loader.loaded.connect(register)
+    threading.Thread(target=read, name="font-loader", daemon=True).start()
+
+def app_icon():
+    icon = QIcon(os.path.join(base_dir(), ICON_SMALL))
+    # 给定尺寸才是惰性加载；不给尺寸 Qt 会为 .ico 把整张图读一遍
+    icon.addFile(os.path.join(base_dir(), ICON_LARGE), QSize(1024, 1024))
+    prof.mark("icon decode")
+    return icon
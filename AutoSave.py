@@ -0,0 +1,160 @@
+# AutoSave.py
+import time, threading
+from collections import deque
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+AUTOSAVE_DELAY = 800   # 防抖窗口（毫秒）
+LATENCY_WINDOW = 256   # 只保留最近这么多次写入的耗时
+
+
+class AutoSaveStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.edits_seen = 0        # 收到的编辑信号
+        self.snapshots = 0         # 提交给写线程的快照
+        self.writes = 0            # 实际落盘次数
+        self.bytes_written = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)   # 最近几次写入耗时（秒）
+        self.write_s_total = 0.0   # 累计值，进程常驻也不增长
+        self.write_s_max = 0.0
+        self.errors = 0
+        self.last_error = None
+
+    def as_dict(self):
+        with self.lock:
+            recent = sorted(self.latencies)
+            return {
+                "edits_seen": self.edits_seen,
+                "snapshots": self.snapshots,
+                "writes_issued": self.writes,
+                "coalesced": self.edits_seen - self.writes,
+                "bytes_written": self.bytes_written,
+                "write_ms_avg": 1000*self.write_s_total/self.writes if self.writes else 0.0,
+                "write_ms_max": 1000*self.write_s_max,
+                "write_ms_p95_recent": 1000*recent[int(len(recent)*0.95)] if recent else 0.0,
+                "errors": self.errors,
+                "last_error": None if self.last_error is None else repr(self.last_error),
+            }
+
+    def record_write(self, n, dt):
+        with self.lock:
+            self.writes += 1
+            self.bytes_written += n or 0
+            self.latencies.append(dt)
+            self.write_s_total += dt
+            self.write_s_max = max(self.write_s_max, dt)
+
+
+class _Writer:
+    # 所有便签共用一个写线程；同一目标未写入的旧快照直接被新快照替换
+    def __init__(self):
+        self.cond = threading.Condition()
+        self.pending = {}          # key -> (sink, data, stats)
+        self.busy = set()
+        self.errors = {}           # key -> 该目标最近一次写入失败的异常；写成功即清除
+        self.thread = None
+
+    def submit(self, key, sink, data, stats):
+        with self.cond:
+            self.pending[key] = (sink, data, stats)
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+                self.thread.start()
+            self.cond.notify_all()
+
+    def wait(self, key):
+        # 等该目标写完，返回最近一次写入的异常（成功为 None）
+        with self.cond:
+            while key in self.pending or key in self.busy:
+                self.cond.wait()
+            return self.errors.get(key)
+
+    def error(self, key):
+        with self.cond:
+            return self.errors.get(key)
+
+    def _run(self):
+        while True:
+            with self.cond:
+                while not self.pending:
+                    self.cond.wait()
+                key = next(iter(self.pending))
+                sink, data, stats = self.pending.pop(key)
+                self.busy.add(key)
+            t0 = time.perf_counter()
+            err = None
+            try:
+                n = sink(data)      # 序列化也在写线程里做
+                stats.record_write(n, time.perf_counter()-t0)
+            except Exception as e:
+                err = e
+                with stats.lock:
+                    stats.errors += 1
+                    stats.last_error = e
+            with self.cond:
+                if err is None:
+                    self.errors.pop(key, None)
+                else:
+                    self.errors[key] = err
+                self.busy.discard(key)
+                self.cond.notify_all()
+
+_writer = _Writer()
+
+
+class AutoSaver(QObject):
+    # snapshot() 在 GUI 线程取数据，返回 (key, sink, dict) 或 None；
+    # sink(dict) 在写线程执行并返回写入字节数
+    committed = pyqtSignal(object, object)   # (key, dict)，每个快照提交后发出
+    failed = pyqtSignal(object, object)      # (key, 异常)：写盘开始失败时发一次；恢复正常时发 (key, None)
+    def __init__(self, snapshot, parent=None, delay=AUTOSAVE_DELAY):
+        super().__init__(parent)
+        self.snapshot = snapshot
+        self.dirty = False
+        self.last_key = None
+        self.error = None      # 已知的最近一次写盘失败
+        self.stats = AutoSaveStats()
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(delay)
+        self.timer.timeout.connect(self._commit)
+
+    def mark_dirty(self, *_):
+        self.dirty = True
+        with self.stats.lock:
+            self.stats.edits_seen += 1
+        self.timer.start()     # 连续输入时不断重置计时器
+
+    def _commit(self):
+        if not self.dirty:
+            return None
+        snap = self.snapshot()
+        if not snap:
+            return None
+        key, sink, data = snap
+        self._check(key)        # 上一次写入的结果在这里回到 GUI 线程
+        self.dirty = False; self.last_key = key
+        with self.stats.lock:
+            self.stats.snapshots += 1
+        _writer.submit(key, sink, data, self.stats)
+        self.committed.emit(key, data)
+        return key
+
+    def _check(self, key, err=None):
+        err = err if err is not None else _writer.error(key)
+        if (err is None) != (self.error is None):
+            self.failed.emit(key, err)
+        self.error = err
+        return err
+
+    def flush(self):
+        # 关闭窗口时调用：立即提交并等待写完。返回最后一次写入的异常（成功为 None）；
+        # 失败时重新标脏，调用方可以提示用户另存
+        self.timer.stop()
+        self._commit()
+        if not self.last_key:
+            return None
+        err = self._check(self.last_key, _writer.wait(self.last_key))
+        if err is not None:
+            self.dirty = True
+        return err
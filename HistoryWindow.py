@@ -0,0 +1,81 @@
+# HistoryWindow.py —— 便签修订历史：浏览、与当前内容对比、恢复
+import time, difflib
+from PyQt5.QtWidgets import (
+    QWidget, QListWidget, QListWidgetItem, QPlainTextEdit, QTabWidget,
+    QPushButton, QLabel, QVBoxLayout, QHBoxLayout, QSplitter
+)
+from PyQt5.QtCore import Qt
+
+from NoteHistory import history_for
+
+class HistoryWindow(QWidget):
+    def __init__(self, note):
+        super().__init__()
+        self.note = note
+        self.history = history_for(note._doc_id())
+        self.text = None
+        self.setWindowTitle(f"历史版本 — {note.title_edit.text()}")
+        self.setWindowFlags(Qt.WindowStaysOnTopHint)
+        self.resize(640, 420)
+
+        self.rev_list = QListWidget(self)
+        self.rev_list.currentItemChanged.connect(self._select)
+        self.content_view = QPlainTextEdit(self); self.content_view.setReadOnly(True)
+        self.diff_view = QPlainTextEdit(self); self.diff_view.setReadOnly(True)
+        self.tabs = QTabWidget(self)
+        self.tabs.addTab(self.content_view, "内容")
+        self.tabs.addTab(self.diff_view, "与当前的差异")
+        self.tabs.currentChanged.connect(lambda _: self._show_diff())
+        self.restore_btn = QPushButton("恢复此版本", self)
+        self.restore_btn.setEnabled(False)
+        self.restore_btn.clicked.connect(self._restore)
+        self.status = QLabel(self)
+        self.status.setStyleSheet("color:#757575;font-size:11px;")
+
+        split = QSplitter(Qt.Horizontal, self)
+        split.addWidget(self.rev_list); split.addWidget(self.tabs)
+        split.setSizes([200, 440])
+        bottom = QHBoxLayout()
+        bottom.addWidget(self.status); bottom.addStretch(); bottom.addWidget(self.restore_btn)
+        lay = QVBoxLayout(self)
+        lay.setContentsMargins(8,8,8,8)
+        lay.addWidget(split); lay.addLayout(bottom)
+        self._fill()
+
+    def _fill(self):
+        # 只列时间和标题，正文在选中时才还原
+        self.rev_list.clear()
+        for i, t, title in reversed(self.history.revisions()):
+            it = QListWidgetItem(time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(t))
+                                 + (f" · {title}" if title else ""))
+            it.setData(Qt.UserRole, i)
+            self.rev_list.addItem(it)
+        self.status.setText(f"{len(self.history)} 个修订 · {self.history.size()/1024:.1f} KB")
+
+    def _select(self, item, _prev=None):
+        if item is None:
+            return
+        t0 = time.perf_counter()
+        self.text = self.history.text(item.data(Qt.UserRole))
+        ms = (time.perf_counter()-t0)*1000
+        self.content_view.setPlainText(self.text)
+        self.diff_view.clear()
+        self._show_diff()
+        self.restore_btn.setEnabled(True)
+        self.status.setText(f"{len(self.history)} 个修订 · {self.history.size()/1024:.1f} KB · 还原 {ms:.1f} ms")
+
+    def _show_diff(self):
+        if self.tabs.currentWidget() is not self.diff_view or self.text is None:
+            return
+        if self.diff_view.document().isEmpty():
+            cur = self.note.text_edit.toPlainText()
+            diff = difflib.unified_diff(self.text.splitlines(), cur.splitlines(),
+                                        "所选版本", "当前", lineterm="")
+            self.diff_view.setPlainText("\n".join(diff) or "（与当前内容相同）")
+
+    def _restore(self):
+        # 恢复也是一次编辑：由自动保存写盘并记一条新修订，之前的版本都还在
+        if self.text is not None:
+            self.note.text_edit.setPlainText(self.text)
+            self.note.raise_(); self.note.activateWindow()
+            self.close()
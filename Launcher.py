@@ -1,11 +1,23 @@
 # Launcher.py
-import sys, os, random
-from PyQt5.QtWidgets import QApplication, QWidget, QHBoxLayout, QLabel, QMessageBox
-from PyQt5.QtCore import Qt, QRect, QEvent, QPoint
-from PyQt5.QtGui import QColor, QPainter, QPainterPath, QFontDatabase, QFont
+import StartupProfile as prof   # 须在 PyQt5 之前导入，才能计入导入耗时
+import sys, os, random, time
+from PyQt5.QtWidgets import QApplication, QWidget, QHBoxLayout, QLabel, QMessageBox, QMenu
+from PyQt5.QtCore import Qt, QEvent
+from PyQt5.QtGui import QPainter
 
 from StickyNotes import StickyNote
 from TodoList import TodoList
+from SearchWindow import SearchWindow
+from Theme import COLOR_SCHEMES, random_theme
+from WindowPool import WindowPool
+from SingleInstance import forward_or_listen
+from WindowRegistry import default_registry
+from WindowDrag import DragController
+from WindowChrome import capsule_pixmap
+from Session import restore_session
+import PerfMonitor
+from Assets import load_fonts, load_fonts_deferred, deferred_mode
+prof.mark("imports")
 
 if sys.platform.startswith("win") and getattr(sys, "frozen", False):
     try:
@@ -30,22 +42,43 @@ if sys.platform.startswith("win") and getattr(sys, "frozen", False):
             f"\"{exe}\" \"%1\""
         )
         key.Close()
+        # 5) .snt → StickyNotes.todo（待办清单），同样交给本程序打开
+        key = winreg.CreateKey(winreg.HKEY_CURRENT_USER, r"Software\Classes\.snt")
+        winreg.SetValueEx(key, "", 0, winreg.REG_SZ, "StickyNotes.todo")
+        key.Close()
+        key = winreg.CreateKey(winreg.HKEY_CURRENT_USER, r"Software\Classes\StickyNotes.todo")
+        winreg.SetValueEx(key, "", 0, winreg.REG_SZ, "Sticky Todo List")
+        key.Close()
+        key = winreg.CreateKey(winreg.HKEY_CURRENT_USER, r"Software\Classes\StickyNotes.todo\DefaultIcon")
+        winreg.SetValueEx(key, "", 0, winreg.REG_SZ, exe)
+        key.Close()
+        key = winreg.CreateKey(winreg.HKEY_CURRENT_USER, r"Software\Classes\StickyNotes.todo\shell\open\command")
+        winreg.SetValueEx(
+            key, "", 0, winreg.REG_SZ,
+            f"\"{exe}\" \"%1\""
+        )
+        key.Close()
     except Exception:
         # 安全忽略任何注册失败
         pass
 
-COLOR_SCHEMES = [
-    ("#fffde7", "#fbc02d"),
-    ("#e8f5e9", "#66bb6a"),
-    ("#fce4ec", "#ec407a"),
-    ("#e3f2fd", "#42a5f5"),
-    ("#fff3e0", "#ffa726"),
-    ("#eeeeee", "#757575"),
-    ("#f3e5f5", "#ab47bc"),
-]
 CAPSULE_RADIUS = 30
 CLICK_THRESHOLD = 5
-open_windows = []
+
+def open_file(path):
+    cls = TodoList if path.lower().endswith(".snt") else StickyNote
+    win = cls(path)
+    win.show(); win.raise_(); win.activateWindow()
+    return default_registry().track(win)
+
+def on_open_requested(paths):
+    # 其它进程转交过来的文件；没有文件时把已有窗口调到前面
+    for p in paths:
+        open_file(p)
+    if not paths:
+        for w in default_registry().windows():
+            if w.isVisible():
+                w.raise_(); w.activateWindow()
 
 class Launcher(QWidget):
     def __init__(self):
@@ -55,9 +88,14 @@ class Launcher(QWidget):
         self.resize(160, 60)
 
         self.left_color, _ = random.choice(COLOR_SCHEMES)
-        self._dragging = False
-        self._press = QPoint(); self._start = QPoint()
-        self.open_windows = []  # 引用窗口
+        # 拖动：超过点击阈值才移动，位置按显示帧合并更新
+        self.drag = DragController(self, resizable=False, threshold=CLICK_THRESHOLD)
+        # 预热窗口池：点击时直接取出已构造好的隐藏窗口
+        self.pool = WindowPool({
+            "note": lambda: StickyNote(visible=False),
+            "todo": lambda: TodoList(visible=False),
+        }, parent=self)
+        self.pool.start()
 
         self.left_lbl = QLabel("便签", self)
         self.right_lbl = QLabel("待办", self)
@@ -74,54 +112,36 @@ class Launcher(QWidget):
         self.installEventFilter(self)
 
     def paintEvent(self, ev):
-        w,h = self.width(), self.height()
+        # 胶囊背景按尺寸/颜色缓存成位图，重绘只贴图
         p = QPainter(self)
-        p.setRenderHint(QPainter.Antialiasing)
-        path = QPainterPath()
-        path.addRoundedRect(0,0,w,h,CAPSULE_RADIUS,CAPSULE_RADIUS)
-        p.fillPath(path, QColor("#f5f5f5"))
-        left = QRect(0,0,w//2,h)
-        cp = QPainterPath()
-        r = CAPSULE_RADIUS
-        cp.moveTo(left.right(),0)
-        cp.lineTo(left.x()+r,0)
-        cp.quadTo(left.x(),0,left.x(),r)
-        cp.lineTo(left.x(),left.bottom()-r)
-        cp.quadTo(left.x(),left.bottom(),left.x()+r,left.bottom())
-        cp.lineTo(left.right(),left.bottom())
-        cp.closeSubpath()
-        p.fillPath(cp, QColor(self.left_color))
-
-    def mousePressEvent(self, ev):
-        if ev.button()==Qt.LeftButton:
-            self._start_pos = ev.globalPos()
-            self._press_pos = ev.globalPos()
-            self._dragging = False
-
-    def mouseMoveEvent(self, ev):
-        if ev.buttons() & Qt.LeftButton:
-            delta = ev.globalPos() - self._press_pos
-            if delta.manhattanLength() > CLICK_THRESHOLD:
-                self._dragging = True
-                self.move(self.x()+delta.x(), self.y()+delta.y())
-                self._press_pos = ev.globalPos()
+        p.drawPixmap(0, 0, capsule_pixmap(self.width(), self.height(), CAPSULE_RADIUS,
+                                          "#f5f5f5", self.left_color, self.devicePixelRatioF()))
 
     def mouseReleaseEvent(self, ev):
         if ev.button()!=Qt.LeftButton:
             return
-        # 拖拽不触发点击
-        if not self._dragging:
-            dist = (ev.globalPos() - self._start_pos).manhattanLength()
-            if dist < CLICK_THRESHOLD:
-                if ev.pos().x() < self.width()//2:
-                    note = StickyNote()
-                    note.show()
-                    self.open_windows.append(note)
-                else:
-                    todo = TodoList()
-                    todo.show()
-                    self.open_windows.append(todo)
-        self._dragging = False
+        # 拖拽不触发点击（拖动本身由 DragController 按帧合并处理）
+        if not self.drag.dragged:
+            t_click = time.perf_counter()
+            kind = "note" if ev.pos().x() < self.width()//2 else "todo"
+            w = self.pool.acquire(kind, random_theme(), t_click)
+            default_registry().track(w)
+
+    def contextMenuEvent(self, ev):
+        menu = QMenu(self)
+        menu.addAction("搜索…", self.open_search)
+        reg = default_registry()
+        if reg.suspended:
+            sub = menu.addMenu("已收起的窗口")
+            for stub in list(reg.suspended):
+                sub.addAction(stub.get("title") or "(无标题)", lambda st=stub: reg.restore(st))
+        menu.addAction("窗口诊断", lambda: QMessageBox.information(self, "窗口诊断", reg.diagnostics_text()))
+        menu.exec_(ev.globalPos())
+
+    def open_search(self):
+        w = SearchWindow()
+        w.show(); w.raise_(); w.activateWindow()
+        default_registry().track(w)
 
     def eventFilter(self, o, ev):
         if ev.type()==QEvent.Enter:
@@ -132,35 +152,36 @@ class Launcher(QWidget):
 
 if __name__=="__main__":
     app = QApplication(sys.argv)
-    if getattr(sys, "frozen", False):
-        base = sys._MEIPASS
-    else:
-        base = os.path.dirname(os.path.abspath(__file__))
-    simhei_path = os.path.join(base, "fonts", "SimHei.ttf")
-    zh_id = QFontDatabase.addApplicationFont(simhei_path)
-    zh_fams = QFontDatabase.applicationFontFamilies(zh_id) if zh_id!=-1 else []
-    zh_fam = zh_fams[0] if zh_fams else "SimHei"
-
-    en_fam = "SVGASYS"
-    f = QFont(en_fam, 12)
-    f.setStyleStrategy(QFont.PreferDefault)
-    app.setFont(f)
-    app.setStyleSheet(f"""
-        * {{
-            font-family: "{en_fam}", "{zh_fam}";
-            font-size: 12pt;
-        }}
-    """)
-
-    args = sys.argv[1:]
-    if args and args[0].lower().endswith(".sn"):
-        path = os.path.abspath(args[0].strip('"'))
-        win = StickyNote(path)
-        win.show(); win.raise_(); win.activateWindow()
-        open_windows.append(win)
+    prof.mark("QApplication")
+    paths = [os.path.abspath(a.strip('"')) for a in sys.argv[1:]
+             if a.strip('"').lower().endswith((".sn", ".snt"))]
+    # 已有实例在运行：把文件交给它，不再加载字体和窗口
+    server = forward_or_listen(paths)
+    prof.mark("single-instance check")
+    if server is None:
+        prof.report()
+        sys.exit(0)
+    server.open_requested.connect(on_open_requested)
+
+    # 延迟模式：先显示窗口，中文字体在后台读入后再注册
+    deferred = deferred_mode()
+    if not deferred:
+        load_fonts(app)
+
+    PerfMonitor.start_if_enabled()
+    # 上次打开着的便签 / 待办窗口
+    session = restore_session(default_registry())
+    if paths:
+        for p in paths:
+            first = open_file(p)
     else:
-        launcher = Launcher()
-        launcher.show()
-        open_windows.append(launcher)
+        first = Launcher()
+        first.show()
+        default_registry().track(first)
+    prof.mark("first window constructed")
+    prof.watch_first_paint(first)
+
+    if deferred:
+        load_fonts_deferred(app)
 
-    sys.exit(app.exec_())
\ No newline at end of file
+    sys.exit(app.exec_())
@@ -5,7 +5,7 @@ a = Analysis(
     ['Launcher.py'],
     pathex=[],
     binaries=[],
-    datas=[('fonts\\\\*.ttf', 'fonts'), ('fonts\\\\*.fon', 'fonts'), ('sticky_note_icon.ico', '.')],
+    datas=[('fonts\\\\*.ttf', 'fonts'), ('fonts\\\\*.fon', 'fonts'), ('sticky_note_icon.ico', '.'), ('sticky_note_icon_64.png', '.')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
@@ -1,24 +1,39 @@
+import StartupProfile as prof   # 须在 PyQt5 之前导入，才能计入导入耗时
 import sys
 import os
-from PyQt5.QtWidgets import QApplication, QSystemTrayIcon, QMenu, QAction, QMessageBox
-from PyQt5.QtGui import QIcon
+import json
+from PyQt5.QtWidgets import QApplication, QSystemTrayIcon, QMenu, QMessageBox
 from PyQt5.QtCore import QCoreApplication
 
 from StickyNotes import StickyNote
 from TodoList import TodoList
+from SearchWindow import SearchWindow
+from Theme import random_theme
+from WindowPool import WindowPool
+from SingleInstance import forward_or_listen
+from WindowRegistry import default_registry
+from Assets import app_icon
+from Session import restore_session
+from Reminders import default_reminders
+from ReminderQueue import format_due
+import PerfMonitor
+prof.mark("imports")
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     app.setQuitOnLastWindowClosed(False)
+    prof.mark("QApplication")
 
-    # 兼容打包后的路径
-    if getattr(sys, 'frozen', False):
-        base_path = sys._MEIPASS
-    else:
-        base_path = os.path.dirname(os.path.abspath(__file__))
+    # 单实例：托盘已在运行时把文件交给它后退出
+    paths = [os.path.abspath(a) for a in sys.argv[1:] if a.lower().endswith((".sn", ".snt"))]
+    server = forward_or_listen(paths)
+    prof.mark("single-instance check")
+    if server is None:
+        prof.report()
+        sys.exit(0)
 
-    icon_path = os.path.join(base_path, "sticky_note_icon.ico")
-    icon = QIcon(icon_path)
+    # 小尺寸图标直接可用，1024px 原图只在需要时才解码
+    icon = app_icon()
 
     # 托盘检测
     if not QSystemTrayIcon.isSystemTrayAvailable():
@@ -28,31 +43,131 @@ if __name__ == "__main__":
     tray = QSystemTrayIcon(icon)
     tray.setToolTip("便签工具")
     tray.setVisible(True)
+    prof.mark("tray icon")
 
-    notes = []
+    # 打开中的窗口由窗口管理器持有，关闭即释放
+    registry = default_registry()
+    PerfMonitor.start_if_enabled()
+
+    def _hidden(cls):
+        w = cls(visible=False)
+        w.setWindowIcon(icon)
+        return w
+
+    # 预热窗口池，大小由 STICKYNOTES_POOL_SIZE 控制
+    pool = WindowPool({
+        "note": lambda: _hidden(StickyNote),
+        "todo": lambda: _hidden(TodoList),
+    })
 
     def create_note():
-        note = StickyNote()
-        note.setWindowIcon(icon)
-        note.show()
-        notes.append(note)
+        return registry.track(pool.acquire("note", random_theme()))
 
     def create_todo():
-        todo = TodoList()
-        todo.setWindowIcon(icon)
-        todo.show()
-        notes.append(todo)
+        return registry.track(pool.acquire("todo", random_theme()))
+
+    def open_search():
+        w = SearchWindow()
+        w.setWindowIcon(icon)
+        w.show(); w.raise_(); w.activateWindow()
+        registry.track(w)
+
+    def open_files(paths):
+        w = None
+        for p in paths:
+            cls = TodoList if p.lower().endswith(".snt") else StickyNote
+            w = cls(p)
+            w.setWindowIcon(icon)
+            w.show(); w.raise_(); w.activateWindow()
+            registry.track(w)
+        return w
+
+    def show_diagnostics():
+        # 摘要直接显示，完整的 JSON 放在"详细信息"里，可以复制出来
+        box = QMessageBox(QMessageBox.Information, "窗口诊断", registry.diagnostics_text())
+        box.setDetailedText(json.dumps(registry.diagnostics(), ensure_ascii=False, indent=2))
+        box.exec_()
+
+    # 待办提醒：所有清单共用一个调度器，到点由托盘弹通知，点通知打开对应的清单
+    reminders = default_reminders()
+    last_reminder = {}
+
+    def show_reminder(p):
+        last_reminder.clear(); last_reminder.update(p)
+        tail = " · ".join(x for x in (p.get("title"),
+                                      format_due(p["due"])+" 到期" if p.get("due") is not None else "") if x)
+        tray.showMessage("待办提醒", (p.get("text") or "(无内容)") + ("\n"+tail if tail else ""),
+                         QSystemTrayIcon.Information, 10000)
+
+    def open_reminder(p):
+        for w in registry.windows():
+            if isinstance(w, TodoList) and w.reminder_source()==p.get("source"):
+                w.showNormal(); w.raise_(); w.activateWindow()
+                return
+        path = p.get("path")
+        for stub in list(registry.suspended):
+            if path and stub.get("file_path") and os.path.abspath(stub["file_path"])==path:
+                registry.restore(stub).setWindowIcon(icon)
+                return
+        if path and os.path.exists(path):
+            open_files([path])
+
+    reminders.due.connect(show_reminder)
+    tray.messageClicked.connect(lambda: last_reminder and open_reminder(dict(last_reminder)))
+
+    # 其它进程转交的请求：没有文件时新建一个便签
+    server.open_requested.connect(lambda paths: open_files(paths) or create_note())
 
     menu = QMenu()
     menu.addAction("新建便签", create_note)
     menu.addAction("新建待办清单", create_todo)
+    menu.addAction("搜索…", open_search)
+    suspended_menu = menu.addMenu("已收起的窗口")
+
+    def fill_suspended():
+        suspended_menu.clear()
+        for stub in list(registry.suspended):
+            suspended_menu.addAction(stub.get("title") or "(无标题)",
+                                     lambda st=stub: registry.restore(st).setWindowIcon(icon))
+        suspended_menu.setEnabled(bool(registry.suspended))
+
+    menu.aboutToShow.connect(fill_suspended)
+    remind_menu = menu.addMenu("即将到来的提醒")
+
+    def fill_reminders():
+        remind_menu.clear()
+        for p in reminders.upcoming(8):
+            when = format_due(p["due"]) if p.get("due") is not None else ""
+            remind_menu.addAction(f"{when}  {p.get('text') or '(无内容)'}", lambda p=p: open_reminder(p))
+        remind_menu.setEnabled(len(reminders.queue) > 0)
+
+    menu.aboutToShow.connect(fill_reminders)
+    menu.addAction("窗口诊断", show_diagnostics)
+    # 性能监视：勾选时开启热点计时并显示悬浮窗，取消即撤掉
+    perf = PerfMonitor.default_monitor()
+    perf_action = menu.addAction("性能监视")
+    perf_action.setCheckable(True)
+    perf_action.setChecked(perf.active)
+    perf_action.toggled.connect(perf.set_overlay)
     menu.addSeparator()
     menu.addAction("退出", QCoreApplication.quit)
 
     tray.setContextMenu(menu)
     app.setWindowIcon(icon)
 
-    # 初始创建一个便签
-    create_note()
+    # 先恢复上次的工作区，再打开命令行给出的文件；都没有时新建一个便签。之后在空闲时预热窗口池
+    session = restore_session(registry, on_window=lambda w: w.setWindowIcon(icon))
+
+    def track_suspended(_stats):
+        # 已收起的清单没有窗口，直接按文件登记提醒
+        for stub in registry.suspended:
+            if stub.get("kind")=="todo" and stub.get("file_path"):
+                reminders.track_file(stub["file_path"])
+
+    session.finished.connect(track_suspended)
+    first = open_files(paths) or session.first or create_note()
+    prof.mark("first window constructed")
+    prof.watch_first_paint(first)
+    pool.start()
 
     sys.exit(app.exec_())
\ No newline at end of file
@@ -0,0 +1,191 @@
+# Markdown.py —— 便签的 Markdown 模式：按段（block）增量高亮 + 空闲时刷新的只读预览
+#
+# 高亮基于 QSyntaxHighlighter：文档改动时 Qt 只对改动的段调用 highlightBlock，
+# 之后仅当某段的结束状态（是否在 ``` 代码块里）变了才继续处理下一段。
+# 所以普通输入每次只扫一行；只有开 / 关代码块才会把后面的段重扫一遍。
+# scan_line 是纯函数，不碰 Qt，逐行给出 (起点, 长度, 种类)。
+import re, html, time
+from PyQt5.QtWidgets import QTextBrowser
+from PyQt5.QtCore import QTimer
+from PyQt5.QtGui import QSyntaxHighlighter, QTextCharFormat, QColor, QFont, QTextDocument
+
+from Theme import adjust
+
+PREVIEW_IDLE = 400       # 停止输入多久后刷新预览（毫秒）
+NORMAL, IN_FENCE = 0, 1  # 段状态
+
+_FENCE = re.compile(r"^\s{0,3}(```|~~~)")
+_HEADING = re.compile(r"^\s{0,3}(#{1,6})(\s|$)")
+_HR = re.compile(r"^\s{0,3}([-*_])(\s*\1){2,}\s*$")
+_QUOTE = re.compile(r"^\s{0,3}>")
+_LIST = re.compile(r"^\s*(?:[-*+]|\d+[.)])\s+(\[[ xX]\]\s)?")
+_INLINE = re.compile(
+    r"(?P<code>(`+)(?!`).+?(?<!`)\2(?!`))"
+    r"|(?P<bold>\*\*(?=\S).+?(?<=\S)\*\*|__(?=\S).+?(?<=\S)__)"
+    r"|(?P<strike>~~(?=\S).+?(?<=\S)~~)"
+    r"|(?P<italic>\*(?=[^\s*]).+?(?<=[^\s*])\*|(?<!\w)_(?=\S).+?(?<=\S)_(?!\w))"
+    r"|(?P<link>!?\[[^\]]*\]\([^)\s]*(?:\s+\"[^\"]*\")?\))"
+    r"|(?P<url>https?://[^\s<>()]+)")
+
+def scan_line(text, state=NORMAL):
+    # 返回 ([(起点, 长度, 种类)], 本行结束后的状态)；后写的区间覆盖先写的
+    n = len(text)
+    if state==IN_FENCE:
+        if _FENCE.match(text):
+            return [(0, n, "fence")], NORMAL
+        return [(0, n, "code")], IN_FENCE
+    if _FENCE.match(text):
+        return [(0, n, "fence")], IN_FENCE
+    m = _HEADING.match(text)
+    if m:
+        return [(0, n, "h%d" % len(m.group(1)))], NORMAL
+    if _HR.match(text):
+        return [(0, n, "hr")], NORMAL
+    spans = []
+    if _QUOTE.match(text):
+        spans.append((0, n, "quote"))
+    m = _LIST.match(text)
+    if m:
+        spans.append((0, m.end(), "task_done" if m.group(1) and m.group(1)[1] in "xX" else "list"))
+    for m in _INLINE.finditer(text, m.end() if m else 0):
+        spans.append((m.start(), m.end()-m.start(), m.lastgroup))
+    return spans, NORMAL
+
+
+def _char_formats(theme):
+    # 每个配色一套格式，颜色从配色派生，与窗口风格一致
+    accent, code_bg = adjust(theme.btn, 0.75), adjust(theme.bg, 0.93)
+    def fmt(color=None, bold=False, italic=False, size=None, bg=None, mono=False, strike=False):
+        f = QTextCharFormat()
+        if color: f.setForeground(QColor(color))
+        if bold: f.setFontWeight(QFont.Bold)
+        if italic: f.setFontItalic(True)
+        if size: f.setFontPointSize(size)
+        if bg: f.setBackground(QColor(bg))
+        if mono: f.setFontFamily("Consolas"); f.setFontFixedPitch(True)
+        if strike: f.setFontStrikeOut(True)
+        return f
+    out = {"h%d" % i: fmt(accent, bold=True, size=max(11, 17-i)) for i in range(1, 7)}
+    out.update({
+        "bold": fmt(bold=True), "italic": fmt(italic=True), "strike": fmt("#888", strike=True),
+        "code": fmt("#5d4037", bg=code_bg, mono=True), "fence": fmt("#999", bg=code_bg, mono=True),
+        "link": fmt(accent), "url": fmt(accent), "quote": fmt("#777", italic=True),
+        "list": fmt(accent, bold=True), "task_done": fmt("#888", bold=True), "hr": fmt("#aaa"),
+    })
+    return out
+
+_formats = {}
+
+def char_formats(theme):
+    f = _formats.get((theme.bg, theme.btn))
+    if f is None:
+        f = _formats[(theme.bg, theme.btn)] = _char_formats(theme)
+    return f
+
+_WIDE = re.compile("[\U00010000-\U0010ffff]")
+
+def _u16_spans(text, spans):
+    # QTextDocument 的位置按 UTF-16 计；只有出现 BMP 之外的字符（表情等）才需要换算
+    if text.isascii() or not _WIDE.search(text):
+        return spans
+    pos = [0]
+    for c in text:
+        pos.append(pos[-1] + (2 if ord(c) > 0xffff else 1))
+    return [(pos[s], pos[s+l]-pos[s], k) for s, l, k in spans]
+
+
+class MarkdownHighlighter(QSyntaxHighlighter):
+    def __init__(self, document, theme):
+        super().__init__(document)
+        self.formats = char_formats(theme)
+        self.blocks = 0              # 累计处理的段数，用来确认增量是否生效
+
+    def set_theme(self, theme):
+        self.formats = char_formats(theme)
+        self.rehighlight()
+
+    def highlightBlock(self, text):
+        self.blocks += 1
+        state = self.previousBlockState()
+        spans, state = scan_line(text, IN_FENCE if state==IN_FENCE else NORMAL)
+        formats = self.formats
+        for start, length, kind in _u16_spans(text, spans):
+            self.setFormat(start, length, formats[kind])
+        self.setCurrentBlockState(state)
+
+
+def render_html(text):
+    # Qt 5.14 以下没有 QTextDocument.setMarkdown 时的简易渲染，只覆盖便签里常用的语法
+    out, fence, para = [], False, []
+    def inline(s):
+        s = html.escape(s, quote=False)
+        s = re.sub(r"`([^`]+)`", r"<code>\1</code>", s)
+        s = re.sub(r"\*\*(.+?)\*\*|__(.+?)__", lambda m: f"<b>{m.group(1) or m.group(2)}</b>", s)
+        s = re.sub(r"(?<![*\w])\*(?!\s)(.+?)(?<!\s)\*", r"<i>\1</i>", s)
+        s = re.sub(r"~~(.+?)~~", r"<s>\1</s>", s)
+        return re.sub(r"\[([^\]]*)\]\(([^)\s]*)\)", r'<a href="\2">\1</a>', s)
+    def flush():
+        if para:
+            out.append("<p>" + "<br>".join(inline(l) for l in para) + "</p>"); para.clear()
+    for line in text.splitlines():
+        if _FENCE.match(line):
+            flush(); out.append("</pre>" if fence else "<pre>"); fence = not fence
+        elif fence:
+            out.append(html.escape(line))
+        elif not line.strip():
+            flush()
+        elif _HEADING.match(line):
+            flush(); n = len(_HEADING.match(line).group(1))
+            out.append(f"<h{n}>{inline(line.lstrip().lstrip('#').strip())}</h{n}>")
+        elif _HR.match(line):
+            flush(); out.append("<hr>")
+        elif _LIST.match(line):
+            flush(); m = _LIST.match(line)
+            box = ("☑ " if m.group(1)[1] in "xX" else "☐ ") if m.group(1) else "• "
+            out.append(f"<div>{box}{inline(line[m.end():])}</div>")
+        elif _QUOTE.match(line):
+            flush(); out.append(f"<blockquote>{inline(line.lstrip()[1:].strip())}</blockquote>")
+        else:
+            para.append(line)
+    flush()
+    if fence:
+        out.append("</pre>")
+    return "\n".join(out)
+
+
+class MarkdownPreview(QTextBrowser):
+    # 只读预览：编辑时只重启计时器，停下 PREVIEW_IDLE 毫秒后才渲染；隐藏时不渲染
+    def __init__(self, editor, parent=None):
+        super().__init__(parent)
+        self.editor = editor
+        self.setOpenExternalLinks(True)
+        self.stale = True
+        self.render_ms = None
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(PREVIEW_IDLE)
+        self.timer.timeout.connect(self.refresh)
+        editor.textChanged.connect(self.schedule)
+
+    def schedule(self):
+        self.stale = True
+        if self.isVisible():
+            self.timer.start()
+
+    def showEvent(self, ev):
+        super().showEvent(ev)
+        if self.stale:
+            self.refresh()
+
+    def refresh(self):
+        t0 = time.perf_counter()
+        bar = self.verticalScrollBar()
+        frac = bar.value() / bar.maximum() if bar.maximum() else 0.0
+        text = self.editor.toPlainText()
+        if hasattr(QTextDocument, "setMarkdown"):
+            self.document().setMarkdown(text)
+        else:
+            self.setHtml(render_html(text))
+        bar.setValue(int(frac * bar.maximum()))
+        self.stale = False
+        self.render_ms = (time.perf_counter()-t0)*1000
@@ -0,0 +1,241 @@
+# NoteFormat.py —— .sn 便签文件的读写、校验与修复（不依赖 Qt，GUI 与命令行共用）
+import os, json, time, mmap, zlib, struct
+# re、tempfile 只在修复 / 写盘时才用，按需导入，让只读便签的脚本启动更快
+
+def atomic_write(path, data):
+    # 先写同目录临时文件，fsync 后 os.replace，崩溃时旧文件保持完整
+    import tempfile
+    d = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(prefix=".", suffix=".tmp", dir=d)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data); f.flush(); os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try: os.unlink(tmp)
+        except OSError: pass
+        raise
+
+def encode_note(data):
+    return json.dumps(data, ensure_ascii=False, separators=(",",":")).encode("utf-8")
+
+# ---- .sn v2：定长文件头（标题、位置等元数据）+ 可压缩的正文 ----
+# 文件头可以只 mmap 前几百字节读出，列表 / 预览不必解析正文；
+# 第一个字节不是 "{"，据此与旧的 JSON .sn 区分，读取两种格式都支持。
+SN_MAGIC = b"\x89SNB"
+SN_VERSION = 2
+SN_HEADER = struct.Struct("<4sHHIQQ4idBBH")   # magic ver flags hdr_len body_len raw_len geo*4 mtime kind 0 title_len
+F_ZLIB, F_ZSTD, F_GEO = 1, 2, 4
+KIND_CODES = {"note": 0, "todo": 1}
+# 写盘格式：v2 需要显式选择（环境变量、SnConvert、NotesCLI --format），否则沿用文件原有的格式，
+# 新文件写 JSON，老版本和降级后的程序仍能读
+SN_FORMAT = os.environ.get("STICKYNOTES_SN_FORMAT")   # v2 / json / 不设
+COMPRESS_MIN = 4096     # 正文小于此值不压缩
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+def encode_note_v2(data, compress="auto"):
+    meta = {k: v for k, v in data.items() if k not in ("title", "geometry")}
+    raw = encode_note(meta)
+    if compress=="auto":
+        compress = "zlib" if len(raw) >= COMPRESS_MIN else None
+    flags = 0
+    if compress=="zstd":
+        if zstandard is None:
+            raise ValueError("未安装 zstandard，无法使用 zstd 压缩")
+        body = zstandard.ZstdCompressor().compress(raw); flags |= F_ZSTD
+    elif compress=="zlib":
+        body = zlib.compress(raw, 6); flags |= F_ZLIB
+    else:
+        body = raw
+    geo = data.get("geometry")
+    if geo and len(geo)==4:
+        flags |= F_GEO
+    else:
+        geo = (0, 0, 0, 0)
+    # 超长标题按字符边界截断，不留半个多字节字符
+    title = (data.get("title") or "").encode("utf-8")[:0xffff].decode("utf-8", "ignore").encode("utf-8")
+    hdr_len = (SN_HEADER.size + len(title) + 7) & ~7
+    head = SN_HEADER.pack(SN_MAGIC, SN_VERSION, flags, hdr_len, len(body), len(raw),
+                          *[int(v) for v in geo], time.time(),
+                          KIND_CODES.get(data.get("kind"), 0), 0, len(title))
+    return head + title + b"\0"*(hdr_len-SN_HEADER.size-len(title)) + body
+
+def _parse_header(buf):
+    if len(buf) < SN_HEADER.size:
+        raise ValueError("便签文件头不完整")
+    (magic, ver, flags, hdr_len, body_len, raw_len,
+     x, y, w, h, mtime, kind, _, tlen) = SN_HEADER.unpack_from(buf)
+    if magic != SN_MAGIC or ver > SN_VERSION:
+        raise ValueError(f"不支持的便签格式（版本 {ver}）")
+    title = bytes(buf[SN_HEADER.size:SN_HEADER.size+tlen]).decode("utf-8")
+    return {
+        "title": title,
+        "geometry": [x, y, w, h] if flags & F_GEO else None,
+        "mtime": mtime,
+        "kind": "todo" if kind==1 else "note",
+        "flags": flags, "header_len": hdr_len, "body_len": body_len, "raw_len": raw_len,
+    }
+
+def decode_note_v2(buf):
+    hd = _parse_header(buf)
+    body = bytes(buf[hd["header_len"]:hd["header_len"]+hd["body_len"]])
+    if hd["flags"] & F_ZSTD:
+        if zstandard is None:
+            raise ValueError("此便签用 zstd 压缩，需要安装 zstandard")
+        body = zstandard.ZstdDecompressor().decompress(body, max_output_size=hd["raw_len"])
+    elif hd["flags"] & F_ZLIB:
+        body = zlib.decompress(body)
+    d = json.loads(body.decode("utf-8"))
+    d["title"] = hd["title"]
+    if hd["geometry"] is not None:
+        d["geometry"] = hd["geometry"]
+    return d
+
+def is_sn_v2(path):
+    with open(path, "rb") as f:
+        return f.read(len(SN_MAGIC))==SN_MAGIC
+
+def read_note_header(path):
+    # 只读文件头：v2 用 mmap，不触碰正文所在的页；旧 JSON 文件只能整份解析
+    with open(path, "rb") as f:
+        if f.read(len(SN_MAGIC)) != SN_MAGIC:
+            f.seek(0)
+            d = json.loads(f.read().decode("utf-8"))
+            return {"title": d.get("title",""), "geometry": d.get("geometry"),
+                    "mtime": os.fstat(f.fileno()).st_mtime, "kind": d.get("kind","note"),
+                    "flags": 0, "header_len": 0, "body_len": None, "raw_len": None}
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return _parse_header(mm)
+
+def read_note_file(path):
+    with open(path, "rb") as f:
+        raw = f.read()
+    if raw[:len(SN_MAGIC)]==SN_MAGIC:
+        return decode_note_v2(raw)
+    return json.loads(raw.decode("utf-8"))
+
+def _current_format(path):
+    try:
+        return "v2" if is_sn_v2(path) else "json"
+    except OSError:
+        return "json"
+
+def write_note_file(path, data, fmt=None, compress="auto"):
+    fmt = fmt or SN_FORMAT or _current_format(path)
+    raw = encode_note_v2(data, compress) if fmt=="v2" else encode_note(data)
+    atomic_write(path, raw)
+    return len(raw)
+
+# ---- 校验与修复 ----
+def check_note(d):
+    # 返回问题列表；空列表表示结构正确
+    if not isinstance(d, dict):
+        return ["顶层不是对象"]
+    problems = []
+    for k in ("title", "content"):
+        if k in d and not isinstance(d[k], str):
+            problems.append(f"{k} 不是字符串")
+    if "content" not in d:
+        problems.append("缺少 content")
+    geo = d.get("geometry")
+    if geo is not None and not (isinstance(geo, list) and len(geo)==4
+                                and all(isinstance(v, int) for v in geo)):
+        problems.append("geometry 不是 4 个整数")
+    return problems
+
+def normalize_note(d):
+    # 按 check_note 的规则把能保留的字段保留下来
+    out = {k: v for k, v in d.items() if k not in ("title", "content", "geometry")} if isinstance(d, dict) else {}
+    d = d if isinstance(d, dict) else {}
+    out["title"] = d["title"] if isinstance(d.get("title"), str) else str(d.get("title") or "")
+    out["content"] = d["content"] if isinstance(d.get("content"), str) else str(d.get("content") or "")
+    geo = d.get("geometry")
+    try:
+        if geo is not None and len(geo)==4:
+            out["geometry"] = [int(v) for v in geo]
+    except (TypeError, ValueError):
+        pass
+    return out
+
+_STR_FIELD = r'"%s"\s*:\s*"((?:[^"\\]|\\.)*)'
+
+def _salvage_str(text, key):
+    # 从截断或损坏的 JSON 里取出某个字符串字段，末尾没闭合的引号也接受
+    import re
+    m = re.search(_STR_FIELD % key, text, re.S)
+    if not m:
+        return None
+    raw = m.group(1)
+    if raw.endswith("\\") and not raw.endswith("\\\\"):
+        raw = raw[:-1]
+    try:
+        return json.loads('"' + raw + '"')
+    except ValueError:
+        return raw
+
+def salvage_note(raw):
+    # 尽量从损坏的文件内容里恢复出一份便签；完全无法识别时返回 None
+    if raw[:len(SN_MAGIC)]==SN_MAGIC:
+        try:
+            return normalize_note(decode_note_v2(raw))
+        except Exception:
+            pass
+        try:
+            hd = _parse_header(raw)
+        except Exception:
+            return None
+        body = raw[hd["header_len"]:]
+        if hd["flags"] & F_ZLIB:
+            try:
+                body = zlib.decompressobj().decompress(body)   # 截断时解出能解的部分
+            except zlib.error:
+                body = b""
+        d = salvage_note(body) or {}
+        d["title"] = hd["title"]
+        if hd["geometry"] is not None:
+            d["geometry"] = hd["geometry"]
+        return normalize_note(d)
+    text = raw.decode("utf-8", errors="replace").lstrip("\ufeff").replace("\x00", "")
+    try:
+        return normalize_note(json.loads(text))
+    except ValueError:
+        pass
+    content = _salvage_str(text, "content")
+    title = _salvage_str(text, "title")
+    if content is None and title is None:
+        return None
+    d = {"title": title or "", "content": content or ""}
+    import re
+    m = re.search(r'"geometry"\s*:\s*\[\s*(-?\d+)\s*,\s*(-?\d+)\s*,\s*(\d+)\s*,\s*(\d+)\s*\]', text)
+    if m:
+        d["geometry"] = [int(v) for v in m.groups()]
+    return d
+
+def validate_note_file(path, repair=False, fmt=None):
+    # 返回 (状态, 说明)；状态为 ok / invalid / repaired / unrecoverable。
+    # 修复时原文件先另存为 .bak
+    try:
+        with open(path, "rb") as f:
+            raw = f.read()
+    except OSError as e:
+        return "unrecoverable", str(e)
+    try:
+        d = decode_note_v2(raw) if raw[:len(SN_MAGIC)]==SN_MAGIC else json.loads(raw.decode("utf-8"))
+        problems = check_note(d)
+    except Exception as e:
+        d, problems = None, [f"无法解析：{e}"]
+    if not problems:
+        return "ok", ""
+    msg = "；".join(problems)
+    if not repair:
+        return "invalid", msg
+    fixed = normalize_note(d) if d is not None else salvage_note(raw)
+    if fixed is None:
+        return "unrecoverable", msg
+    atomic_write(path + ".bak", raw)
+    write_note_file(path, fixed, fmt=fmt or ("v2" if raw[:len(SN_MAGIC)]==SN_MAGIC else "json"))
+    return "repaired", msg
@@ -0,0 +1,254 @@
+# NoteHistory.py —— 每个便签的修订历史（不依赖 Qt）
+#
+# 追加写的 JSON 行文件：每 KEYFRAME 个修订存一份全文，其余只存与上一版的差异
+# （公共前缀长度、公共后缀长度、中间替换的文字）。按时间查找用二分；
+# 还原任一版本只需读它之前最近的全文和其后不超过 KEYFRAME-1 条差异。
+import os, json, time, hashlib, logging, threading
+from bisect import bisect_right
+
+from NoteFormat import atomic_write
+from NoteStore import default_home
+
+HIST_EXT = ".snh"
+MAGIC = "snhist"
+VERSION = 1
+KEYFRAME = 64
+MAX_REVISIONS = int(os.environ.get("STICKYNOTES_HISTORY_MAX", "10000"))
+
+log = logging.getLogger(__name__)
+
+def _parse(line):
+    # 坏行返回 None
+    try:
+        rec = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(rec, list) or len(rec) < 4 or rec[0] not in ("f", "d"):
+        return None
+    return rec
+
+def _line(rec):
+    return json.dumps(rec, ensure_ascii=False, separators=(",",":")) + "\n"
+
+def _prefix(a, b, limit):
+    # 二分比较切片，比逐字符循环快得多（大便签也只需 O(n) 次字符比较）
+    lo, hi = 0, limit
+    while lo < hi:
+        mid = (lo+hi+1)//2
+        if a[lo:mid]==b[lo:mid]:
+            lo = mid
+        else:
+            hi = mid-1
+    return lo
+
+def _suffix(a, b, limit):
+    la, lb = len(a), len(b)
+    lo, hi = 0, limit
+    while lo < hi:
+        mid = (lo+hi+1)//2
+        if a[la-mid:la-lo]==b[lb-mid:lb-lo]:
+            lo = mid
+        else:
+            hi = mid-1
+    return lo
+
+def make_delta(old, new):
+    # 自动保存的间隔很短，一次通常只改了一处：前后缀去掉后剩下的就是差异
+    n = min(len(old), len(new))
+    p = _prefix(old, new, n)
+    s = _suffix(old, new, n-p)
+    return p, s, new[p:len(new)-s]
+
+def apply_delta(old, p, s, mid):
+    return old[:p] + mid + old[len(old)-s:]
+
+def merge_text(base, local, remote):
+    # 三方合并：两边相对 base 各只改了一段且互不相邻时合成一份，否则返回 None（冲突）
+    if local==base or local==remote:
+        return remote
+    if remote==base:
+        return local
+    p1, s1, m1 = make_delta(base, local)
+    p2, s2, m2 = make_delta(base, remote)
+    e1, e2 = len(base)-s1, len(base)-s2
+    if e1 < p2:
+        return base[:p1] + m1 + base[e1:p2] + m2 + base[e2:]
+    if e2 < p1:
+        return base[:p2] + m2 + base[e2:p1] + m1 + base[e1:]
+    return None
+
+
+class NoteHistory:
+    def __init__(self, path, doc_id=None):
+        self.path = path
+        self.doc_id = doc_id
+        self.lock = threading.Lock()
+        self.times = []       # 每个修订的时间，递增
+        self.offsets = []     # 每个修订在文件中的起始偏移
+        self.full = []        # 是否为全文
+        self.titles = []
+        self.end = 0
+        self.last_text = None
+        self.since_key = 0    # 距上一个全文的修订数
+        self.bad_lines = []   # 上次读取时跳过的行（行号从 1 起，含文件头）
+        if os.path.exists(path):
+            self._scan()
+
+    def _scan(self):
+        with open(self.path, "rb") as f:
+            head = f.readline()
+            try:
+                magic, ver, doc_id = json.loads(head)
+            except ValueError:
+                raise ValueError("不是修订历史文件")
+            if magic != MAGIC or ver > VERSION:
+                raise ValueError(f"不支持的修订历史格式：{head.strip()}")
+            self.doc_id = self.doc_id or doc_id
+            # 同 TodoJournal.iter_ops：写了一半的最后一行截掉；中间的坏行跳过并记日志，文件不动。
+            # 坏行之后到下一个全文之前的差异缺了基准，无法还原，一并跳过
+            pos, lineno, chain = len(head), 1, True
+            for line in f:
+                lineno += 1
+                if not line.endswith(b"\n"):
+                    break       # 写了一半的最后一行，下次追加前截掉
+                rec = _parse(line)
+                if rec is not None and rec[0]=="f":
+                    chain = True
+                if rec is None or not chain:
+                    chain = False
+                    self.bad_lines.append(lineno)
+                    log.warning("%s 第 %d 行无法解析或缺少基准，已跳过", self.path, lineno)
+                else:
+                    self.times.append(rec[1]); self.offsets.append(pos)
+                    self.full.append(rec[0]=="f"); self.titles.append(rec[2])
+                    self.since_key = 0 if rec[0]=="f" else self.since_key+1
+                pos += len(line)
+            self.end = pos
+        if os.path.getsize(self.path) != self.end:
+            with open(self.path, "r+b") as f:
+                f.truncate(self.end)
+
+    def __len__(self):
+        return len(self.times)
+
+    def record(self, text, title="", t=None):
+        # 返回本次写入的字节数；内容没变时不记
+        with self.lock:
+            if self.times and self.last_text is None:
+                self.last_text = self._text(len(self.times)-1)
+            if text==self.last_text:
+                return 0
+            t = max(t or time.time(), self.times[-1] if self.times else 0)
+            rec = None
+            if self.last_text is not None and self.since_key < KEYFRAME-1:
+                p, s, mid = make_delta(self.last_text, text)
+                if len(mid)*2 < len(text):
+                    rec = ["d", t, title, p, s, mid]
+            if rec is None:
+                rec = ["f", t, title, text]
+            raw = _line(rec).encode("utf-8")
+            if self.end==0:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                raw = _line([MAGIC, VERSION, self.doc_id]).encode("utf-8") + raw
+                self.end = len(raw) - len(_line(rec).encode("utf-8"))
+            with open(self.path, "ab") as f:
+                f.write(raw)
+            self.times.append(t); self.offsets.append(self.end)
+            self.full.append(rec[0]=="f"); self.titles.append(title)
+            self.since_key = 0 if rec[0]=="f" else self.since_key+1
+            self.end += len(_line(rec).encode("utf-8"))
+            self.last_text = text
+            if len(self.times) > MAX_REVISIONS + MAX_REVISIONS//4:
+                self._trim(MAX_REVISIONS)
+            return len(raw)
+
+    def _records(self, i, j):
+        # 读出第 i..j 条记录（含两端）；中间可能夹着 _scan 跳过的行，按偏移挑出有效的
+        end = self.offsets[j+1] if j+1 < len(self.offsets) else self.end
+        with open(self.path, "rb") as f:
+            f.seek(self.offsets[i])
+            data = f.read(end-self.offsets[i])
+        want, pos, out = set(self.offsets[i:j+1]), self.offsets[i], []
+        for l in data.splitlines(keepends=True):
+            if pos in want:
+                out.append(json.loads(l))
+            pos += len(l)
+        return out
+
+    def _text(self, i):
+        k = i
+        while not self.full[k]:
+            k -= 1
+        text = None
+        for rec in self._records(k, i):
+            text = rec[3] if rec[0]=="f" else apply_delta(text, rec[3], rec[4], rec[5])
+        return text
+
+    def text(self, i):
+        with self.lock:
+            return self._text(i)
+
+    def index_at(self, t):
+        # 时间 t 时有效的修订序号；早于第一个修订时返回 -1
+        return bisect_right(self.times, t) - 1
+
+    def at(self, t):
+        i = self.index_at(t)
+        return None if i < 0 else self.text(i)
+
+    def revisions(self):
+        # [(序号, 时间, 标题)]，不还原正文
+        return list(zip(range(len(self.times)), self.times, self.titles))
+
+    def _trim(self, keep):
+        # 超出上限时丢掉最旧的修订：第一个保留的改写成全文，其后的记录原样复制
+        first = len(self.times) - keep
+        text = self._text(first)
+        with open(self.path, "rb") as f:
+            f.seek(self.offsets[first+1] if first+1 < len(self.offsets) else self.end)
+            rest = f.read(self.end - f.tell())
+        head = _line([MAGIC, VERSION, self.doc_id]).encode("utf-8")
+        rec = _line(["f", self.times[first], self.titles[first], text]).encode("utf-8")
+        atomic_write(self.path, head + rec + rest)
+        shift = self.offsets[first+1] - (len(head)+len(rec)) if first+1 < len(self.offsets) else 0
+        self.times = self.times[first:]; self.titles = self.titles[first:]
+        self.full = [True] + self.full[first+1:]
+        self.offsets = [len(head)] + [o-shift for o in self.offsets[first+1:]]
+        self.end = len(head) + len(rec) + len(rest)
+
+    def size(self):
+        return self.end
+
+
+def history_dir():
+    return os.path.join(default_home(), "history")
+
+def history_path(doc_id):
+    return os.path.join(history_dir(), hashlib.sha1(doc_id.encode("utf-8")).hexdigest()[:20] + HIST_EXT)
+
+_open = {}
+_open_lock = threading.Lock()
+
+def history_for(doc_id):
+    # 同一便签只保留一个实例：写线程记录、GUI 线程浏览共用同一份索引
+    with _open_lock:
+        h = _open.get(doc_id)
+        if h is None:
+            h = _open[doc_id] = NoteHistory(history_path(doc_id), doc_id)
+        return h
+
+def record_quietly(doc_id, text, title=""):
+    # 修订历史是附带的：打不开或写不进只记日志，不能让便签本身的保存跟着失败
+    try:
+        return history_for(doc_id).record(text, title)
+    except Exception:
+        log.exception("记录修订历史失败：%s", doc_id)
+        return 0
+
+def recording(sink, doc_id):
+    # 包装自动保存的 sink：写盘成功后在同一线程里追加一条修订；保存成败只看 sink
+    def run(data):
+        n = sink(data)
+        record_quietly(doc_id, data.get("content",""), data.get("title",""))
+        return n
+    return run
@@ -0,0 +1,103 @@
+# NoteLoader.py —— 超大便签的分块加载：后台线程解析，GUI 线程分批填充文档
+#
+# 先放第一屏文字让窗口立刻可用，其余内容每轮事件循环插入一块，界面不会卡住。
+import os, time, threading
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from PyQt5.QtGui import QTextCursor
+
+from NoteFormat import read_note_file, read_note_header, is_sn_v2
+
+LARGE_NOTE_BYTES = int(os.environ.get("STICKYNOTES_LARGE_NOTE", str(1 << 20)))
+FIRST_SCREEN_CHARS = 8192
+CHUNK_CHARS = 256 * 1024
+
+def is_large(path):
+    # v2 正文可能压缩过，按文件头里记录的原始长度判断
+    try:
+        if is_sn_v2(path):
+            return read_note_header(path)["raw_len"] >= LARGE_NOTE_BYTES
+        return os.path.getsize(path) >= LARGE_NOTE_BYTES
+    except (OSError, ValueError):
+        return False
+
+def _cut(text, start, size):
+    # 尽量在换行处切开，避免一行被拆成两次排版
+    end = min(len(text), start+size)
+    if end < len(text):
+        nl = text.rfind("\n", start, end)
+        if nl > start:
+            end = nl+1
+    return end
+
+
+class ChunkedLoader(QObject):
+    parsed = pyqtSignal(object)      # 整份 dict，正文填充前发出（标题、位置先生效）
+    failed = pyqtSignal(str)
+    finished = pyqtSignal(object)    # 填充完成，参数同 parsed
+    _ready = pyqtSignal(object)
+
+    def __init__(self, editor, parent=None):
+        super().__init__(parent)
+        self.editor = editor
+        self.data = None
+        self.pos = 0
+        self.times = {}              # start / parsed / first_screen / done，perf_counter 秒
+        self.timer = QTimer(self)
+        self.timer.setInterval(0)
+        self.timer.timeout.connect(self._fill)
+        self._ready.connect(self._on_ready)
+
+    def start(self, path):
+        self.times["start"] = time.perf_counter()
+        threading.Thread(target=self._read, args=(path,), name="note-loader", daemon=True).start()
+
+    def _read(self, path):
+        try:
+            d = read_note_file(path)
+        except Exception as e:
+            d = e
+        try:
+            self._ready.emit(d)
+        except RuntimeError:
+            pass    # 窗口已在加载完成前关闭
+
+    def _on_ready(self, d):
+        self.times["parsed"] = time.perf_counter()
+        if isinstance(d, Exception):
+            self.failed.emit(str(d)); return
+        self.data = d
+        self.parsed.emit(d)
+        text = d.get("content","")
+        doc = self.editor.document()
+        doc.setUndoRedoEnabled(False)
+        self.pos = _cut(text, 0, FIRST_SCREEN_CHARS)
+        self.editor.blockSignals(True)      # 不让填充过程触发自动保存
+        self.editor.setPlainText(text[:self.pos])
+        self.editor.blockSignals(False)
+        self.times["first_screen"] = time.perf_counter()
+        self.timer.start()
+
+    def _fill(self):
+        text = self.data.get("content","")
+        if self.pos >= len(text):
+            self.timer.stop()
+            self.editor.document().setUndoRedoEnabled(True)
+            self.times["done"] = time.perf_counter()
+            self.finished.emit(self.data)
+            return
+        end = _cut(text, self.pos, CHUNK_CHARS)
+        cur = QTextCursor(self.editor.document())
+        cur.movePosition(QTextCursor.End)
+        self.editor.blockSignals(True)
+        cur.insertText(text[self.pos:end])
+        self.editor.blockSignals(False)
+        self.pos = end
+
+    @property
+    def progress(self):
+        n = len(self.data.get("content","")) if self.data else 0
+        return self.pos / n if n else 0.0
+
+    def stats(self):
+        t0 = self.times.get("start")
+        return {k: (v-t0)*1000 for k, v in self.times.items() if t0 is not None}
@@ -0,0 +1,251 @@
+# NoteSearch.py —— 便签 / 待办全文检索（倒排索引，不依赖 Qt）
+import os, re, time, heapq, pickle, atexit, threading
+from bisect import bisect_left
+
+from NoteFormat import atomic_write
+from NoteStore import default_home
+
+INDEX_VERSION = 1
+CJK = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uac00-\ud7af"
+_RUN_RE = re.compile(f"([{CJK}]+)|([^\\W{CJK}]+)")
+_QUERY_RE = re.compile(r'"([^"]*)"|(\S+)')
+
+def _runs(text):
+    for m in _RUN_RE.finditer(text.lower()):
+        yield (m.group(1), True) if m.group(1) else (m.group(2), False)
+
+def tokenize(text):
+    # 中日韩文字：单字 + 相邻二字；其它：按词切分并转小写
+    out = set()
+    for run, cjk in _runs(text):
+        if cjk:
+            out.update(run)
+            out.update(run[i:i+2] for i in range(len(run)-1))
+        else:
+            out.add(run)
+    return out
+
+def _query_tokens(run, cjk):
+    if cjk and len(run)>1:
+        return [run[i:i+2] for i in range(len(run)-1)]
+    return [run]
+
+
+class SearchIndex:
+    def __init__(self, path=None):
+        self.path = path
+        self.docs = {}        # doc_id -> (kind, title, text_lower, mtime)
+        self.postings = {}    # token -> set(doc_id)
+        self._vocab = None    # 排好序的词表，前缀查询用；词表变化时置空
+        self.dirty = False
+        self.lock = threading.RLock()   # 后台索引线程更新，GUI 线程查询
+
+    # ---- 增量更新 ----
+    def update(self, doc_id, text, title="", kind="note", mtime=None):
+        # 切词在锁外做，大便签切词期间查询不被挡住
+        full = f"{title}\n{text}"
+        new, low = tokenize(full), full.lower()
+        with self.lock:
+            cur = self.docs.get(doc_id)
+        old = tokenize(cur[2]) if cur else set()   # 旧词表由旧文本重新切分，免得多存一份
+        with self.lock:
+            now = self.docs.get(doc_id)
+            if now is not cur:      # 切词期间别处改过这条，按最新的旧文本重算
+                old = tokenize(now[2]) if now else set()
+            self._apply(doc_id, old, new, (kind, title, low, mtime if mtime is not None else time.time()))
+
+    def _apply(self, doc_id, old, new, doc):
+        for t in old - new:
+            s = self.postings.get(t)
+            if s is not None:
+                s.discard(doc_id)
+                if not s:
+                    del self.postings[t]; self._vocab = None
+        for t in new - old:
+            s = self.postings.get(t)
+            if s is None:
+                s = self.postings[t] = set(); self._vocab = None
+            s.add(doc_id)
+        self.docs[doc_id] = doc
+        self.dirty = True
+
+    def remove(self, doc_id):
+        with self.lock:
+            cur = self.docs.pop(doc_id, None)
+            if cur is None:
+                return
+            for t in tokenize(cur[2]):
+                s = self.postings.get(t)
+                if s is not None:
+                    s.discard(doc_id)
+                    if not s:
+                        del self.postings[t]; self._vocab = None
+            self.dirty = True
+
+    # ---- 查询 ----
+    def _prefix(self, p):
+        if self._vocab is None:
+            self._vocab = sorted(self.postings)
+        v = self._vocab
+        i = bisect_left(v, p); j = i
+        while j < len(v) and v[j].startswith(p):
+            j += 1
+        if j-i == 1:
+            return self.postings[v[i]]
+        out = set()
+        for t in v[i:j]:
+            out |= self.postings[t]
+        return out
+
+    def search(self, query, limit=50):
+        with self.lock:
+            return self._search(query, limit)
+
+    def _search(self, query, limit):
+        # 语法：空格分隔的词全部要匹配；"..." 为短语；末尾 * 为前缀
+        sets, checks = [], []
+        for m in _QUERY_RE.finditer(query):
+            phrase, word = m.group(1), m.group(2)
+            if phrase is not None:
+                phrase = phrase.strip().lower()
+                if not phrase:
+                    continue
+                checks.append(phrase)
+                for run, cjk in _runs(phrase):
+                    sets.extend(self.postings.get(t, set()) for t in _query_tokens(run, cjk))
+                continue
+            prefix = word.endswith("*")
+            runs = list(_runs(word))
+            for n, (run, cjk) in enumerate(runs):
+                if prefix and n==len(runs)-1 and not cjk:
+                    sets.append(self._prefix(run))
+                    continue
+                sets.extend(self.postings.get(t, set()) for t in _query_tokens(run, cjk))
+                if cjk and len(run)>2:
+                    checks.append(run)   # 二字组只保证都出现，长词要核对原文
+        if not sets:
+            return []
+        sets.sort(key=len)
+        first, rest = sets[0], sets[1:]
+        docs = self.docs
+        hits = (d for d in first
+                if all(d in s for s in rest) and all(c in docs[d][2] for c in checks))
+        # 所有命中都要参与比较才能取到最新的 limit 条；堆只保留 limit 个，不排整个结果
+        top = heapq.nlargest(limit, hits, key=lambda d: docs[d][3])
+        return [(d, docs[d][0], docs[d][1]) for d in top]
+
+    def snippet(self, doc_id, query, width=40):
+        with self.lock:
+            text = self.docs[doc_id][2]
+        for run, _ in _runs(query.replace('"'," ").replace("*"," ")):
+            i = text.find(run)
+            if i >= 0:
+                s = max(0, i-width//2)
+                return text[s:s+width].replace("\n"," ")
+        return text[:width].replace("\n"," ")
+
+    # ---- 持久化 ----
+    def save(self, path=None):
+        path = path or self.path
+        if not path:
+            return
+        with self.lock:
+            raw = pickle.dumps({
+                "version": INDEX_VERSION, "docs": self.docs, "postings": self.postings,
+            }, protocol=pickle.HIGHEST_PROTOCOL)
+            self.dirty = False
+        atomic_write(path, raw)
+
+    @classmethod
+    def load(cls, path):
+        idx = cls(path)
+        try:
+            with open(path,"rb") as f:
+                d = pickle.load(f)
+            if d.get("version")==INDEX_VERSION:
+                idx.docs, idx.postings = d["docs"], d["postings"]
+        except (OSError, EOFError, pickle.UnpicklingError, KeyError):
+            pass
+        return idx
+
+    def sync_repository(self, repo):
+        # 启动时只补索引比仓库旧的记录，不整体重建
+        seen = set()
+        for m in repo.list():
+            did = f"{m.kind}:{m.id}"; seen.add(did)
+            cur = self.docs.get(did)
+            if cur is None or cur[3] < m.mtime:
+                self.update(did, document_text(repo.get(m.id) or {}), m.title or "", m.kind, m.mtime)
+        for did in [d for d in self.docs if d.split(":",1)[0] in ("note","todo") and d not in seen]:
+            self.remove(did)
+
+
+def document_text(data):
+    if "items" in data:
+        return "\n".join(it.get("text","") for it in data["items"])
+    return data.get("content","")
+
+
+_default = None
+_default_lock = threading.Lock()
+
+def default_index():
+    # 第一次用到时才载入并补齐仓库；窗口只经 index_later 更新索引，这一步落在后台线程，
+    # 只有打开搜索窗口时才可能在 GUI 线程上做
+    global _default
+    with _default_lock:
+        if _default is None:
+            from NoteStore import default_repository
+            idx = SearchIndex.load(os.path.join(default_home(), "search.idx"))
+            idx.sync_repository(default_repository())
+            atexit.register(lambda: idx.dirty and idx.save())
+            _default = idx
+    return _default
+
+
+class _Indexer:
+    # 后台索引线程：窗口只交出文本，切词、更新倒排表都在这里做；
+    # 同一文档还没处理的旧版本直接被新版本替换
+    def __init__(self):
+        self.cond = threading.Condition()
+        self.pending = {}          # doc_id -> (text, title, kind)
+        self.busy = False
+        self.thread = None
+
+    def submit(self, doc_id, text, title, kind):
+        with self.cond:
+            self.pending.pop(doc_id, None)      # 重新排到队尾
+            self.pending[doc_id] = (text, title, kind)
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name="search-index", daemon=True)
+                self.thread.start()
+            self.cond.notify_all()
+
+    def wait(self):
+        with self.cond:
+            while self.pending or self.busy:
+                self.cond.wait()
+
+    def _run(self):
+        while True:
+            with self.cond:
+                while not self.pending:
+                    self.cond.wait()
+                doc_id = next(iter(self.pending))
+                args = self.pending.pop(doc_id)
+                self.busy = True
+            try:
+                default_index().update(doc_id, *args)
+            except Exception:
+                pass        # 索引出错不影响便签本身，下次保存会再提交
+            with self.cond:
+                self.busy = False
+                self.cond.notify_all()
+
+_indexer = _Indexer()
+
+def index_later(doc_id, text, title="", kind="note"):
+    _indexer.submit(doc_id, text, title, kind)
+
+def wait_indexed():
+    _indexer.wait()
@@ -0,0 +1,178 @@
+# NoteStore.py —— 便签 / 待办的存储仓库（不依赖 Qt）
+import os, json, time, uuid, sqlite3, threading
+from collections import namedtuple
+
+# .sn 文件的编解码在 NoteFormat（GUI 与命令行共用）
+from NoteFormat import read_note_file, read_note_header, write_note_file
+
+NoteMeta = namedtuple("NoteMeta", "id kind title geometry mtime")
+
+def default_home():
+    home = os.environ.get("STICKYNOTES_HOME") or os.path.join(os.path.expanduser("~"), ".stickynotes")
+    os.makedirs(home, exist_ok=True)
+    return home
+
+
+class SqliteBackend:
+    # 单表 + 主键索引：按 id 取值 O(1)，列表只读元数据列，不碰正文
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS notes (
+                id TEXT PRIMARY KEY, kind TEXT NOT NULL,
+                title TEXT, geometry TEXT, mtime REAL, body TEXT
+            )""")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS notes_kind ON notes(kind, mtime)")
+
+    def get(self, nid):
+        with self.lock:
+            row = self.conn.execute("SELECT body FROM notes WHERE id=?", (nid,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, nid, kind, data, mtime):
+        body = json.dumps(data, ensure_ascii=False, separators=(",",":"))
+        geo = json.dumps(data.get("geometry"))
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO notes(id,kind,title,geometry,mtime,body) VALUES(?,?,?,?,?,?)",
+                (nid, kind, data.get("title",""), geo, mtime, body))
+        return len(body)
+
+    def put_many(self, rows):
+        # rows: [(id, kind, data, mtime)]，一个事务写完
+        with self.lock:
+            self.conn.execute("BEGIN")
+            try:
+                for nid, kind, data, mtime in rows:
+                    self.conn.execute(
+                        "INSERT OR REPLACE INTO notes(id,kind,title,geometry,mtime,body) VALUES(?,?,?,?,?,?)",
+                        (nid, kind, data.get("title",""), json.dumps(data.get("geometry")), mtime,
+                         json.dumps(data, ensure_ascii=False, separators=(",",":"))))
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK"); raise
+
+    def delete(self, nid):
+        with self.lock:
+            self.conn.execute("DELETE FROM notes WHERE id=?", (nid,))
+
+    def list_meta(self, kind=None):
+        sql = "SELECT id,kind,title,geometry,mtime FROM notes"
+        args = ()
+        if kind:
+            sql += " WHERE kind=?"; args = (kind,)
+        with self.lock:
+            rows = self.conn.execute(sql + " ORDER BY mtime DESC", args).fetchall()
+        return [NoteMeta(i, k, t, json.loads(g) if g else None, m) for i,k,t,g,m in rows]
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+class JsonDirBackend:
+    # 原来的做法：一个便签一个 .sn 文件；保留用于对照和迁移
+    def __init__(self, directory, fmt=None):
+        self.dir = directory
+        self.fmt = fmt          # 写盘格式，None 按 NoteFormat 的默认
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, nid):
+        return os.path.join(self.dir, nid + ".sn")
+
+    def get(self, nid):
+        try:
+            return read_note_file(self._path(nid))
+        except FileNotFoundError:
+            return None
+
+    def put(self, nid, kind, data, mtime):
+        return write_note_file(self._path(nid), dict(data, kind=kind), fmt=self.fmt)
+
+    def put_many(self, rows):
+        for nid, kind, data, mtime in rows:
+            self.put(nid, kind, data, mtime)
+
+    def delete(self, nid):
+        try: os.remove(self._path(nid))
+        except FileNotFoundError: pass
+
+    def list_meta(self, kind=None):
+        out = []
+        for name in os.listdir(self.dir):
+            if not name.endswith(".sn"):
+                continue
+            p = os.path.join(self.dir, name)
+            try:
+                h = read_note_header(p)
+                mtime = os.path.getmtime(p)
+            except (OSError, ValueError):
+                continue        # 空文件、损坏的文件不影响整个列表
+            k = h["kind"]
+            if kind and k!=kind:
+                continue
+            out.append(NoteMeta(name[:-3], k, h["title"], h["geometry"], mtime))
+        out.sort(key=lambda m: m.mtime, reverse=True)
+        return out
+
+    def close(self):
+        pass
+
+
+class NoteRepository:
+    def __init__(self, backend):
+        self.backend = backend
+
+    @staticmethod
+    def new_id():
+        return uuid.uuid4().hex
+
+    def get(self, nid):
+        return self.backend.get(nid)
+
+    def save(self, nid, data, kind="note"):
+        return self.backend.put(nid, kind, data, time.time())
+
+    def delete(self, nid):
+        self.backend.delete(nid)
+
+    def list(self, kind=None):
+        return self.backend.list_meta(kind)
+
+    def import_sn(self, path, nid=None):
+        nid = nid or self.new_id()
+        d = read_note_file(path)
+        self.backend.put(nid, d.pop("kind","note"), d, os.path.getmtime(path))
+        return nid
+
+    def export_sn(self, nid, path):
+        d = self.get(nid)
+        if d is None:
+            raise KeyError(nid)
+        return write_note_file(path, d)
+
+    def import_dir(self, directory):
+        rows = []
+        for name in sorted(os.listdir(directory)):
+            if name.endswith(".sn"):
+                p = os.path.join(directory, name)
+                d = read_note_file(p)
+                rows.append((self.new_id(), d.pop("kind","note"), d, os.path.getmtime(p)))
+        self.backend.put_many(rows)
+        return [r[0] for r in rows]
+
+    def close(self):
+        self.backend.close()
+
+
+_default = None
+
+def default_repository():
+    global _default
+    if _default is None:
+        _default = NoteRepository(SqliteBackend(os.path.join(default_home(), "notes.db")))
+    return _default
@@ -0,0 +1,235 @@
+# NoteSync.py —— 便签目录与同步目录之间的增量双向同步（不依赖 Qt）
+#
+# 本地清单记录上次同步完成时每个文件的内容哈希（两边当时一致，作为三方比较的基准），
+# 以及两边各自的 (大小, mtime) -> 哈希 缓存：大小和修改时间都没变的文件不再读。
+# 每个文件按 本地 / 远端 / 基准 三个哈希决定动作：
+#   只有一边变了     -> 把那一边复制（或删除）到另一边
+#   两边都变且不同   -> 冲突：不覆盖任何一边，远端版本另存为 名字.conflict-时间.sn
+#   一边删一边改     -> 保留改过的那份
+# 删除不真删，移进 <状态>.trash/；每次动作追加到 <状态>.log（JSON 行）。
+# "远端"就是一个目录（共享文件夹、挂载盘），测试时用本地目录代替即可。
+import os, json, time, shutil, hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+from NoteFormat import atomic_write
+
+SYNC_EXTS = (".sn", ".snt")
+STATE_VERSION = 1
+HASH_BATCH = 256
+
+def file_hash(path):
+    # blake2b 比 sha1/sha256 快；hashlib 处理大块数据时释放 GIL，线程池能并行
+    with open(path, "rb") as f:
+        return hashlib.blake2b(f.read(), digest_size=20).hexdigest()
+
+def scan(root, exts=SYNC_EXTS):
+    # {相对路径(用 / 分隔): (大小, mtime_ns)}；跳过以 . 开头的文件和目录（临时文件、状态目录）
+    out, stack = {}, [root]
+    while stack:
+        d = stack.pop()
+        try:
+            it = os.scandir(d)
+        except FileNotFoundError:
+            continue
+        with it:
+            for e in it:
+                if e.name.startswith("."):
+                    continue
+                if e.is_dir(follow_symlinks=False):
+                    stack.append(e.path)
+                elif e.name.lower().endswith(exts):
+                    st = e.stat()
+                    rel = os.path.relpath(e.path, root).replace(os.sep, "/")
+                    out[rel] = (st.st_size, st.st_mtime_ns)
+    return out
+
+def _hash_batch(root, rels):
+    out = []
+    for rel in rels:
+        try:
+            out.append((rel, file_hash(os.path.join(root, rel))))
+        except OSError:
+            out.append((rel, None))     # 扫描后被删了
+    return out
+
+def conflict_name(rel, t=None):
+    stem, ext = os.path.splitext(rel)
+    return f"{stem}.conflict-{time.strftime('%Y%m%d-%H%M%S', time.localtime(t))}{ext}"
+
+def state_path(local, remote):
+    from NoteStore import default_home
+    key = hashlib.sha1(f"{os.path.abspath(local)}\n{os.path.abspath(remote)}".encode("utf-8")).hexdigest()[:16]
+    return os.path.join(default_home(), "sync", key + ".json")
+
+
+class SyncEngine:
+    def __init__(self, local, remote, state=None, jobs=None):
+        self.local = os.path.abspath(local)
+        self.remote = os.path.abspath(remote)
+        self.state = state or state_path(self.local, self.remote)
+        self.jobs = jobs or min(32, (os.cpu_count() or 1) * 4)    # 哈希多半在等 IO
+        self.base = {}            # 相对路径 -> 上次同步完成时的哈希
+        self.cache = {"local": {}, "remote": {}}    # 相对路径 -> [大小, mtime_ns, 哈希]
+        self.conflicts = {}       # 相对路径 -> {"local","remote","copy","time"}
+        self.times = {}
+        self.changed = False      # 清单有无改动；没有就不重写（十万个文件时清单有二十多 MB）
+        self._load_state()
+
+    def _load_state(self):
+        try:
+            with open(self.state, encoding="utf-8") as f:
+                st = json.load(f)
+        except FileNotFoundError:
+            return
+        if st.get("version", 0) > STATE_VERSION:
+            raise ValueError(f"不支持的同步清单版本：{st.get('version')}")
+        self.base = st.get("base", {})
+        self.cache = {"local": st.get("local_cache", {}), "remote": st.get("remote_cache", {})}
+        self.conflicts = st.get("conflicts", {})
+
+    def _save_state(self):
+        st = {"version": STATE_VERSION, "local": self.local, "remote": self.remote, "time": time.time(),
+              "base": self.base, "local_cache": self.cache["local"],
+              "remote_cache": self.cache["remote"], "conflicts": self.conflicts}
+        atomic_write(self.state, json.dumps(st, ensure_ascii=False, separators=(",",":")).encode("utf-8"))
+
+    def _hashes(self, side, root, pool):
+        # 扫描一边并算出全部哈希；缓存命中的不读文件，其余分批交给线程池
+        t0 = time.perf_counter()
+        files = scan(root)
+        cache = self.cache[side]
+        hashes, todo = {}, []
+        for rel, (size, mtime) in files.items():
+            c = cache.get(rel)
+            if c and c[0]==size and c[1]==mtime:
+                hashes[rel] = c[2]
+            else:
+                todo.append(rel)
+        batches = [todo[i:i+HASH_BATCH] for i in range(0, len(todo), HASH_BATCH)]
+        for res in pool.map(lambda b: _hash_batch(root, b), batches):
+            for rel, h in res:
+                if h is not None:
+                    hashes[rel] = h
+                    cache[rel] = [files[rel][0], files[rel][1], h]
+        for rel in list(cache):
+            if rel not in hashes:
+                del cache[rel]; self.changed = True
+        self.changed |= bool(todo)
+        self.times[side + "_scan_s"] = time.perf_counter()-t0
+        self.times[side + "_hashed"] = len(todo)
+        return hashes
+
+    def plan(self):
+        # [(动作, 相对路径, 预期哈希)]；动作为 push / pull / delete_remote / delete_local / conflict
+        with ThreadPoolExecutor(self.jobs) as pool:
+            loc = self._hashes("local", self.local, pool)
+            rem = self._hashes("remote", self.remote, pool)
+        self._seen = (loc, rem)
+        actions = []
+        for rel in sorted(set(loc) | set(rem) | set(self.base)):
+            L, R, B = loc.get(rel), rem.get(rel), self.base.get(rel)
+            if L==R:
+                continue
+            c = self.conflicts.get(rel)
+            if c and R==c["remote"] and L==c["local"]:
+                continue        # 已记录过的冲突，等用户处理
+            if c and R==c["remote"]:
+                B = R           # 冲突后本地又改过：视为已处理，本地版本为准
+            if L==B:
+                actions.append(("pull", rel, R) if R is not None else ("delete_local", rel, L))
+            elif R==B:
+                actions.append(("push", rel, L) if L is not None else ("delete_remote", rel, R))
+            elif L is None:
+                actions.append(("pull", rel, R))     # 本地删了、远端改了：保留改过的
+            elif R is None:
+                actions.append(("push", rel, L))
+            else:
+                actions.append(("conflict", rel, R))
+        return actions
+
+    def run(self, dry_run=False, on_action=None):
+        t0 = time.perf_counter()
+        actions = self.plan()
+        loc, rem = self._seen
+        counts = {}
+        if not dry_run:
+            os.makedirs(os.path.dirname(self.state), exist_ok=True)
+        log = None if dry_run else open(os.path.splitext(self.state)[0] + ".log", "a", encoding="utf-8")
+        try:
+            for op, rel, h in actions:
+                ok = True if dry_run else self._apply(op, rel, h, loc, rem)
+                key = op if ok else "skipped"
+                counts[key] = counts.get(key, 0) + 1
+                if on_action:
+                    on_action(op, rel, ok)
+                if log is not None:
+                    log.write(json.dumps({"t": time.time(), "op": op, "file": rel, "hash": h, "ok": ok},
+                                         ensure_ascii=False) + "\n")
+        finally:
+            if log is not None:
+                log.close()
+        if not dry_run and (actions or self.changed):
+            # 两边一致的文件就是新的基准；其余（冲突、跳过的）保留旧基准
+            for rel in set(loc) | set(rem) | set(self.base):
+                if loc.get(rel)==rem.get(rel):
+                    if loc.get(rel) is None:
+                        self.base.pop(rel, None)
+                    else:
+                        self.base[rel] = loc[rel]
+                        self.conflicts.pop(rel, None)
+            self._save_state()
+        self.times["total_s"] = time.perf_counter()-t0
+        return {"files": len(set(loc) | set(rem)), "actions": counts, "conflicts": len(self.conflicts),
+                "times": dict(self.times)}
+
+    def _copy(self, src_root, dst_root, rel, expect, side):
+        src = os.path.join(src_root, *rel.split("/"))
+        dst = os.path.join(dst_root, *rel.split("/"))
+        with open(src, "rb") as f:
+            data = f.read()
+        if hashlib.blake2b(data, digest_size=20).hexdigest() != expect:
+            return False        # 扫描后又被改过，留到下次同步
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        atomic_write(dst, data)
+        st = os.stat(dst)
+        self.cache[side][rel] = [st.st_size, st.st_mtime_ns, expect]
+        return True
+
+    def _trash(self, root, rel, side):
+        src = os.path.join(root, *rel.split("/"))
+        dst = os.path.join(os.path.splitext(self.state)[0] + ".trash", side,
+                           time.strftime("%Y%m%d-%H%M%S"), *rel.split("/"))
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        try:
+            shutil.move(src, dst)
+        except FileNotFoundError:
+            pass
+        self.cache[side].pop(rel, None)
+        return True
+
+    def _apply(self, op, rel, h, loc, rem):
+        try:
+            if op=="push":
+                ok = self._copy(self.local, self.remote, rel, h, "remote")
+                if ok: rem[rel] = h
+            elif op=="pull":
+                ok = self._copy(self.remote, self.local, rel, h, "local")
+                if ok: loc[rel] = h
+            elif op=="delete_remote":
+                ok = self._trash(self.remote, rel, "remote"); rem.pop(rel, None)
+            elif op=="delete_local":
+                ok = self._trash(self.local, rel, "local"); loc.pop(rel, None)
+            else:
+                # 冲突：两边都不动，远端版本另存一份到本地，下一轮作为新文件同步出去
+                copy = conflict_name(rel)
+                with open(os.path.join(self.remote, *rel.split("/")), "rb") as f:
+                    atomic_write(os.path.join(self.local, *copy.split("/")), f.read())
+                self.conflicts[rel] = {"local": loc.get(rel), "remote": h, "copy": copy, "time": time.time()}
+                ok = True
+            return ok
+        except OSError:
+            return False
+
+
+def sync_dirs(local, remote, dry_run=False, **kw):
+    return SyncEngine(local, remote, **kw).run(dry_run=dry_run)
@@ -0,0 +1,153 @@
+# NoteWatcher.py —— 外部修改的文件监视：所有窗口共用一个 QFileSystemWatcher
+#
+# 同时监视文件本身和它所在的目录：原子替换（同步盘、脚本、本程序的 atomic_write）
+# 会换掉 inode，只挂文件会丢事件，目录监视负责兜底。一阵连续的变化先攒起来，
+# 静止 DEBOUNCE_MS 后每个文件只 stat 一次、只通知一次；本程序自己写盘造成的变化
+# 按写盘后记下的文件签名过滤掉，不会回调。
+import os, threading
+from PyQt5.QtCore import QObject, QTimer, QFileSystemWatcher
+from PyQt5.QtGui import QTextCursor
+from PyQt5.QtWidgets import QApplication
+
+from NoteHistory import make_delta
+
+DEBOUNCE_MS = 200
+
+def _sig(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+class FileWatcher(QObject):
+    def __init__(self, parent=None, delay=DEBOUNCE_MS):
+        super().__init__(parent)
+        self.qfw = QFileSystemWatcher(self)
+        self.qfw.fileChanged.connect(self._on_file)
+        self.qfw.directoryChanged.connect(self._on_dir)
+        self.listeners = {}      # 绝对路径 -> [callback(path)]
+        self.sigs = {}           # 绝对路径 -> 上次看到的 (mtime_ns, size, inode)
+        self.dirs = {}           # 目录 -> 其中被监视的文件集合
+        self.own = {}            # 绝对路径 -> 本程序最近一次写盘后的签名（写线程填）
+        self.own_lock = threading.Lock()
+        self.pending = set()
+        self.counts = {"events": 0, "flushes": 0, "checked": 0, "notified": 0, "own_writes": 0}
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(delay)
+        self.timer.timeout.connect(self._flush)
+
+    def watch(self, path, callback):
+        p = os.path.abspath(path)
+        cbs = self.listeners.setdefault(p, [])
+        cbs.append(callback)
+        if len(cbs) > 1:
+            return
+        self.sigs[p] = _sig(p)
+        if self.sigs[p] is not None:
+            self.qfw.addPath(p)
+        d = os.path.dirname(p)
+        files = self.dirs.setdefault(d, set())
+        if not files and os.path.isdir(d):
+            self.qfw.addPath(d)
+        files.add(p)
+
+    def unwatch(self, path, callback):
+        p = os.path.abspath(path)
+        cbs = self.listeners.get(p)
+        if not cbs or callback not in cbs:
+            return
+        cbs.remove(callback)
+        if cbs:
+            return
+        del self.listeners[p]
+        self.sigs.pop(p, None); self.pending.discard(p)
+        with self.own_lock:
+            self.own.pop(p, None)
+        self.qfw.removePath(p)
+        d = os.path.dirname(p)
+        files = self.dirs.get(d, set())
+        files.discard(p)
+        if not files:
+            self.dirs.pop(d, None)
+            self.qfw.removePath(d)
+
+    def mark_written(self, path):
+        # 写线程写完后调用：记下签名，随后到来的变化事件若与之相同就不回调
+        p = os.path.abspath(path)
+        sig = _sig(p)
+        with self.own_lock:
+            self.own[p] = sig
+
+    def _on_file(self, path):
+        self.counts["events"] += 1
+        self.pending.add(os.path.abspath(path))
+        self.timer.start()
+
+    def _on_dir(self, d):
+        self.counts["events"] += 1
+        self.pending |= self.dirs.get(os.path.abspath(d), set())
+        self.timer.start()
+
+    def _flush(self):
+        self.counts["flushes"] += 1
+        paths, self.pending = self.pending, set()
+        watched = set(self.qfw.files())
+        for p in paths:
+            if p not in self.listeners:
+                continue
+            self.counts["checked"] += 1
+            old, sig = self.sigs.get(p), _sig(p)
+            if sig is not None and (old is None or old[2] != sig[2] or p not in watched):
+                # 被替换成了新文件：监视要挂到新的 inode 上
+                self.qfw.removePath(p); self.qfw.addPath(p)
+            if sig==old:
+                continue
+            self.sigs[p] = sig
+            with self.own_lock:
+                own = self.own.pop(p, None)
+            if sig is None:
+                continue        # 被删除；重新出现时目录监视会再通知
+            if sig==own:
+                self.counts["own_writes"] += 1
+                continue
+            self.counts["notified"] += 1
+            for cb in list(self.listeners[p]):
+                cb(p)
+
+    def stats(self):
+        return dict(self.counts, files=len(self.listeners), dirs=len(self.dirs))
+
+
+def _u16(text, i):
+    # Python 下标 -> QTextDocument 位置（UTF-16 单元，BMP 之外的字符占两个）
+    return i if text.isascii() else len(text[:i].encode("utf-16-le"))//2
+
+def apply_text(editor, new):
+    # 只替换变化的那一段：光标、选区随文档自动平移，滚动条位置原样恢复。
+    # 整段是一个编辑块，Ctrl+Z 可以一步撤销这次重新载入。返回是否有变化
+    old = editor.toPlainText()
+    p, s, mid = make_delta(old, new)
+    if not mid and p+s==len(old):
+        return False
+    vbar, hbar = editor.verticalScrollBar(), editor.horizontalScrollBar()
+    v, h = vbar.value(), hbar.value()
+    cur = QTextCursor(editor.document())
+    cur.beginEditBlock()
+    cur.setPosition(_u16(old, p))
+    cur.setPosition(_u16(old, len(old)-s), QTextCursor.KeepAnchor)
+    cur.insertText(mid)
+    cur.endEditBlock()
+    vbar.setValue(v); hbar.setValue(h)
+    return True
+
+
+_default = None
+
+def default_watcher():
+    global _default
+    if _default is None:
+        _default = FileWatcher(QApplication.instance())
+    return _default
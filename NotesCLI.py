@@ -0,0 +1,244 @@
+# NotesCLI.py —— 便签批量导入 / 导出 / 校验的命令行工具（不导入 PyQt5，可在无界面服务器上运行）
+#
+#   python NotesCLI.py export 便签目录 输出目录 --to md|txt      # 每个 .sn 一个文件
+#   python NotesCLI.py export 便签目录 out.jsonl --to jsonl      # 一行一个便签，"-" 表示 stdout
+#   python NotesCLI.py import 输入(目录或 .jsonl) 便签目录 [--format v2|json]
+#   python NotesCLI.py validate 便签目录 [--repair]
+#   python NotesCLI.py sync 便签目录 同步目录 [--dry-run] [--state 清单路径]   # 增量双向同步，见 NoteSync
+#
+# 工作分批交给进程池，同时在途的批次有上限，结果边算边输出：
+# 十万个便签也只占用固定的内存，并用满所有核（-j 指定进程数）。
+import os, sys, json, argparse
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from NoteFormat import read_note_file, write_note_file, validate_note_file
+
+BATCH = 64          # 每个任务处理的文件数
+INFLIGHT = 4        # 每个进程最多排队的批次数
+FRONT = "---\n"
+
+# ---- 格式转换（都是纯函数，子进程里执行） ----
+def to_markdown(d):
+    meta = {"title": d.get("title","")}
+    for k in ("geometry", "format"):
+        if d.get(k):
+            meta[k] = d[k]
+    head = "".join(f"{k}: {json.dumps(v, ensure_ascii=False)}\n" for k, v in meta.items())
+    return FRONT + head + FRONT + d.get("content","")
+
+def from_markdown(text, stem):
+    # 有 front matter 就按它取标题和位置；否则第一行 "# 标题" 或文件名作标题
+    d = {"title": stem, "content": text}
+    if text.startswith(FRONT):
+        end = text.find("\n" + FRONT, len(FRONT)-1)
+        if end != -1:
+            for line in text[len(FRONT):end+1].splitlines():
+                k, _, v = line.partition(":")
+                try:
+                    d[k.strip()] = json.loads(v)
+                except ValueError:
+                    d[k.strip()] = v.strip()
+            d["content"] = text[end+1+len(FRONT):]
+            return d
+    first, _, rest = text.partition("\n")
+    if first.startswith("# "):
+        d["title"], d["content"] = first[2:].strip(), rest
+    return d
+
+EXPORT_EXT = {"md": ".md", "txt": ".txt"}
+
+def _export_one(src, rel, dest, fmt):
+    d = read_note_file(src)
+    if fmt=="jsonl":
+        return json.dumps(dict(d, file=rel), ensure_ascii=False)
+    out = os.path.join(dest, os.path.splitext(rel)[0] + EXPORT_EXT[fmt])
+    os.makedirs(os.path.dirname(out), exist_ok=True)
+    text = to_markdown(d) if fmt=="md" else d.get("content","")
+    with open(out, "w", encoding="utf-8") as f:
+        f.write(text)
+    return None
+
+def _import_one(src, rel, dest, fmt):
+    stem = os.path.splitext(os.path.basename(rel))[0]
+    with open(src, encoding="utf-8") as f:
+        text = f.read()
+    d = from_markdown(text, stem) if src.lower().endswith(".md") else {"title": stem, "content": text}
+    _write_sn(os.path.join(dest, os.path.splitext(rel)[0] + ".sn"), d, fmt)
+    return None
+
+def _write_sn(path, d, fmt):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    # "file" 只是 JSONL 里记的相对路径；其余字段（如 "format": "markdown"）原样保留
+    write_note_file(path, {k: v for k, v in d.items() if k != "file"}, fmt=fmt)
+
+def _validate_one(src, rel, dest, repair):
+    status, msg = validate_note_file(src, repair=repair)
+    return json.dumps({"file": rel, "status": status, "message": msg}, ensure_ascii=False)
+
+def _run_batch(fn, batch, dest, opt):
+    # 返回 [(相对路径, 输出行或 None, 错误或 None)]
+    out = []
+    for src, rel in batch:
+        try:
+            out.append((rel, fn(src, rel, dest, opt), None))
+        except Exception as e:
+            out.append((rel, None, f"{type(e).__name__}: {e}"))
+    return out
+
+# ---- 调度 ----
+def iter_files(root, exts):
+    # os.scandir 逐层遍历、边读边产出，不一次性列出整棵树，也不把一整个目录读进内存排序
+    stack = [root]
+    while stack:
+        d = stack.pop()
+        with os.scandir(d) as it:
+            for e in it:
+                if e.is_dir(follow_symlinks=False):
+                    stack.append(e.path)
+                elif e.name.lower().endswith(exts):
+                    yield e.path, os.path.relpath(e.path, root)
+
+def batches(items, n=BATCH):
+    batch = []
+    for it in items:
+        batch.append(it)
+        if len(batch) >= n:
+            yield batch; batch = []
+    if batch:
+        yield batch
+
+def run_parallel(fn, items, dest, opt, jobs):
+    # 生成器：按完成顺序产出每个文件的结果；在途批次数有上限，内存占用固定
+    if jobs <= 1:
+        for b in batches(items):
+            yield from _run_batch(fn, b, dest, opt)
+        return
+    with ProcessPoolExecutor(jobs) as pool:
+        pending = set()
+        for b in batches(items):
+            pending.add(pool.submit(_run_batch, fn, b, dest, opt))
+            if len(pending) >= jobs*INFLIGHT:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for f in done:
+                    yield from f.result()
+        for f in pending:
+            yield from f.result()
+
+def iter_jsonl(path):
+    # 导入 JSON Lines 在主进程里逐行流式处理（写文件是 IO，不值得分发）；
+    # 产出 (行号, 便签或 None, 错误或 None)，坏行记为失败，不中断整个导入
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for i, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                d = json.loads(line)
+            except ValueError as e:
+                yield i, None, f"第 {i} 行不是合法 JSON：{e}"
+                continue
+            if isinstance(d, dict):
+                yield i, d, None
+            else:
+                yield i, None, f"第 {i} 行不是 JSON 对象"
+
+def safe_join(dest, rel):
+    # 导入文件里给的相对路径：拒绝绝对路径和跳出目标目录的 ".."，返回 None
+    if not isinstance(rel, str) or not rel or os.path.isabs(rel) or os.path.splitdrive(rel)[0]:
+        return None
+    root = os.path.abspath(dest)
+    path = os.path.abspath(os.path.join(root, rel))
+    if os.path.commonpath([root, path]) != root or path==root:
+        return None
+    return path
+
+def sync(args):
+    # 哈希用线程（等 IO 为主），-j 为线程数
+    from NoteSync import SyncEngine
+    os.makedirs(args.dest, exist_ok=True)
+    eng = SyncEngine(args.src, args.dest, state=args.state, jobs=args.jobs*4 if args.jobs > 1 else 1)
+    def show(op, rel, ok):
+        if not args.quiet:
+            print(f"{op:<14}{rel}" + ("" if ok else "  （跳过）"))
+    r = eng.run(dry_run=args.dry_run, on_action=show)
+    acts = "，".join(f"{k} {v}" for k, v in sorted(r["actions"].items())) or "无变化"
+    print(f"{r['files']} 个文件：{acts}；未解决冲突 {r['conflicts']}；"
+          f"重新计算哈希 {r['times']['local_hashed']}+{r['times']['remote_hashed']}，"
+          f"用时 {r['times']['total_s']:.2f} s", file=sys.stderr)
+    return 1 if r["conflicts"] or r["actions"].get("skipped") else 0
+
+def main(argv=None):
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1)
+    common.add_argument("-q", "--quiet", action="store_true", help="只输出汇总")
+    ap = argparse.ArgumentParser(description="便签批量导入 / 导出 / 校验（不需要图形界面）")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("export", parents=[common]); p.add_argument("src"); p.add_argument("dest")
+    p.add_argument("--to", choices=("md", "txt", "jsonl"), required=True)
+    p = sub.add_parser("import", parents=[common]); p.add_argument("src"); p.add_argument("dest")
+    p.add_argument("--format", choices=("v2", "json"), default=None)
+    p = sub.add_parser("validate", parents=[common]); p.add_argument("src")
+    p.add_argument("--repair", action="store_true")
+    p = sub.add_parser("sync", parents=[common]); p.add_argument("src"); p.add_argument("dest")
+    p.add_argument("--dry-run", action="store_true", help="只列出要做的动作")
+    p.add_argument("--state", help="同步清单路径（默认在 <home>/sync/ 下按两个目录区分）")
+    args = ap.parse_args(argv)
+    if not os.path.exists(args.src):
+        ap.error(f"找不到 {args.src}")
+    if args.cmd=="sync":
+        return sync(args)
+
+    ok = failed = 0
+    counts = {}
+    out = None
+    log = sys.stderr
+    if args.cmd=="export":
+        if args.to=="jsonl":
+            out = sys.stdout if args.dest=="-" else open(args.dest, "w", encoding="utf-8")
+        results = run_parallel(_export_one, iter_files(args.src, (".sn",)), args.dest, args.to, args.jobs)
+    elif args.cmd=="import" and os.path.isfile(args.src):
+        def from_jsonl():
+            for i, d, err in iter_jsonl(args.src):
+                if err:
+                    yield f"{i}.sn", None, err; continue
+                rel = d.get("file") or f"{i}.sn"
+                path = safe_join(args.dest, rel)
+                if path is None:
+                    yield str(rel), None, "路径不在目标目录内"; continue
+                try:
+                    _write_sn(path, d, args.format); yield rel, None, None
+                except Exception as e:
+                    yield rel, None, f"{type(e).__name__}: {e}"
+        results = from_jsonl()
+    elif args.cmd=="import":
+        results = run_parallel(_import_one, iter_files(args.src, (".md", ".txt")), args.dest, args.format, args.jobs)
+    else:
+        out = sys.stdout
+        results = run_parallel(_validate_one, iter_files(args.src, (".sn",)), None, args.repair, args.jobs)
+
+    try:
+        for rel, line, err in results:
+            if err:
+                failed += 1
+                if not args.quiet:
+                    print(f"失败 {rel}: {err}", file=log)
+                continue
+            ok += 1
+            if line is not None:
+                if args.cmd=="validate":
+                    st = json.loads(line)["status"]
+                    counts[st] = counts.get(st, 0) + 1
+                    if args.quiet or st=="ok":
+                        continue
+                out.write(line + "\n")
+    finally:
+        if out is not None and out is not sys.stdout:
+            out.close()
+    summary = f"完成 {ok}，失败 {failed}"
+    if counts:
+        summary += "（" + "，".join(f"{k} {v}" for k, v in sorted(counts.items())) + "）"
+    print(summary, file=log)
+    bad = failed + counts.get("invalid", 0) + counts.get("unrecoverable", 0)
+    return 1 if bad else 0
+
+if __name__=="__main__":
+    sys.exit(main())
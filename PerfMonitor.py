@@ -0,0 +1,231 @@
+# PerfMonitor.py —— 热点路径计时、事件循环延迟、定期 JSON 转储与悬浮监视窗
+#
+# 默认完全不生效：计时靠运行时替换类上的方法实现，未开启时没有任何包装开销。
+# 开启：环境变量 STICKYNOTES_PERF=1（转储到 <home>/perf.json）或 =文件路径，
+# 命令行 --perf，或在托盘菜单里勾选"性能监视"。
+import os, sys, time, json, functools
+from collections import deque
+from PyQt5.QtWidgets import QApplication, QWidget, QLabel, QVBoxLayout
+from PyQt5.QtCore import Qt, QObject, QEvent, QTimer
+
+from NoteFormat import atomic_write
+from NoteStore import default_home
+
+_env = os.environ.get("STICKYNOTES_PERF", "")
+ENABLED_AT_START = bool(_env) or "--perf" in sys.argv
+DUMP_INTERVAL = 5000     # 毫秒
+PROBE_INTERVAL = 200
+SAMPLES = 512            # 每项保留最近多少次耗时，用来算 p95
+
+# (模块, 类, 方法)；模块没导入过的跳过，不为了计时去导入它。
+# 已经 connect 到信号上的绑定方法替换不到，所以只列由 Qt 虚函数或直接调用进入的方法
+HOT_PATHS = [
+    ("Launcher", "Launcher", "__init__"), ("Launcher", "Launcher", "paintEvent"),
+    ("Launcher", "Launcher", "mouseReleaseEvent"), ("Launcher", "Launcher", "eventFilter"),
+    ("StickyNotes", "StickyNote", "__init__"), ("StickyNotes", "StickyNote", "_save"),
+    ("StickyNotes", "StickyNote", "_load"),
+    # 自动保存的写盘在写线程里执行；sink 每次快照时才从类上取，替换得到
+    ("StickyNotes", "StickyNote", "_write_file"), ("NoteStore", "NoteRepository", "save"),
+    ("TodoList", "TodoList", "__init__"), ("TodoList", "TodoList", "_save"),
+    ("TodoList", "TodoList", "_load"), ("TodoList", "TodoList", "add_todo_item"),
+    ("TodoList", "TodoList", "resizeEvent"),
+    ("TodoList", "TodoList", "paste_lines"), ("TodoList", "TodoList", "clear_completed"),
+    ("TodoList", "TodoList", "sort_items"), ("TodoList", "TodoList", "move_block"),
+    ("WindowDrag", "DragController", "eventFilter"),     # 窗口拖动 / 缩放的鼠标事件都走这里
+    ("Markdown", "MarkdownHighlighter", "highlightBlock"),     # 每次按键只应处理改动的段
+    ("Markdown", "MarkdownPreview", "refresh"),
+    ("WindowRegistry", "WindowRegistry", "eventFilter"),
+    ("Session", "SessionRecorder", "eventFilter"),
+]
+
+class Stat:
+    __slots__ = ("count", "total", "max", "recent")
+
+    def __init__(self):
+        self.count = 0; self.total = 0.0; self.max = 0.0
+        self.recent = deque(maxlen=SAMPLES)
+
+    def add(self, dt):
+        self.count += 1; self.total += dt
+        if dt > self.max: self.max = dt
+        self.recent.append(dt)
+
+    def as_dict(self):
+        r = sorted(self.recent)
+        return {
+            "count": self.count,
+            "total_ms": round(self.total*1000, 3),
+            "avg_ms": round(self.total/self.count*1000, 4) if self.count else None,
+            "p95_ms": round(r[int(len(r)*0.95)]*1000, 4) if r else None,
+            "max_ms": round(self.max*1000, 3),
+        }
+
+stats = {}
+_originals = {}     # (类, 方法) -> 原函数
+
+def _stat(name):
+    s = stats.get(name)
+    if s is None:
+        s = stats[name] = Stat()
+    return s
+
+def _wrap(fn, name):
+    s = _stat(name)
+    @functools.wraps(fn)
+    def timed(*args, **kw):
+        t0 = time.perf_counter()
+        try:
+            return fn(*args, **kw)
+        finally:
+            s.add(time.perf_counter()-t0)
+    return timed
+
+def _resolve(mod, cls):
+    # 直接运行的脚本（python Launcher.py）在 __main__ 里
+    for name in (mod, "__main__"):
+        m = sys.modules.get(name)
+        if m is not None and isinstance(getattr(m, cls, None), type):
+            return getattr(m, cls)
+    return None
+
+def instrument():
+    for mod, cls_name, attr in HOT_PATHS:
+        cls = _resolve(mod, cls_name)
+        if cls is None or (cls, attr) in _originals or attr not in cls.__dict__:
+            continue
+        fn = cls.__dict__[attr]
+        _originals[(cls, attr)] = fn
+        setattr(cls, attr, _wrap(fn, f"{cls_name}.{attr}"))
+
+def uninstrument():
+    for (cls, attr), fn in _originals.items():
+        setattr(cls, attr, fn)
+    _originals.clear()
+
+
+class _Probe(QObject):
+    # 定时投递一个事件，记录从投递到被处理的时间 = 事件循环排队延迟
+    TYPE = QEvent.Type(QEvent.registerEventType())
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.stat = _stat("event_loop.latency")
+        self.posted = None     # 在途探针的投递时间
+        self.timer = QTimer(self)
+        self.timer.setInterval(PROBE_INTERVAL)
+        self.timer.timeout.connect(self._post)
+
+    def _post(self):
+        # 上一个探针还没被处理就不再投递，否则会覆盖它的投递时间
+        if self.posted is not None:
+            return
+        self.posted = time.perf_counter()
+        QApplication.postEvent(self, QEvent(self.TYPE))
+
+    def event(self, ev):
+        if ev.type()==self.TYPE:
+            if self.posted is not None:
+                self.stat.add(time.perf_counter()-self.posted)
+                self.posted = None
+            return True
+        return super().event(ev)
+
+
+class PerfOverlay(QWidget):
+    def __init__(self, monitor):
+        super().__init__()
+        self.monitor = monitor
+        self.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint | Qt.Tool)
+        self.setAttribute(Qt.WA_ShowWithoutActivating)
+        self.label = QLabel(self)
+        self.label.setStyleSheet("background:rgba(0,0,0,170);color:#e0e0e0;padding:6px;"
+                                 "font-family:Consolas,monospace;font-size:11px;")
+        lay = QVBoxLayout(self)
+        lay.setContentsMargins(0,0,0,0)
+        lay.addWidget(self.label)
+        self.timer = QTimer(self)
+        self.timer.setInterval(1000)
+        self.timer.timeout.connect(self.refresh)
+
+    def showEvent(self, ev):
+        self.refresh(); self.timer.start()
+        super().showEvent(ev)
+
+    def hideEvent(self, ev):
+        self.timer.stop()
+        super().hideEvent(ev)
+
+    def refresh(self):
+        rows = sorted(self.monitor.snapshot()["stats"].items(), key=lambda kv: -kv[1]["total_ms"])
+        lines = [f"{'':<30}{'n':>7}{'avg':>8}{'p95':>8}{'max':>8}  ms"]
+        for name, s in rows[:14]:
+            if s["count"]:
+                lines.append(f"{name:<30}{s['count']:>7}{s['avg_ms']:>8.2f}{s['p95_ms']:>8.2f}{s['max_ms']:>8.1f}")
+        self.label.setText("\n".join(lines))
+        self.adjustSize()
+
+
+class PerfMonitor(QObject):
+    def __init__(self, path=None, parent=None):
+        super().__init__(parent)
+        self.path = path or (_env if _env not in ("", "1") else os.path.join(default_home(), "perf.json"))
+        self.active = False
+        self.started = None
+        self.probe = _Probe(self)
+        self.overlay = None
+        self.dump_timer = QTimer(self)
+        self.dump_timer.setInterval(DUMP_INTERVAL)
+        self.dump_timer.timeout.connect(self.dump)
+
+    def start(self):
+        if self.active:
+            return
+        instrument()
+        self.active = True
+        self.started = time.time()
+        self.probe.timer.start()
+        self.dump_timer.start()
+
+    def stop(self):
+        if not self.active:
+            return
+        self.dump()
+        uninstrument()
+        self.active = False
+        self.probe.timer.stop(); self.dump_timer.stop()
+        if self.overlay is not None:
+            self.overlay.hide()
+
+    def snapshot(self):
+        return {"time": time.time(), "since": self.started,
+                "stats": {k: s.as_dict() for k, s in sorted(stats.items())}}
+
+    def dump(self):
+        if self.active:
+            atomic_write(self.path, json.dumps(self.snapshot(), ensure_ascii=False, indent=2).encode("utf-8"))
+
+    def set_overlay(self, on):
+        # 托盘菜单的勾选项：打开监视窗时顺带开启计时，关闭时一并撤掉包装
+        if on:
+            self.start()
+            if self.overlay is None:
+                self.overlay = PerfOverlay(self)
+                geo = QApplication.primaryScreen().availableGeometry()
+                self.overlay.move(geo.right()-420, geo.top()+20)
+            self.overlay.show()
+        else:
+            self.stop()
+
+
+_default = None
+
+def default_monitor():
+    global _default
+    if _default is None:
+        _default = PerfMonitor(parent=QApplication.instance())
+    return _default
+
+def start_if_enabled():
+    # 在窗口类都已导入之后调用
+    if ENABLED_AT_START:
+        default_monitor().start()
@@ -0,0 +1,88 @@
+# ReminderQueue.py —— 待办提醒的时间队列（不依赖 Qt）
+#
+# 最小堆 + 惰性删除：改期只往堆里压一条新记录，取消只从 live 里删；
+# 堆顶的过期记录在取下一个时间时顺手弹掉。过期记录太多时整体重建一次堆。
+# schedule / cancel 都是 O(log n)，next_time 均摊 O(log n)。
+import time, heapq, itertools
+
+class ReminderQueue:
+    def __init__(self):
+        self.heap = []           # (时间, 序号, key)
+        self.live = {}           # key -> (时间, 序号, payload)
+        self._seq = itertools.count()
+
+    def __len__(self):
+        return len(self.live)
+
+    def __contains__(self, key):
+        return key in self.live
+
+    def schedule(self, key, when, payload=None):
+        # 同一 key 再次 schedule 即改期，旧记录作废
+        seq = next(self._seq)
+        self.live[key] = (when, seq, payload)
+        heapq.heappush(self.heap, (when, seq, key))
+        self._maybe_compact()
+
+    def cancel(self, key):
+        found = self.live.pop(key, None) is not None
+        if found:
+            self._maybe_compact()
+        return found
+
+    def get(self, key):
+        e = self.live.get(key)
+        return None if e is None else (e[0], e[2])
+
+    def _stale(self, entry):
+        e = self.live.get(entry[2])
+        return e is None or e[1] != entry[1]
+
+    def next_time(self):
+        heap = self.heap
+        while heap and self._stale(heap[0]):
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def pop_due(self, now=None):
+        # 取出所有到期的 [(key, 时间, payload)]，按时间先后
+        now = time.time() if now is None else now
+        out = []
+        while True:
+            t = self.next_time()
+            if t is None or t > now:
+                return out
+            _, seq, key = heapq.heappop(self.heap)
+            out.append((key, t, self.live.pop(key)[2]))
+
+    def upcoming(self, n):
+        # 最早的 n 个 [(key, 时间, payload)]，不改动队列
+        best = heapq.nsmallest(n, ((w, s, k) for k, (w, s, _) in self.live.items()))
+        return [(k, w, self.live[k][2]) for w, s, k in best]
+
+    def _maybe_compact(self):
+        if len(self.heap) > 2*len(self.live) + 1024:
+            self.heap = [(w, s, k) for k, (w, s, _) in self.live.items()]
+            heapq.heapify(self.heap)
+
+
+_WEEKDAYS = "一二三四五六日"
+
+def format_due(t, now=None):
+    # 今天 18:00 / 明天 09:00 / 周三 10:00（一周内）/ 10月20日 / 2027-01-02（不同年）
+    now = time.time() if now is None else now
+    lt, ln = time.localtime(t), time.localtime(now)
+    hm = time.strftime("%H:%M", lt)
+    days = (time.mktime(lt[:3] + (0, 0, 0, 0, 0, -1)) - time.mktime(ln[:3] + (0, 0, 0, 0, 0, -1))) / 86400
+    days = round(days)
+    if days==0:
+        return f"今天 {hm}"
+    if days==1:
+        return f"明天 {hm}"
+    if days==-1:
+        return f"昨天 {hm}"
+    if 1 < days < 7:
+        return f"周{_WEEKDAYS[lt.tm_wday]} {hm}"
+    if lt.tm_year==ln.tm_year:
+        return f"{lt.tm_mon}月{lt.tm_mday}日 {hm}"
+    return time.strftime("%Y-%m-%d %H:%M", lt)
@@ -0,0 +1,164 @@
+# Reminders.py —— 待办到期提醒：全局一个调度器、一个 QTimer
+#
+# 所有清单的提醒都放进同一个 ReminderQueue，QTimer 只为最早的那个上弦。
+# 上弦时长最多 MAX_ARM：QTimer 走单调时钟，睡眠 / 恢复、手动改系统时间时
+# 与墙上时间对不上；每次醒来都按 time.time() 判断到期，最多晚 MAX_ARM 就能补上。
+# 提醒发出后记为已提醒（日志里 due 操作的 remind 置空），重启后不会再弹。
+import os, time
+from PyQt5.QtWidgets import (
+    QApplication, QDialog, QDateTimeEdit, QComboBox, QDialogButtonBox,
+    QFormLayout, QPushButton
+)
+from PyQt5.QtCore import Qt, QObject, QTimer, QDateTime, pyqtSignal
+
+from ReminderQueue import ReminderQueue
+from TodoJournal import TodoJournal
+
+MAX_ARM = 60 * 1000        # 毫秒
+JUMP_TOLERANCE = 2.0       # 墙上时间与单调时钟相差超过这么多秒，记为一次时钟跳变
+
+# 提醒时间相对到期时间的提前量（秒）
+REMIND_OFFSETS = [("到期时", 0), ("提前 5 分钟", 300), ("提前 15 分钟", 900),
+                  ("提前 1 小时", 3600), ("提前 1 天", 86400), ("不提醒", None)]
+
+
+class ReminderService(QObject):
+    due = pyqtSignal(object)     # payload：source, item_id, text, title, path, due
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.queue = ReminderQueue()
+        self.by_source = {}      # source -> {item_id}
+        self.owners = {}         # source -> callback(payload)，清单窗口打开时由它记录"已提醒"并刷新文字
+        self.deadline = None     # 当前计时器对应的墙上时间
+        self.armed_at = None     # (墙上时间, 单调时钟)
+        self.stats = {"armed": 0, "wakes": 0, "fired": 0, "clock_jumps": 0}
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self._wake)
+
+    # ---- 登记 ----
+    def set(self, source, item_id, remind, payload=None, arm=True):
+        # remind 为 None 即取消
+        key = (source, item_id)
+        if remind is None:
+            self.queue.cancel(key)
+            self.by_source.get(source, set()).discard(item_id)
+        else:
+            self.queue.schedule(key, remind, dict(payload or {}, source=source, item_id=item_id))
+            self.by_source.setdefault(source, set()).add(item_id)
+        if arm:
+            self._arm()
+
+    def cancel_source(self, source):
+        for iid in self.by_source.pop(source, ()):
+            self.queue.cancel((source, iid))
+        self._arm()
+
+    def track_items(self, source, items, title="", path=None):
+        # 整张清单重新登记：已完成或没有提醒时间的不进队列
+        for iid in self.by_source.pop(source, ()):
+            self.queue.cancel((source, iid))
+        for it in items:
+            if it.get("remind") is not None and not it.get("done"):
+                self.set(source, it["id"], it["remind"], {"text": it.get("text",""), "title": title,
+                         "path": path, "due": it.get("due")}, arm=False)
+        self._arm()
+
+    def track_file(self, path):
+        # 没有打开的清单（已收起的窗口）直接读日志登记
+        path = os.path.abspath(path)
+        try:
+            j = TodoJournal(path)
+            items = j.load()
+        except (OSError, ValueError):
+            return
+        self.track_items(path, items, j.title, path)
+
+    def upcoming(self, n=8):
+        return [p for _, _, p in self.queue.upcoming(n)]
+
+    # ---- 计时 ----
+    def _arm(self):
+        nxt = self.queue.next_time()
+        if nxt is None:
+            self.timer.stop(); self.deadline = None
+            return
+        if self.timer.isActive() and self.deadline is not None and nxt >= self.deadline:
+            return      # 现有计时器会更早醒来
+        now = time.time()
+        delay = max(0, min(MAX_ARM, (nxt-now)*1000))
+        self.deadline = now + delay/1000
+        self.armed_at = (now, time.monotonic())
+        self.stats["armed"] += 1
+        self.timer.start(int(delay))
+
+    def _wake(self):
+        self.stats["wakes"] += 1
+        now = time.time()
+        if self.armed_at is not None:
+            wall, mono = self.armed_at
+            if abs((now-wall) - (time.monotonic()-mono)) > JUMP_TOLERANCE:
+                self.stats["clock_jumps"] += 1
+        self.deadline = None
+        for key, _, payload in self.queue.pop_due(now):
+            self.by_source.get(key[0], set()).discard(key[1])
+            self._fire(payload)
+        self._arm()
+
+    def _fire(self, payload):
+        self.stats["fired"] += 1
+        owner = self.owners.get(payload["source"])
+        if owner is not None:
+            owner(payload)
+        elif payload.get("path"):
+            try:
+                j = TodoJournal(payload["path"])
+                j.append("due", payload["item_id"], payload.get("due"), None)
+                j.close()
+            except OSError:
+                pass
+        self.due.emit(payload)
+
+
+def ask_due(parent, due=None, remind=None):
+    # 返回 (到期时间, 提醒时间)，都可能为 None；取消返回 False
+    dlg = QDialog(parent)
+    dlg.setWindowTitle("到期与提醒")
+    dlg.setWindowFlags(dlg.windowFlags() | Qt.WindowStaysOnTopHint)
+    when = QDateTimeEdit(dlg)
+    when.setCalendarPopup(True)
+    when.setDisplayFormat("yyyy-MM-dd HH:mm")
+    start = due if due is not None else (time.time()//3600 + 1) * 3600
+    when.setDateTime(QDateTime.fromSecsSinceEpoch(int(start)))
+    offset = QComboBox(dlg)
+    for label, sec in REMIND_OFFSETS:
+        offset.addItem(label, sec)
+    if due is not None:
+        offs = [sec for _, sec in REMIND_OFFSETS]
+        off = None if remind is None else due-remind
+        offset.setCurrentIndex(offs.index(off) if off in offs else 0)
+    buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel, dlg)
+    clear = QPushButton("清除", dlg)
+    buttons.addButton(clear, QDialogButtonBox.ResetRole)
+    result = {}
+    clear.clicked.connect(lambda: (result.update(clear=True), dlg.accept()))
+    buttons.accepted.connect(dlg.accept); buttons.rejected.connect(dlg.reject)
+    form = QFormLayout(dlg)
+    form.addRow("到期", when); form.addRow("提醒", offset); form.addRow(buttons)
+    if dlg.exec_() != QDialog.Accepted:
+        return False
+    if result.get("clear"):
+        return None, None
+    d = float(when.dateTime().toSecsSinceEpoch())
+    sec = offset.currentData()
+    return d, (None if sec is None else d-sec)
+
+
+_default = None
+
+def default_reminders():
+    global _default
+    if _default is None:
+        _default = ReminderService(QApplication.instance())
+    return _default
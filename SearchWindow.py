@@ -0,0 +1,71 @@
+# SearchWindow.py
+import sys, time
+from PyQt5.QtWidgets import (
+    QWidget, QLineEdit, QListWidget, QListWidgetItem, QLabel,
+    QVBoxLayout, QApplication
+)
+from PyQt5.QtCore import Qt
+
+from NoteSearch import default_index
+from NoteStore import default_repository
+from StickyNotes import StickyNote
+from TodoList import TodoList
+from TodoJournal import TODO_EXT
+from WindowRegistry import default_registry
+
+class SearchWindow(QWidget):
+    def __init__(self, index=None, repo=None):
+        super().__init__()
+        self.index = index or default_index()
+        self.repo = repo or default_repository()
+        self.setWindowTitle("搜索便签")
+        self.setWindowFlags(Qt.WindowStaysOnTopHint)
+        self.resize(360, 420)
+
+        self.query_edit = QLineEdit(self)
+        self.query_edit.setPlaceholderText(" 关键词、\"短语\"、前缀*")
+        self.query_edit.textChanged.connect(self._search)
+        self.result_list = QListWidget(self)
+        self.result_list.itemActivated.connect(self._open)
+        self.status = QLabel(self)
+        self.status.setStyleSheet("color:#757575;font-size:11px;")
+
+        lay = QVBoxLayout(self)
+        lay.setContentsMargins(8,8,8,8)
+        lay.addWidget(self.query_edit)
+        lay.addWidget(self.result_list)
+        lay.addWidget(self.status)
+
+    def _search(self, q):
+        self.result_list.clear()
+        if not q.strip():
+            self.status.clear(); return
+        t0 = time.perf_counter()
+        hits = self.index.search(q)
+        ms = (time.perf_counter()-t0)*1000
+        for did, kind, title in hits:
+            label = f"{'☑' if kind=='todo' else '📝'} {title or '(无标题)'} — {self.index.snippet(did, q)}"
+            it = QListWidgetItem(label)
+            it.setData(Qt.UserRole, did)
+            self.result_list.addItem(it)
+        self.status.setText(f"{len(hits)} 条结果 · {ms:.1f} ms")
+
+    def _open(self, item):
+        kind, ref = item.data(Qt.UserRole).split(":",1)
+        if kind=="file" and ref.lower().endswith(TODO_EXT):
+            w = TodoList(ref)
+        elif kind=="file":
+            w = StickyNote(ref)
+        elif kind=="todo":
+            w = TodoList(note_id=ref, repo=self.repo)
+        else:
+            w = StickyNote(note_id=ref, repo=self.repo)
+        w.show(); w.raise_()
+        default_registry().track(w)
+
+# 方便调试
+if __name__=="__main__":
+    app = QApplication(sys.argv)
+    w = SearchWindow()
+    w.show()
+    sys.exit(app.exec_())
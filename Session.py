@@ -0,0 +1,188 @@
+# Session.py —— 工作区会话：记录打开着的便签 / 待办窗口，重启后恢复
+#
+# 窗口打开、移动、缩放、最小化、关闭时只更新它自己的那一条，防抖后整体原子写入
+# session.json。恢复时先建屏幕内可见的窗口（第一个同步创建，其余每轮事件循环几个），
+# 最小化或不在任何屏幕上的窗口只作为"已收起"条目，第一次用到时才创建。
+import os, json, time
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QObject, QEvent, QTimer, QRect, Qt, pyqtSignal
+
+import StartupProfile as prof
+from NoteFormat import atomic_write
+from NoteStore import default_home
+
+SESSION_FILE = "session.json"
+SESSION_VERSION = 1
+SAVE_DELAY = 500       # 毫秒；拖动过程中不会每帧写盘
+RESTORE_BATCH = 8      # 每轮事件循环恢复的可见窗口数
+KINDS = {"StickyNote": "note", "TodoList": "todo"}
+WATCHED = (QEvent.Move, QEvent.Resize, QEvent.WindowStateChange, QEvent.Show, QEvent.Hide)
+
+def session_path():
+    return os.path.join(default_home(), SESSION_FILE)
+
+def window_entry(w):
+    # 只记录能重新打开的窗口：有文件或在仓库里有记录
+    kind = KINDS.get(type(w).__name__)
+    fp, nid = getattr(w, "file_path", None), getattr(w, "note_id", None)
+    if kind is None or not (fp or (nid and getattr(w, "repo", None))):
+        return None
+    g = w.geometry()
+    return {
+        "kind": kind,
+        "file_path": os.path.abspath(fp) if fp else None,
+        "note_id": None if fp else nid,
+        "title": w.title_edit.text(),
+        "geometry": [g.x(), g.y(), g.width(), g.height()],
+        "minimized": bool(w.windowState() & Qt.WindowMinimized),
+    }
+
+def load_session(path=None):
+    try:
+        with open(path or session_path(), encoding="utf-8") as f:
+            d = json.load(f)
+    except (OSError, ValueError):
+        return []
+    if d.get("version") != SESSION_VERSION:
+        return []
+    return [e for e in d.get("windows", []) if e.get("file_path") or e.get("note_id")]
+
+
+class SessionRecorder(QObject):
+    def __init__(self, registry, path=None, parent=None):
+        super().__init__(parent)
+        self.registry = registry
+        self.path = path or session_path()
+        self.entries = {}       # id(窗口) -> 条目
+        self.watched = {}       # id(窗口) -> 窗口
+        self.dirty = set()
+        self.frozen = False
+        self.writes = 0
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(SAVE_DELAY)
+        self.timer.timeout.connect(self.flush)
+        registry.changed.connect(self._sync)
+        app = QApplication.instance()
+        if app is not None:
+            # 退出时窗口会被逐个销毁，不能让这一过程清空会话
+            app.aboutToQuit.connect(self.freeze)
+        self._sync()
+
+    def _sync(self):
+        if self.frozen:
+            return
+        live = {id(w): w for w in self.registry.windows()}
+        for key in list(self.watched):
+            if key not in live:
+                del self.watched[key]
+                self.entries.pop(key, None); self.dirty.discard(key)
+        for key, w in live.items():
+            if key not in self.watched:
+                self.watched[key] = w
+                w.installEventFilter(self)
+                self.dirty.add(key)
+        self.timer.start()
+
+    def eventFilter(self, obj, ev):
+        if ev.type() in WATCHED and not self.frozen:
+            key = id(obj)
+            if key in self.watched:
+                self.dirty.add(key)
+                self.timer.start()
+        return False
+
+    def snapshot(self):
+        for key in self.dirty:
+            e = window_entry(self.watched[key])
+            if e is None:
+                self.entries.pop(key, None)
+            else:
+                self.entries[key] = e
+        self.dirty.clear()
+        # 已收起的窗口虽已关闭，仍属于工作区
+        stubs = [dict(s, minimized=True) for s in self.registry.suspended]
+        return list(self.entries.values()) + stubs
+
+    def flush(self):
+        self.timer.stop()
+        if self.frozen:
+            return
+        data = {"version": SESSION_VERSION, "saved": time.time(), "windows": self.snapshot()}
+        atomic_write(self.path, json.dumps(data, ensure_ascii=False, separators=(",",":")).encode("utf-8"))
+        self.writes += 1
+
+    def freeze(self):
+        if not self.frozen:
+            self.flush()
+            self.frozen = True
+
+
+def _on_screen(geo, screens):
+    return bool(geo) and len(geo)==4 and any(s.intersects(QRect(*geo)) for s in screens)
+
+
+class SessionRestore(QObject):
+    finished = pyqtSignal(dict)     # 恢复统计，见 stats
+
+    def __init__(self, registry, entries, on_window=None, parent=None):
+        super().__init__(parent)
+        self.registry = registry
+        self.on_window = on_window
+        self.first = None
+        self.t0 = time.perf_counter()
+        self.stats = {"saved": len(entries), "visible": 0, "deferred": 0, "missing": 0,
+                      "first_window_ms": None, "workspace_ms": None}
+        screens = [s.availableGeometry() for s in QApplication.screens()]
+        self.queue = []
+        for e in entries:
+            if e.get("file_path") and not os.path.exists(e["file_path"]):
+                self.stats["missing"] += 1
+                continue
+            stub = {k: e.get(k) for k in ("kind", "file_path", "note_id", "title", "geometry")}
+            if e.get("minimized") or not _on_screen(e.get("geometry"), screens):
+                registry.suspended.append(stub)
+                self.stats["deferred"] += 1
+            else:
+                self.queue.append(stub)
+        if self.stats["deferred"]:
+            registry.changed.emit()
+        self.timer = QTimer(self)
+        self.timer.setInterval(0)
+        self.timer.timeout.connect(self._batch)
+        if self.queue:
+            self.first = self._open(self.queue.pop(0))
+            self.stats["first_window_ms"] = (time.perf_counter()-self.t0)*1000
+            prof.mark("session: first window")
+        self.timer.start()
+
+    def _open(self, stub):
+        w = self.registry.restore(stub)
+        if self.on_window:
+            self.on_window(w)
+        self.stats["visible"] += 1
+        return w
+
+    def _batch(self):
+        for _ in range(min(RESTORE_BATCH, len(self.queue))):
+            self._open(self.queue.pop(0))
+        if self.queue:
+            return
+        self.timer.stop()
+        self.stats["workspace_ms"] = (time.perf_counter()-self.t0)*1000
+        prof.mark("session: workspace restored")
+        self.finished.emit(self.stats)
+
+
+def restore_session(registry, path=None, on_window=None):
+    # 返回 SessionRestore；.first 是同步创建的第一个窗口（可能为 None），
+    # 全部可见窗口建好后发 finished，之后再开始记录会话
+    path = path or session_path()
+    r = SessionRestore(registry, load_session(path), on_window, parent=registry)
+    r.recorder = None
+
+    def record(_stats):
+        r.recorder = SessionRecorder(registry, path, parent=registry)
+
+    r.finished.connect(record)
+    return r
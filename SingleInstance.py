@@ -0,0 +1,107 @@
+# SingleInstance.py —— 单实例：第二个进程把要打开的文件交给已运行的进程后立即退出
+#
+# 协议：客户端连上本地套接字，发送一行 JSON {"open": [路径...]}，服务端回 "ok\n"。
+#       {"ping": 1} 只确认服务端还活着，同样回 "ok\n"，不打开任何窗口。
+import os, sys, json, getpass, hashlib
+from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtNetwork import QLocalServer, QLocalSocket
+
+CONNECT_TIMEOUT = 200   # 毫秒；连不上就当作没有正在运行的实例
+ACK_TIMEOUT = 1000
+
+def server_name():
+    # 每个用户一个名字，避免多用户机器上互相抢
+    user = hashlib.sha1(getpass.getuser().encode("utf-8")).hexdigest()[:12]
+    return f"StickyNotes-{user}"
+
+def _request(msg, name):
+    sock = QLocalSocket()
+    sock.connectToServer(name or server_name())
+    if not sock.waitForConnected(CONNECT_TIMEOUT):
+        return False
+    sock.write((json.dumps(msg, ensure_ascii=False) + "\n").encode("utf-8"))
+    sock.waitForBytesWritten(ACK_TIMEOUT)
+    ok = sock.waitForReadyRead(ACK_TIMEOUT) and sock.readLine().data().strip()==b"ok"
+    sock.disconnectFromServer()
+    return ok
+
+def send_to_running(paths, name=None):
+    return _request({"open": [os.path.abspath(p) for p in paths]}, name)
+
+def is_running(name=None):
+    return _request({"ping": 1}, name)
+
+
+class SingleInstanceServer(QObject):
+    open_requested = pyqtSignal(list)    # 路径列表；为空表示只需把已有窗口调到前面
+
+    def __init__(self, name=None, parent=None):
+        super().__init__(parent)
+        self.name = name or server_name()
+        self.server = QLocalServer(self)
+        self.server.setSocketOptions(QLocalServer.UserAccessOption)
+        self.server.newConnection.connect(self._accept)
+        self._bufs = {}
+
+    def listen(self):
+        if self.server.listen(self.name):
+            return True
+        # 上次崩溃留下的套接字文件：确认没人应答后再清理；
+        # 只 ping 不转交，否则正在运行的实例会当成一次启动而新建便签
+        if is_running(self.name):
+            return False
+        QLocalServer.removeServer(self.name)
+        return self.server.listen(self.name)
+
+    def _accept(self):
+        while self.server.hasPendingConnections():
+            sock = self.server.nextPendingConnection()
+            self._bufs[sock] = b""
+            sock.readyRead.connect(lambda s=sock: self._read(s))
+            sock.disconnected.connect(lambda s=sock: self._drop(s))
+
+    def _read(self, sock):
+        self._bufs[sock] += sock.readAll().data()
+        while b"\n" in self._bufs[sock]:
+            line, self._bufs[sock] = self._bufs[sock].split(b"\n", 1)
+            try:
+                msg = json.loads(line.decode("utf-8"))
+                paths = msg.get("open", [])
+            except (ValueError, AttributeError):
+                continue
+            sock.write(b"ok\n"); sock.flush()
+            if "ping" in msg:
+                continue
+            self.open_requested.emit([p for p in paths if isinstance(p, str)])
+
+    def _drop(self, sock):
+        self._bufs.pop(sock, None)
+        sock.deleteLater()
+
+    def close(self):
+        self.server.close()
+
+
+def forward_or_listen(paths, name=None):
+    # 已有实例：转交路径并返回 None；否则成为服务端并返回 SingleInstanceServer
+    if send_to_running(paths, name):
+        return None
+    srv = SingleInstanceServer(name)
+    if not srv.listen():
+        # 同时启动时被另一个进程抢先，再转交一次
+        return None if send_to_running(paths, name) else srv
+    return srv
+
+# 方便调试：两个终端分别运行
+#   QT_QPA_PLATFORM=offscreen python SingleInstance.py serve
+#   python SingleInstance.py send a.sn b.snt
+if __name__=="__main__":
+    from PyQt5.QtCore import QCoreApplication
+    app = QCoreApplication(sys.argv)
+    if sys.argv[1:2]==["send"]:
+        sys.exit(0 if send_to_running(sys.argv[2:]) else 1)
+    srv = SingleInstanceServer()
+    if not srv.listen():
+        print("already running"); sys.exit(1)
+    srv.open_requested.connect(lambda paths: print(json.dumps(paths, ensure_ascii=False), flush=True))
+    sys.exit(app.exec_())
@@ -0,0 +1,54 @@
+# SnConvert.py —— 批量转换 .sn 文件格式（不依赖 Qt）
+# 用法：python SnConvert.py [--to v2|json] [--compress auto|zlib|zstd|none] [--dry-run] 文件或目录...
+# 目录会递归查找 .sn；已经是目标格式的文件跳过。写入是原子的，中途失败不会损坏原文件。
+import os, sys, argparse
+
+from NoteFormat import read_note_file, write_note_file, is_sn_v2
+
+def iter_sn(paths):
+    for p in paths:
+        if os.path.isdir(p):
+            for root, _, names in os.walk(p):
+                for n in sorted(names):
+                    if n.lower().endswith(".sn"):
+                        yield os.path.join(root, n)
+        elif p.lower().endswith(".sn"):
+            yield p
+
+def convert(path, to, compress, dry_run=False):
+    # 返回 (转换前字节数, 转换后字节数)；已是目标格式时返回 None
+    if is_sn_v2(path)==(to=="v2"):
+        return None
+    before = os.path.getsize(path)
+    data = read_note_file(path)
+    if dry_run:
+        return before, None
+    after = write_note_file(path, data, fmt=to, compress=None if compress=="none" else compress)
+    return before, after
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="批量转换 .sn 便签文件格式")
+    ap.add_argument("paths", nargs="+")
+    ap.add_argument("--to", choices=("v2", "json"), default="v2")
+    ap.add_argument("--compress", choices=("auto", "zlib", "zstd", "none"), default="auto")
+    ap.add_argument("--dry-run", action="store_true")
+    args = ap.parse_args(argv)
+    done = skipped = failed = 0
+    total_before = total_after = 0
+    for p in iter_sn(args.paths):
+        try:
+            r = convert(p, args.to, args.compress, args.dry_run)
+        except (OSError, ValueError) as e:
+            failed += 1
+            print(f"失败 {p}: {e}", file=sys.stderr)
+            continue
+        if r is None:
+            skipped += 1; continue
+        done += 1
+        total_before += r[0]; total_after += r[1] or 0
+    print(f"转换 {done}，跳过 {skipped}，失败 {failed}"
+          + (f"；{total_before} → {total_after} 字节" if done and not args.dry_run else ""))
+    return 1 if failed else 0
+
+if __name__=="__main__":
+    sys.exit(main())
@@ -0,0 +1,50 @@
+# StartupProfile.py —— 启动耗时剖析
+# 开启：环境变量 STICKYNOTES_PROFILE=1（输出到 stderr）或 =文件路径（写 JSON），
+# 或命令行加 --profile-startup。本模块不导入 Qt，须在 PyQt5 之前导入才能计入导入耗时。
+import os, sys, time, json
+
+T0 = time.perf_counter()
+_env = os.environ.get("STICKYNOTES_PROFILE", "")
+ENABLED = bool(_env) or "--profile-startup" in sys.argv
+_marks = [("start", T0)]
+_reported = False
+
+def mark(name):
+    if ENABLED:
+        _marks.append((name, time.perf_counter()))
+
+def timeline():
+    out = []
+    for (_, prev), (name, t) in zip(_marks, _marks[1:]):
+        out.append({"phase": name, "at_ms": round((t-T0)*1000, 2), "dur_ms": round((t-prev)*1000, 2)})
+    return out
+
+def report():
+    global _reported
+    if not ENABLED or _reported:
+        return
+    _reported = True
+    tl = timeline()
+    if _env and _env != "1":
+        with open(_env, "w", encoding="utf-8") as f:
+            json.dump({"argv": sys.argv, "timeline": tl}, f, ensure_ascii=False, indent=2)
+        return
+    for p in tl:
+        print(f"[startup] {p['at_ms']:9.1f} ms  +{p['dur_ms']:8.1f}  {p['phase']}", file=sys.stderr)
+
+def watch_first_paint(widget, name="first paint"):
+    # 第一个 Paint 事件时打点并输出报告
+    if not ENABLED:
+        return
+    from PyQt5.QtCore import QObject, QEvent, QTimer
+
+    class _Probe(QObject):
+        def eventFilter(self, obj, ev):
+            if ev.type()==QEvent.Paint:
+                obj.removeEventFilter(self)
+                mark(name)
+                QTimer.singleShot(0, report)
+            return False
+
+    widget._startup_probe = _Probe(widget)
+    widget.installEventFilter(widget._startup_probe)
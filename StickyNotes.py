@@ -1,70 +1,67 @@
 # StickyNotes.py
-import sys, os, random, json
+import sys, os
+from functools import partial
 from PyQt5.QtWidgets import (
-    QWidget, QTextEdit, QPushButton, QLineEdit,
-    QVBoxLayout, QHBoxLayout, QFileDialog, QMessageBox, QApplication
+    QWidget, QTextEdit, QPlainTextEdit, QPushButton, QLineEdit,
+    QVBoxLayout, QHBoxLayout, QFileDialog, QMessageBox, QApplication, QMenu
 )
-from PyQt5.QtCore import Qt, QEvent, QRect
-from PyQt5.QtGui import QColor, QFont
-
-COLOR_SCHEMES = [
-    ("#fffde7", "#fbc02d"),
-    ("#e8f5e9", "#66bb6a"),
-    ("#fce4ec", "#ec407a"),
-    ("#e3f2fd", "#42a5f5"),
-    ("#fff3e0", "#ffa726"),
-    ("#eeeeee", "#757575"),
-    ("#f3e5f5", "#ab47bc"),
-]
-EDGE_MARGIN = 6
+from PyQt5.QtCore import Qt, QRect
+
+from AutoSave import AutoSaver
+from NoteFormat import read_note_file, write_note_file
+from NoteStore import default_repository
+from NoteSearch import index_later
+from Theme import random_theme
+from WindowDrag import DragController
+from NoteLoader import ChunkedLoader, is_large
+from NoteHistory import record_quietly, recording, merge_text
+from NoteWatcher import default_watcher, apply_text
+from stickycore.notes import Note
+
 
 class StickyNote(QWidget):
-    def __init__(self, file_path=None):
+    def __init__(self, file_path=None, note_id=None, repo=None, visible=True):
         super().__init__()
         self.file_path = file_path
+        # 仓库模式：note_id 对应 NoteStore 中的一条记录
+        self.note_id = note_id
+        self.repo = repo
+        self.loader = None     # 超大便签分块加载期间不为 None
+        self.load_stats = None
+        self.note = Note(path=file_path)     # 数据模型；窗口只负责显示和编辑
+        self.markdown = None   # Markdown 模式下的高亮器
+        self.preview = None
         self.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint)
         self.setAttribute(Qt.WA_TranslucentBackground)
         self.resize(300,200)
 
-        self.old_pos = None
-        self.resizing_edge = None
-        self.bg_color, self.btn_color = random.choice(COLOR_SCHEMES)
+        self.theme = random_theme()
+        self.bg_color, self.btn_color = self.theme.bg, self.theme.btn
 
-        # 容器 & 布局
+        # 容器 & 布局；整窗样式只在容器上设置一次
         self.container = QWidget(self)
-        self.container.setStyleSheet(f"background-color:{self.bg_color};border-radius:16px;")
+        self.container.setObjectName("container")
+        self.container.setAttribute(Qt.WA_StyledBackground)
+        self.container.setStyleSheet(self.theme.note_qss)
         outer = QVBoxLayout(self)
         outer.setContentsMargins(0,0,0,0)
         outer.addWidget(self.container)
 
         # 标题栏
         self.title_bar = QWidget(self.container)
+        self.title_bar.setObjectName("titleBar")
         self.title_bar.setFixedHeight(30)
-        self.title_bar.installEventFilter(self)
-        self.title_bar.setStyleSheet("background:transparent;")
         self.title_edit = QLineEdit("自定义便签", self.title_bar)
+        self.title_edit.setObjectName("titleEdit")
         self.title_edit.setFixedWidth(120)
-        self.title_edit.setStyleSheet("""
-            QLineEdit {
-              border:none;background:transparent;font-weight:bold;
-              font-size:14px;padding-left:6px;
-              font-family:YouYuan,"Microsoft YaHei UI",sans-serif;
-            }
-        """)
+        # 标题栏右键：历史版本
+        self.title_bar.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.title_bar.customContextMenuRequested.connect(self._title_menu)
 
         def btn(sym):
             b = QPushButton(sym)
+            b.setObjectName("winBtn")
             b.setFixedSize(24,24)
-            b.setStyleSheet(f"""
-                QPushButton {{
-                   background-color:{self._adj(self.btn_color,0.9)};
-                   color:white;font-size:14px;font-weight:bold;
-                   border:none;border-radius:12px;
-                }}
-                QPushButton:hover {{
-                  background-color:{self._adj(self.btn_color,1.2)};
-                }}
-            """)
             return b
 
         self.min_btn = btn("—");   self.min_btn.clicked.connect(self.showMinimized)
@@ -77,33 +74,13 @@ class StickyNote(QWidget):
         tlay.addWidget(self.min_btn)
         tlay.addWidget(self.close_btn)
 
-        # 编辑区
-        self.text_edit = QTextEdit(self.container)
-        self.text_edit.setStyleSheet(f"""
-            QTextEdit {{
-              background-color:{self.bg_color};
-              border:none;padding:6px;
-              font-size:14px;
-              font-family:YouYuan,"Microsoft YaHei UI",sans-serif;
-            }}
-        """)
+        # 编辑区；超大便签换成 QPlainTextEdit（.sn 只存纯文本，排版开销小得多）
+        large = bool(self.file_path) and is_large(self.file_path)
+        self.text_edit = (QPlainTextEdit if large else QTextEdit)(self.container)
         self.text_edit.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
-        sb = self.text_edit.verticalScrollBar()
-        sb.setStyleSheet(f"""
-            QScrollBar:vertical {{
-              border:none;background:transparent;
-              width:6px;margin:4px 2px 4px 0;border-radius:3px;
-            }}
-            QScrollBar::handle:vertical {{
-              background:{self._adj(self.btn_color,0.9)};
-              min-height:24px;border-radius:3px;
-            }}
-            QScrollBar::handle:vertical:hover {{
-              background:{self._adj(self.btn_color,1.2)};
-            }}
-            QScrollBar::add-line:vertical,QScrollBar::sub-line:vertical{{height:0;}}
-            QScrollBar::add-page:vertical,QScrollBar::sub-page:vertical{{background:none;}}
-        """)
+
+        # 拖动（标题栏）与边缘缩放，按显示帧合并几何更新
+        self.drag = DragController(self, handle=self.title_bar)
 
         bl = QVBoxLayout(self.container)
         bl.setContentsMargins(0,0,0,0)
@@ -113,18 +90,99 @@ class StickyNote(QWidget):
         # 如果指定了文件，先加载
         if self.file_path:
             self._load(self.file_path)
+        elif self.note_id and self.repo:
+            self._load_record(self.note_id)
 
-        self.show()
+        # 自动保存：加载完成后再挂信号，避免 setPlainText 被当作编辑
+        self.autosaver = AutoSaver(self._snapshot, self)
+        self.text_edit.textChanged.connect(self.autosaver.mark_dirty)
+        self.title_edit.textChanged.connect(self.autosaver.mark_dirty)
+        self.autosaver.committed.connect(lambda key, data: self._index(data))
+        self.autosaver.failed.connect(self._save_failed)
+
+        # 文件在别处被修改（同步盘、脚本、另一台机器）时就地更新
+        if self.file_path:
+            default_watcher().watch(self.file_path, self._file_changed)
+
+        # visible=False 供窗口池预先构造隐藏实例
+        if visible:
+            self.show()
+
+    def apply_theme(self, theme):
+        self.theme = theme
+        self.bg_color, self.btn_color = theme.bg, theme.btn
+        self.container.setStyleSheet(theme.note_qss)
+        if self.markdown:
+            self.markdown.set_theme(theme)
+
+    def set_markdown(self, on, save=True):
+        # 模式记在便签数据里（"format": "markdown"），随文件保存
+        from Markdown import MarkdownHighlighter
+        if on and self.markdown is None:
+            self.markdown = MarkdownHighlighter(self.text_edit.document(), self.theme)
+            self.note.extra["format"] = "markdown"
+        elif not on and self.markdown is not None:
+            self.set_preview(False)
+            self.markdown.setDocument(None)
+            self.markdown.deleteLater(); self.markdown = None
+            self.note.extra.pop("format", None)
+        else:
+            return
+        if save:
+            self.autosaver.mark_dirty()
 
-    def _adj(self, c, f):
-        col = QColor(c)
-        return QColor(
-            min(int(col.red()*f),255),
-            min(int(col.green()*f),255),
-            min(int(col.blue()*f),255)
-        ).name()
+    def set_preview(self, on):
+        # 预览放在编辑区下方，各占一半高度
+        if on and self.preview is None:
+            from Markdown import MarkdownPreview
+            self.preview = MarkdownPreview(self.text_edit, self.container)
+            self.container.layout().addWidget(self.preview)
+            self.preview.show()
+        elif not on and self.preview is not None:
+            self.container.layout().removeWidget(self.preview)
+            self.text_edit.textChanged.disconnect(self.preview.schedule)
+            self.preview.hide()
+            self.preview.deleteLater(); self.preview = None
+
+    def suspend(self):
+        # 供窗口管理器收起：未保存过的便签先放进仓库，关闭时由自动保存写盘，不再弹窗
+        if not (self.file_path or (self.note_id and self.repo)):
+            self.repo = default_repository()
+            self.note_id = self.repo.new_id()
+        self.autosaver.dirty = True
+        return {"kind": "note", "file_path": self.file_path, "note_id": self.note_id,
+                "geometry": [self.x(), self.y(), self.width(), self.height()]}
+
+    def _save_failed(self, key, err):
+        # 后台写盘失败不弹窗打断输入，只在标题上提示；关闭时再让用户决定
+        self.title_edit.setToolTip("" if err is None else f"自动保存失败：{err}")
+
+    def _confirm_lost_save(self, err):
+        # 最后一次写盘失败：另存为别处，或确认丢弃；返回是否可以关闭
+        r = QMessageBox.warning(
+            self, "保存失败", f"便签没能写入：\n{err}\n\n另存到别处吗？选择放弃会丢失未保存的改动。",
+            QMessageBox.Save|QMessageBox.Discard|QMessageBox.Cancel)
+        if r==QMessageBox.Discard:
+            return True
+        if r==QMessageBox.Save:
+            p,_ = QFileDialog.getSaveFileName(self,"另存便签","","Sticky Note (*.sn)")
+            if p:
+                try:
+                    self._save(p)
+                    return True
+                except OSError as e:
+                    QMessageBox.warning(self,"保存失败",f"无法保存便签：\n{e}")
+        return False
 
     def closeEvent(self, ev):
+        # 已有文件的便签由自动保存负责，关闭时只需等最后一次写入完成
+        if self.file_path or (self.note_id and self.repo):
+            err = self.autosaver.flush()
+            if err is not None and not self._confirm_lost_save(err):
+                ev.ignore(); return
+            if self.file_path:
+                default_watcher().unwatch(self.file_path, self._file_changed)
+            ev.accept(); return
         r = QMessageBox.question(
             self,"保存便签","是否保存更改？",
             QMessageBox.Yes|QMessageBox.No|QMessageBox.Cancel
@@ -140,85 +198,171 @@ class StickyNote(QWidget):
                     ev.ignore(); return
                 self.file_path = p
             self._save(self.file_path)
+            self._index(self._data())
         ev.accept()
 
+    def _data(self):
+        n = self.note
+        n.path = self.file_path
+        n.title = self.title_edit.text()
+        n.content = self.text_edit.toPlainText()
+        n.geometry = [self.x(), self.y(), self.width(), self.height()]
+        return n.to_dict()
+
+    def _snapshot(self):
+        # 写盘后在写线程里顺带记一条修订
+        if self.loader:
+            return None     # 正文还没填完，不能把半份内容写回去
+        if self.file_path:
+            sink = partial(self._write_file, self.file_path)
+            return self.file_path, recording(sink, self._doc_id()), self._data()
+        if self.note_id and self.repo:
+            sink = partial(self.repo.save, self.note_id)
+            return ("repo", self.note_id), recording(sink, self._doc_id()), self._data()
+        return None
+
+    def _write_file(self, path, data):
+        # 写线程里执行；记下写后的文件签名，监视器据此忽略自己造成的变化
+        n = write_note_file(path, data)
+        default_watcher().mark_written(path)
+        return n
+
+    def _file_changed(self, path):
+        # self.note 是最近一次载入或提交写盘的内容，作为三方合并的基准
+        if self.loader:
+            return      # 正在分块加载，内容本来就取自磁盘
+        try:
+            d = read_note_file(path)
+        except Exception:
+            return      # 写了一半或格式不对，等下一次变化
+        base, disk = self.note.content, d.get("content","")
+        if disk==base and d.get("title","")==self.note.title:
+            return
+        local = self.text_edit.toPlainText()
+        text = merge_text(base, local, disk)
+        did = self._doc_id()
+        if text is None:
+            r = QMessageBox.question(
+                self, "便签已在别处修改",
+                "文件在别处被修改，并与这里尚未保存的改动冲突。\n"
+                "载入外部版本吗？另一份会保存在历史版本里。",
+                QMessageBox.Yes|QMessageBox.No)
+            if r==QMessageBox.Yes:
+                record_quietly(did, local, self.title_edit.text()); text = disk
+            else:
+                record_quietly(did, disk, d.get("title","")); text = local
+        elif text==disk:
+            record_quietly(did, disk, d.get("title",""))
+        self.text_edit.blockSignals(True)
+        apply_text(self.text_edit, text)
+        self.text_edit.blockSignals(False)
+        if self.title_edit.text()==self.note.title and d.get("title","") != self.note.title:
+            self.title_edit.blockSignals(True)
+            self.title_edit.setText(d.get("title",""))
+            self.title_edit.blockSignals(False)
+        self.note = Note.from_dict(d, self.file_path)
+        self._index(d)
+        if text != disk or self.title_edit.text() != self.note.title:
+            self.autosaver.mark_dirty()     # 合并结果或保留的本地改动写回磁盘
+
+    def _doc_id(self):
+        if self.file_path:
+            return "file:" + os.path.abspath(self.file_path)
+        if self.note_id:
+            return "note:" + self.note_id
+        return None
+
+    def _index(self, data):
+        # 搜索索引随自动保存增量更新；切词在后台索引线程里做，大便签也不卡输入
+        did = self._doc_id()
+        if did:
+            index_later(did, data.get("content",""), data.get("title",""), "note")
+
     def _save(self, path):
-        data = {
-            "title":   self.title_edit.text(),
-            "content": self.text_edit.toPlainText(),
-            "geometry": [self.x(), self.y(), self.width(), self.height()]
-        }
-        with open(path,"w",encoding="utf-8") as f:
-            json.dump(data,f,ensure_ascii=False,indent=2)
+        d = self._data()
+        write_note_file(path, d)
+        record_quietly("file:" + os.path.abspath(path), d["content"], d["title"])
+
+    def _title_menu(self, pos):
+        menu = QMenu(self)
+        act = menu.addAction("历史版本…", self.open_history)
+        act.setEnabled(self._doc_id() is not None)
+        menu.addSeparator()
+        act = menu.addAction("Markdown 模式")
+        act.setCheckable(True); act.setChecked(self.markdown is not None)
+        act.toggled.connect(self.set_markdown)
+        act = menu.addAction("预览")
+        act.setCheckable(True); act.setChecked(self.preview is not None)
+        act.setEnabled(self.markdown is not None)
+        act.toggled.connect(self.set_preview)
+        menu.exec_(self.title_bar.mapToGlobal(pos))
+
+    def open_history(self):
+        from HistoryWindow import HistoryWindow
+        from WindowRegistry import default_registry
+        w = HistoryWindow(self)
+        w.show(); w.raise_(); w.activateWindow()
+        default_registry().track(w)
 
     def _load(self, path):
+        if is_large(path):
+            self._load_large(path); return
         try:
-            with open(path,"r",encoding="utf-8") as f:
-                d = json.load(f)
-            self.title_edit.setText(d.get("title",""))
-            self.text_edit.setPlainText(d.get("content",""))
-            geo = d.get("geometry",None)
-            if geo and len(geo)==4:
-                gx,gy,gw,gh = geo
-                # 保证在可视区域或居中
-                screen = QApplication.primaryScreen().availableGeometry()
-                rect = QRect(gx,gy,gw,gh)
-                if not screen.contains(rect):
-                    gx = screen.x() + (screen.width()-gw)//2
-                    gy = screen.y() + (screen.height()-gh)//2
-                self.setGeometry(gx,gy,gw,gh)
+            d = read_note_file(path)
+            self._apply(d)
+            self._index(d)
         except Exception as e:
             QMessageBox.warning(self,"加载失败",f"无法加载便签：\n{e}")
 
-    # 拖动 & 缩放略——和之前完全一致
-    def eventFilter(self, src, ev):
-        if src is self.title_bar:
-            if ev.type()==QEvent.MouseButtonPress and ev.button()==Qt.LeftButton:
-                self.old_pos = ev.globalPos(); return True
-            if ev.type()==QEvent.MouseMove and self.old_pos:
-                d = ev.globalPos()-self.old_pos
-                self.move(self.x()+d.x(),self.y()+d.y())
-                self.old_pos = ev.globalPos(); return True
-            if ev.type()==QEvent.MouseButtonRelease:
-                self.old_pos = None; return True
-        return super().eventFilter(src, ev)
-    def mousePressEvent(self, ev):
-        if ev.button()==Qt.LeftButton:
-            self.old_pos = ev.globalPos()
-            self.resizing_edge = self._get_edge(ev.pos())
-    def mouseMoveEvent(self, ev):
-        if self.resizing_edge and self.old_pos:
-            d = ev.globalPos()-self.old_pos; g=self.geometry()
-            if "left"   in self.resizing_edge: g.setLeft(g.left()+d.x())
-            if "right"  in self.resizing_edge: g.setRight(g.right()+d.x())
-            if "top"    in self.resizing_edge: g.setTop(g.top()+d.y())
-            if "bottom" in self.resizing_edge: g.setBottom(g.bottom()+d.y())
-            self.setGeometry(g); self.old_pos = ev.globalPos()
-        else:
-            ed = self._get_edge(ev.pos())
-            cmap = {
-                "top_left":Qt.SizeFDiagCursor,"top_right":Qt.SizeBDiagCursor,
-                "bottom_left":Qt.SizeBDiagCursor,"bottom_right":Qt.SizeFDiagCursor,
-                "left":Qt.SizeHorCursor,"right":Qt.SizeHorCursor,
-                "top":Qt.SizeVerCursor,"bottom":Qt.SizeVerCursor,None:Qt.ArrowCursor
-            }
-            self.setCursor(cmap.get(ed,Qt.ArrowCursor))
-    def mouseReleaseEvent(self, ev):
-        self.old_pos=None;self.resizing_edge=None
-        self.setCursor(Qt.ArrowCursor)
-    def _get_edge(self, pos):
-        r=self.rect(); x,y=pos.x(),pos.y()
-        return (
-            "top_left"    if x<EDGE_MARGIN and y<EDGE_MARGIN else
-            "top_right"   if x>r.width()-EDGE_MARGIN and y<EDGE_MARGIN else
-            "bottom_left" if x<EDGE_MARGIN and y>r.height()-EDGE_MARGIN else
-            "bottom_right"if x>r.width()-EDGE_MARGIN and y>r.height()-EDGE_MARGIN else
-            "left"   if x<EDGE_MARGIN else
-            "right"  if x>r.width()-EDGE_MARGIN else
-            "top"    if y<EDGE_MARGIN else
-            "bottom" if y>r.height()-EDGE_MARGIN else
-            None
-        )
+    def _load_large(self, path):
+        self.text_edit.setReadOnly(True)
+        self.loader = ChunkedLoader(self.text_edit, self)
+        self.loader.parsed.connect(self._load_parsed)
+        self.loader.failed.connect(self._load_failed)
+        self.loader.finished.connect(self._load_finished)
+        self.loader.start(path)
+
+    def _load_parsed(self, d):
+        # 标题、位置先生效；这不是用户编辑，不触发自动保存
+        self.title_edit.blockSignals(True)
+        self._apply(d, content=False)
+        self.title_edit.blockSignals(False)
+
+    def _load_failed(self, msg):
+        self.loader.deleteLater(); self.loader = None
+        self.text_edit.setReadOnly(False)
+        QMessageBox.warning(self,"加载失败",f"无法加载便签：\n{msg}")
+
+    def _load_finished(self, d):
+        self.load_stats = self.loader.stats()
+        self.loader.deleteLater(); self.loader = None
+        self.text_edit.setReadOnly(False)
+        self._index(d)
+        if self.autosaver.dirty:     # 加载期间改过标题
+            self.autosaver.timer.start()
+
+    def _load_record(self, nid):
+        d = self.repo.get(nid)
+        if d is not None:
+            self._apply(d)
+
+    def _apply(self, d, content=True):
+        self.note = Note.from_dict(d, self.file_path)
+        self.title_edit.setText(d.get("title",""))
+        if d.get("format")=="markdown":
+            self.set_markdown(True, save=False)
+        if content:
+            self.text_edit.setPlainText(d.get("content",""))
+        geo = d.get("geometry",None)
+        if geo and len(geo)==4:
+            gx,gy,gw,gh = geo
+            # 保证在可视区域或居中
+            screen = QApplication.primaryScreen().availableGeometry()
+            rect = QRect(gx,gy,gw,gh)
+            if not screen.contains(rect):
+                gx = screen.x() + (screen.width()-gw)//2
+                gy = screen.y() + (screen.height()-gh)//2
+            self.setGeometry(gx,gy,gw,gh)
 
 # 方便调试
 if __name__=="__main__":
@@ -0,0 +1,125 @@
+# Theme.py —— 配色方案与预编译样式表（不依赖 Qt）
+#
+# 每个配色方案的派生颜色和整窗样式表只生成一次并缓存；窗口只在容器上
+# setStyleSheet 一次，子控件靠 objectName 选择器取样式，不再各自解析一份。
+import random
+
+COLOR_SCHEMES = [
+    ("#fffde7", "#fbc02d"),
+    ("#e8f5e9", "#66bb6a"),
+    ("#fce4ec", "#ec407a"),
+    ("#e3f2fd", "#42a5f5"),
+    ("#fff3e0", "#ffa726"),
+    ("#eeeeee", "#757575"),
+    ("#f3e5f5", "#ab47bc"),
+]
+
+def adjust(c, f):
+    # 与 QColor 逐通道乘系数后 .name() 的结果一致
+    r, g, b = int(c[1:3],16), int(c[3:5],16), int(c[5:7],16)
+    return "#%02x%02x%02x" % (min(int(r*f),255), min(int(g*f),255), min(int(b*f),255))
+
+def _scrollbar_qss(handle, hover):
+    return f"""
+        QScrollBar:vertical {{
+          border:none;background:transparent;
+          width:6px;margin:4px 2px 4px 0;border-radius:3px;
+        }}
+        QScrollBar::handle:vertical {{
+          background:{handle};
+          min-height:24px;border-radius:3px;
+        }}
+        QScrollBar::handle:vertical:hover {{
+          background:{hover};
+        }}
+        QScrollBar::add-line:vertical,QScrollBar::sub-line:vertical{{height:0;}}
+        QScrollBar::add-page:vertical,QScrollBar::sub-page:vertical{{background:none;}}
+    """
+
+
+class Theme:
+    def __init__(self, bg, btn):
+        self.bg, self.btn = bg, btn
+        self.btn_dark = adjust(btn, 0.9)
+        self.btn_light = adjust(btn, 1.2)
+        scrollbar = _scrollbar_qss(self.btn_dark, self.btn_light)
+
+        self.note_qss = f"""
+            #container {{ background-color:{bg};border-radius:16px; }}
+            #titleBar {{ background:transparent; }}
+            QLineEdit#titleEdit {{
+              border:none;background:transparent;font-weight:bold;
+              font-size:14px;padding-left:6px;
+              font-family:YouYuan,"Microsoft YaHei UI",sans-serif;
+            }}
+            QPushButton#winBtn {{
+               background-color:{self.btn_dark};
+               color:white;font-size:14px;font-weight:bold;
+               border:none;border-radius:12px;
+            }}
+            QPushButton#winBtn:hover {{
+              background-color:{self.btn_light};
+            }}
+            QTextEdit, QPlainTextEdit {{
+              background-color:{bg};
+              border:none;padding:6px;
+              font-size:14px;
+              font-family:YouYuan,"Microsoft YaHei UI",sans-serif;
+            }}
+        """ + scrollbar
+
+        self.todo_qss = f"""
+            #container {{ background-color:{bg};border-radius:16px; }}
+            #titleBar, TodoItem, AddItemRow {{ background:transparent; }}
+            QScrollArea, #qt_scrollarea_viewport, #todoInner {{ background-color:{bg};border:none; }}
+            QLineEdit#titleEdit {{
+                border:none;background:transparent;font-weight:bold;
+                font-size:14px;padding-left:6px;
+                font-family:"SVGASYS","SimHei";
+            }}
+            QPushButton#winBtn {{
+                background-color:{btn};
+                border:none;border-radius:12px;
+                font-size:14px;font-weight:bold;
+                font-family:"SVGASYS","SimHei";
+                color:white;
+            }}
+            QPushButton#winBtn:hover {{
+                background-color:{self.btn_light};
+            }}
+            QLineEdit#todoText {{
+                border:none;background:transparent;
+                font-size:13px;
+                font-family:"SVGASYS","SimHei";
+            }}
+            QFrame#todoSep {{ border:none;border-top:1px dashed #aaa; }}
+            QLabel#todoDue, QLabel#todoDueLate {{ background:transparent;font-size:11px;color:#777; }}
+            QLabel#todoDueLate {{ color:#c62828; }}
+            QPushButton#addBtn {{
+                border:none;
+                font-size:20px;
+                color:{btn};
+            }}
+            QPushButton#addBtn:hover {{
+                color:white;
+                background-color:{btn};
+                border-radius:13px;
+            }}
+            QListView {{
+                background-color:{bg};border:none;padding:8px 12px;
+                font-size:13px;font-family:"SVGASYS","SimHei";
+            }}
+            QListView::item:selected {{ background:transparent;color:black; }}
+        """ + scrollbar
+
+
+_cache = {}
+
+def get_theme(scheme):
+    t = _cache.get(scheme)
+    if t is None:
+        t = _cache[scheme] = Theme(*scheme)
+    return t
+
+def random_theme():
+    return get_theme(random.choice(COLOR_SCHEMES))
@@ -0,0 +1,146 @@
+# TodoJournal.py —— 待办清单文件 (.snt)：追加式操作日志（不依赖 Qt）
+#
+# 第一行是文件头 ["sntodo", 版本]，之后每行一个 JSON 数组：
+#   ["add", id, text, done]   ["edit", id, text]   ["check", id, 0|1]
+#   ["del", id]   ["move", id, index]   ["title", text]   ["geo", [x,y,w,h]]
+#   ["due", id, 到期时间|null, 提醒时间|null]（epoch 秒；提醒发出后 remind 置 null）
+# 勾选一条只追加十几个字节；日志远长于条目数时整体重写（压缩）。
+# 只支持单个写入方：打开时重放一次，之后 id 由本对象分配，不读别人追加的行。
+import os, json, logging
+
+from NoteFormat import atomic_write
+
+TODO_EXT = ".snt"
+MAGIC = "sntodo"
+VERSION = 1
+COMPACT_MIN_OPS = 256
+COMPACT_RATIO = 4      # 日志行数超过条目数的 4 倍就压缩
+
+log = logging.getLogger(__name__)
+
+def _line(op):
+    return json.dumps(op, ensure_ascii=False, separators=(",",":")) + "\n"
+
+def block_move_ops(ids, dest, downward):
+    # 把连续的一段条目整体移到 dest 起的位置。load() 重放 move 时先删后插，
+    # 所以下移从块尾开始、上移从块首开始，每条都直接落到最终位置
+    seq = list(enumerate(ids))
+    if downward:
+        seq.reverse()
+    return [("move", iid, dest+j) for j, iid in seq]
+
+
+class TodoJournal:
+    def __init__(self, path):
+        self.path = path
+        self.title = "Todo List"
+        self.geometry = None
+        self.ops = 0
+        self.next_id = 1
+        self.bad_lines = []    # 上次读取时跳过的坏行（行号从 1 起，含文件头）
+        self._fh = None
+
+    def iter_ops(self):
+        # 流式读取。最后一行没有换行符说明崩溃时只写了一半：丢弃并截掉这半行，以便继续追加。
+        # 中间某行坏了只跳过这一行并记日志，后面的操作照常读，文件不动
+        torn = None
+        self.bad_lines = []
+        with open(self.path,"rb") as f:
+            head = f.readline()
+            try:
+                magic, ver = json.loads(head)
+            except ValueError:
+                raise ValueError("不是待办清单文件")
+            if magic != MAGIC or ver > VERSION:
+                raise ValueError(f"不支持的待办清单格式：{head.strip()}")
+            good, lineno = f.tell(), 1
+            for line in f:
+                lineno += 1
+                if not line.endswith(b"\n"):
+                    torn = good; break      # 只有最后一行可能没有换行符
+                good += len(line)
+                try:
+                    op = json.loads(line)
+                except ValueError:
+                    op = None
+                if not isinstance(op, list) or not op:
+                    self.bad_lines.append(lineno)
+                    log.warning("%s 第 %d 行无法解析，已跳过", self.path, lineno)
+                    continue
+                yield op
+        if torn is not None:
+            os.truncate(self.path, torn)
+
+    def load(self):
+        # 重放日志，返回按顺序排列的 [{"id","text","done"}]；设过到期时间的另有 "due"、"remind"
+        rows, order = {}, []
+        self.ops = 0
+        for op in self.iter_ops():
+            self.ops += 1
+            kind = op[0]
+            if kind == "add":
+                rows[op[1]] = {"id": op[1], "text": op[2], "done": bool(op[3])}
+                order.append(op[1])
+                self.next_id = max(self.next_id, op[1]+1)
+            elif kind == "edit" and op[1] in rows:
+                rows[op[1]]["text"] = op[2]
+            elif kind == "check" and op[1] in rows:
+                rows[op[1]]["done"] = bool(op[2])
+            elif kind == "del" and op[1] in rows:
+                del rows[op[1]]; order.remove(op[1])
+            elif kind == "due" and op[1] in rows:
+                it = rows[op[1]]
+                it.pop("due", None); it.pop("remind", None)
+                if op[2] is not None: it["due"] = op[2]
+                if op[3] is not None: it["remind"] = op[3]
+            elif kind == "move" and op[1] in rows:
+                order.remove(op[1]); order.insert(op[2], op[1])
+            elif kind == "title":
+                self.title = op[1]
+            elif kind == "geo":
+                self.geometry = op[1]
+        return [rows[i] for i in order]
+
+    def new_id(self):
+        i = self.next_id; self.next_id += 1
+        return i
+
+    def append(self, *op):
+        if self._fh is None:
+            self._fh = open(self.path,"a",encoding="utf-8")
+        self._fh.write(_line(list(op)))
+        self._fh.flush()
+        self.ops += 1
+
+    def append_many(self, ops):
+        # 批量操作：一次写入、一次 flush
+        if not ops:
+            return
+        if self._fh is None:
+            self._fh = open(self.path,"a",encoding="utf-8")
+        self._fh.write("".join(_line(list(op)) for op in ops))
+        self._fh.flush()
+        self.ops += len(ops)
+
+    def needs_compaction(self, live):
+        return self.ops > max(COMPACT_MIN_OPS, COMPACT_RATIO*live)
+
+    def compact(self, items, title=None, geometry=None):
+        # 用当前状态重写整个文件：文件头 + 每条一个 add
+        self.close()
+        if title is not None: self.title = title
+        if geometry is not None: self.geometry = geometry
+        out = [_line([MAGIC, VERSION]), _line(["title", self.title])]
+        if self.geometry:
+            out.append(_line(["geo", list(self.geometry)]))
+        for it in items:
+            iid = it.get("id") or self.new_id()
+            out.append(_line(["add", iid, it.get("text",""), int(bool(it.get("done")))]))
+            if it.get("due") is not None or it.get("remind") is not None:
+                out.append(_line(["due", iid, it.get("due"), it.get("remind")]))
+        atomic_write(self.path, "".join(out).encode("utf-8"))
+        self.ops = len(out)-1
+
+    def close(self):
+        if self._fh is not None:
+            self._fh.close(); self._fh = None
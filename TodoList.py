@@ -1,41 +1,50 @@
-import random
+import os, time
+from contextlib import contextmanager
 from PyQt5.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout,
-    QLineEdit, QPushButton, QCheckBox,
-    QScrollArea, QFrame
+    QApplication, QWidget, QVBoxLayout, QHBoxLayout,
+    QLineEdit, QPushButton, QCheckBox, QLabel,
+    QScrollArea, QFrame, QListView, QAbstractItemView,
+    QMessageBox, QFileDialog, QMenu, QShortcut
 )
-from PyQt5.QtCore import Qt, QEvent
-from PyQt5.QtGui import QColor, QPainterPath, QRegion
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtGui import QKeySequence
+
+from NoteSearch import index_later, document_text
+from TodoModel import (TodoListModel, TodoItemDelegate, PasteLineEdit, FETCH_BATCH,
+                       SORT_KEYS, parse_lines)
+from TodoJournal import TodoJournal, block_move_ops
+from Theme import random_theme
+from NoteStore import default_repository
+from ReminderQueue import format_due
+from Reminders import default_reminders, ask_due
+from WindowDrag import DragController
+from WindowChrome import apply_rounded
 
-COLOR_SCHEMES = [
-    ("#fffde7","#fbc02d"),("#e8f5e9","#66bb6a"),
-    ("#fce4ec","#ec407a"),("#e3f2fd","#64b5f6"),
-    ("#fff3e0","#ffa726"),("#eeeeee","#757575"),
-    ("#f3e5f5","#ab47bc"),
-]
-EDGE_MARGIN = 6
 
 class TodoItem(QWidget):
-    def __init__(self, show_placeholder=False):
+    def __init__(self, show_placeholder=False, text="", checked=False, item_id=None, due=None, remind=None):
         super().__init__()
+        self.item_id = item_id
+        self.due = self.remind = None
+        self.due_label = None      # 设了到期时间才创建
         chk = QCheckBox()
-        txt = QLineEdit()
+        txt = PasteLineEdit(text)
+        self.chk, self.txt = chk, txt
         if show_placeholder:
             txt.setPlaceholderText(" 输入待办事项…")
-        txt.setStyleSheet("""
-            QLineEdit {
-                border: none;
-                font-size: 13px;
-                font-family: "SVGASYS", "SimHei";
-            }
-        """)
+        txt.setObjectName("todoText")   # 样式由 TodoList 容器的样式表提供
         chk.stateChanged.connect(lambda state: self._toggle_strike(txt, state))
+        if checked:
+            chk.setChecked(True)
 
         row = QHBoxLayout()
         row.setContentsMargins(0,0,0,0)
         row.setSpacing(8)
         row.addWidget(chk)
         row.addWidget(txt)
+        self.row = row
+        if due is not None:
+            self.set_due(due, remind)
 
         outer = QVBoxLayout(self)
         outer.setContentsMargins(0,4,0,4)
@@ -43,7 +52,7 @@ class TodoItem(QWidget):
         outer.addLayout(row)
 
         sep = QFrame(); sep.setFrameShape(QFrame.HLine)
-        sep.setStyleSheet("border-top:1px dashed #aaa;")
+        sep.setObjectName("todoSep")
         sep.setFixedHeight(1)
         outer.addWidget(sep)
 
@@ -51,10 +60,34 @@ class TodoItem(QWidget):
         font = line_edit.font()
         font.setStrikeOut(state == Qt.Checked)
         line_edit.setFont(font)
+        if self.due is not None:
+            self._show_due()
+
+    def set_due(self, due, remind=None):
+        self.due, self.remind = due, remind
+        if self.due_label is None:
+            if due is None:
+                return
+            self.due_label = QLabel()
+            self.due_label.setObjectName("todoDue")
+            self.row.addWidget(self.due_label)
+        self._show_due()
+
+    def _show_due(self):
+        lab = self.due_label
+        if self.due is None:
+            lab.hide(); return
+        lab.setText(format_due(self.due))
+        # 未完成且已过期的标红；换 objectName 后要重新 polish 才会套用样式
+        name = "todoDueLate" if self.due < time.time() and not self.chk.isChecked() else "todoDue"
+        if lab.objectName() != name:
+            lab.setObjectName(name)
+            lab.style().unpolish(lab); lab.style().polish(lab)
+        lab.show()
 
 
 class AddItemRow(QWidget):
-    def __init__(self, callback, btn_color="#444"):
+    def __init__(self, callback):
         super().__init__()
         outer = QVBoxLayout(self)
         outer.setContentsMargins(0, 4, 0, 4)
@@ -66,19 +99,8 @@ class AddItemRow(QWidget):
         layout.addStretch()
 
         btn = QPushButton("+")
+        btn.setObjectName("addBtn")
         btn.setFixedSize(26, 26)
-        btn.setStyleSheet(f"""
-            QPushButton {{
-                border: none;
-                font-size: 20px;
-                color: {btn_color};
-            }}
-            QPushButton:hover {{
-                color: white;
-                background-color: {btn_color};
-                border-radius: 13px;
-            }}
-        """)
         btn.clicked.connect(callback)
 
         layout.addWidget(btn)
@@ -88,59 +110,54 @@ class AddItemRow(QWidget):
 
 
 class TodoList(QWidget):
-    def __init__(self):
+    def __init__(self, file_path=None, note_id=None, repo=None, virtual=False, visible=True):
         super().__init__()
+        # 文件模式：.snt 操作日志，每次改动追加一行
+        self.file_path = file_path
+        self.journal = None
+        # 仓库模式：note_id 对应 NoteStore 中的一条 kind="todo" 记录
+        self.note_id = note_id
+        self.repo = repo
+        # 虚拟化模式：QListView + 模型，适合成千上万条待办
+        self.virtual = virtual
+        self._pending = []     # 控件模式下尚未物化的条目
+        self._bulk_depth = 0
+        self._local_id = 0     # 没有日志时自行编号
+        record = None
+        if file_path:
+            record = self._load(file_path)
+        elif note_id and repo:
+            record = repo.get(note_id)
         self.setWindowFlags(Qt.FramelessWindowHint|Qt.WindowStaysOnTopHint)
         self.setAttribute(Qt.WA_TranslucentBackground)
         self.resize(300,400)
-        self.setMask(self.round_mask(16))
+        apply_rounded(self, 16)
 
-        self.old_pos=None; self.resizing_edge=None
-        self.bg_color, self.btn_color = random.choice(COLOR_SCHEMES)
+        self.theme = random_theme()
+        self.bg_color, self.btn_color = self.theme.bg, self.theme.btn
 
+        # 整窗样式只在容器上设置一次，子控件按 objectName 取样式
         self.container = QWidget(self)
-        self.container.setStyleSheet(f"""
-            background-color:{self.bg_color};
-            border-radius:16px;
-        """)
+        self.container.setObjectName("container")
+        self.container.setAttribute(Qt.WA_StyledBackground)
+        self.container.setStyleSheet(self.theme.todo_qss)
         main = QVBoxLayout(self)
         main.setContentsMargins(0,0,0,0)
         main.addWidget(self.container)
 
         self.title_bar = QWidget(self.container)
+        self.title_bar.setObjectName("titleBar")
         self.title_bar.setFixedHeight(30)
-        self.title_bar.installEventFilter(self)
-        self.title_bar.setStyleSheet("background:transparent;")
 
         self.title_edit = QLineEdit("Todo List", self.title_bar)
+        self.title_edit.setObjectName("titleEdit")
         self.title_edit.setReadOnly(True)
-        self.title_edit.setStyleSheet("""
-            QLineEdit {
-                border:none;
-                background:transparent;
-                font-weight:bold;
-                font-size:14px;
-                padding-left:6px;
-                font-family:"SVGASYS","SimHei";
-            }
-        """)
         self.title_edit.setFixedWidth(120)
 
         def cute_btn(sym):
             b=QPushButton(sym)
+            b.setObjectName("winBtn")
             b.setFixedSize(24,24)
-            b.setStyleSheet(f"""
-                QPushButton {{
-                    background-color:{self.btn_color};
-                    border:none;border-radius:12px;
-                    font-size:14px;font-weight:bold;
-                    font-family:"SVGASYS","SimHei";
-                    color:white;
-                }}
-                QPushButton:hover {{
-                    background-color:{self._adjust_color(self.btn_color,1.2)};
-                }}
-            """)
             return b
 
         btn_min = cute_btn("—"); btn_min.clicked.connect(self.showMinimized)
@@ -151,113 +168,525 @@ class TodoList(QWidget):
         tl.addWidget(self.title_edit); tl.addStretch()
         tl.addWidget(btn_min); tl.addWidget(btn_cl)
 
-        self.scroll = QScrollArea(self.container)
-        self.scroll.setWidgetResizable(True)
-        self.scroll.setFrameShape(QScrollArea.NoFrame)
-        bar = self.scroll.verticalScrollBar()
-        bar.setStyleSheet(f"""
-            QScrollBar:vertical {{
-                border:none; background:transparent;
-                width:6px; margin:4px 2px 4px 0; border-radius:3px;
-            }}
-            QScrollBar::handle:vertical {{
-                background:{self._adjust_color(self.btn_color,0.9)};
-                min-height:24px; border-radius:3px;
-            }}
-            QScrollBar::handle:vertical:hover {{
-                background:{self._adjust_color(self.btn_color,1.2)};
-            }}
-            QScrollBar::add-line:vertical,
-            QScrollBar::sub-line:vertical {{ height:0; }}
-            QScrollBar::add-page:vertical,
-            QScrollBar::sub-page:vertical {{ background:none; }}
-        """)
-
-        self.inner = QWidget()
-        self.todo_layout = QVBoxLayout(self.inner)
-        self.todo_layout.setContentsMargins(12,8,12,8)
-        self.todo_layout.setSpacing(12)
-
-        for i in range(7):
-            self.todo_layout.addWidget(TodoItem(show_placeholder=(i==0)))
-        self.add_item_row = AddItemRow(self.add_todo_item, self.btn_color)
-        self.todo_layout.addWidget(self.add_item_row)
-
-        self.scroll.setWidget(self.inner)
+        # 拖动（标题栏）与边缘缩放，按显示帧合并几何更新；遮罩在手势结束后再算
+        self.drag = DragController(self, handle=self.title_bar)
+        self.drag.finished.connect(self._drag_finished)
+
+        if record:
+            self.title_edit.setText(record.get("title","Todo List"))
+            items = record.get("items",[])
+            geo = record.get("geometry")
+            if geo and len(geo)==4:
+                self.setGeometry(*geo)
+        else:
+            items = None
+        if items is not None and self.journal is None:
+            # 仓库里的、未保存的清单也给条目编 id：提醒到点时靠 id 找回条目
+            self._local_id = max((it["id"] for it in items if isinstance(it.get("id"), int)), default=0)
+            items = [it if it.get("id") is not None else dict(it, id=self._new_id()) for it in items]
 
         cl = QVBoxLayout(self.container)
         cl.setContentsMargins(0,0,0,0); cl.setSpacing(0)
-        cl.addWidget(self.title_bar); cl.addWidget(self.scroll)
-
-        self.show()
+        cl.addWidget(self.title_bar)
+        self.add_item_row = AddItemRow(self.add_todo_item)
+
+        if self.virtual:
+            self.model = TodoListModel(items if items is not None else [{"id": self._new_id()} for _ in range(7)],
+                                       self, listener=self._log)
+            self.model.id_factory = self._new_id
+            self.view = QListView(self.container)
+            self.view.setFrameShape(QFrame.NoFrame)
+            self.view.setUniformItemSizes(True)   # 行高固定，滚动时只算可见行
+            self.view.setModel(self.model)
+            self.view.setSelectionMode(QAbstractItemView.ExtendedSelection)
+            delegate = TodoItemDelegate(self.view)
+            delegate.paste_handler = self._paste_at
+            self.view.setItemDelegate(delegate)
+            self.view.setEditTriggers(QAbstractItemView.DoubleClicked|QAbstractItemView.EditKeyPressed
+                                      |QAbstractItemView.SelectedClicked)
+            cl.addWidget(self.view); cl.addWidget(self.add_item_row)
+        else:
+            self.scroll = QScrollArea(self.container)
+            self.scroll.setWidgetResizable(True)
+            self.scroll.setFrameShape(QScrollArea.NoFrame)
+
+            self.inner = QWidget()
+            self.inner.setObjectName("todoInner")
+            self.todo_layout = QVBoxLayout(self.inner)
+            self.todo_layout.setContentsMargins(12,8,12,8)
+            self.todo_layout.setSpacing(12)
+            if items is not None:
+                # 先建第一批，其余在事件循环空闲时分批补上
+                for it in items[:FETCH_BATCH]:
+                    self.todo_layout.addWidget(self._make_item(it))
+                self._pending = items[FETCH_BATCH:]
+                if self._pending:
+                    QTimer.singleShot(0, self._materialize_more)
+            else:
+                # 默认空行也走 _make_item：粘贴拆分、日志、提醒的信号都要接上
+                for i in range(7):
+                    item = self._make_item({"id": self._new_id()})
+                    if i==0:
+                        item.txt.setPlaceholderText(" 输入待办事项…")
+                    self.todo_layout.addWidget(item)
+            self.todo_layout.addWidget(self.add_item_row)
+            self.scroll.setWidget(self.inner)
+            cl.addWidget(self.scroll)
+
+        # 批量操作：列表空白处右键菜单，Alt+↑/↓ 移动当前条（虚拟模式下为选中的连续一段）
+        self.container.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.container.customContextMenuRequested.connect(self._list_menu)
+        QShortcut(QKeySequence("Alt+Up"), self, lambda: self._shift_current(-1))
+        QShortcut(QKeySequence("Alt+Down"), self, lambda: self._shift_current(1))
+        QShortcut(QKeySequence("Alt+R"), self, lambda: self._edit_due(self._item_at(None)))
+
+        # 到期提醒：登记到全局调度器，到点由它回调 _reminder_fired
+        self._track_reminders()
+
+        # visible=False 供窗口池预先构造隐藏实例
+        if visible:
+            self.show()
 
     def add_todo_item(self):
-        item = TodoItem()
+        if self.virtual:
+            idx = self.model.append()
+            self.view.scrollTo(idx); self.view.setCurrentIndex(idx); self.view.edit(idx)
+            return
+        self._flush_pending()
+        item = self._make_item({"id": self._new_id()})
         self.todo_layout.insertWidget(self.todo_layout.count() - 1, item)
         item.findChild(QLineEdit).setFocus()
-
-    def _adjust_color(self,c,f):
-        col=QColor(c)
-        return QColor(min(int(col.red()*f),255),
-                      min(int(col.green()*f),255),
-                      min(int(col.blue()*f),255)).name()
-
-    def round_mask(self, r):
-        path = QPainterPath()
-        path.addRoundedRect(0,0,self.width(),self.height(),r,r)
-        return QRegion(path.toFillPolygon().toPolygon())
+        self._log(("add", item.item_id, "", 0))
+
+    def _make_item(self, it):
+        item = TodoItem(text=it.get("text",""), checked=it.get("done",False), item_id=it.get("id"),
+                        due=it.get("due"), remind=it.get("remind"))
+        item.chk.stateChanged.connect(
+            lambda st, w=item: self._log(("check", w.item_id, int(st==Qt.Checked))))
+        item.last_text = item.txt.text()
+        item.txt.editingFinished.connect(lambda w=item: self._text_edited(w))
+        item.txt.paste_handler = lambda e, text, w=item: self._paste_at(self._rows().index(w), e, text)
+        return item
+
+    def _text_edited(self, item):
+        # 编辑完成才记一行，不按键记
+        t = item.txt.text()
+        if t != item.last_text:
+            item.last_text = t
+            self._log(("edit", item.item_id, t))
+
+    def _materialize_more(self):
+        if not self._pending:
+            return
+        batch, self._pending = self._pending[:FETCH_BATCH], self._pending[FETCH_BATCH:]
+        at = self.todo_layout.count() - 1
+        with self._bulk():
+            for it in batch:
+                self.todo_layout.insertWidget(at, self._make_item(it)); at += 1
+        if self._pending:
+            QTimer.singleShot(0, self._materialize_more)
+
+    def _flush_pending(self):
+        while self._pending:
+            self._materialize_more()
+
+    def _new_id(self):
+        if self.journal:
+            return self.journal.new_id()
+        self._local_id += 1
+        return self._local_id
+
+    def _log(self, op):
+        if op[0] in ("check", "del", "due"):
+            self._remind_op(op)
+        if self.journal is None:
+            return
+        self.journal.append(*op)
+        if self.journal.needs_compaction(self._count()):
+            self.journal.compact(self._items(), self.title_edit.text(), self._geometry())
+
+    def _log_many(self, ops):
+        for op in ops:
+            if op[0]=="del":
+                self._remind_op(op)
+        if self.journal is None or not ops:
+            return
+        self.journal.append_many(ops)
+        if self.journal.needs_compaction(self._count()):
+            self.journal.compact(self._items(), self.title_edit.text(), self._geometry())
+
+    # ---- 批量操作：冻结重绘与布局，改完只排版一次；日志一次写入 ----
+    @contextmanager
+    def _bulk(self):
+        # 可嵌套，最外层结束时才恢复
+        target = self.view if self.virtual else self.inner
+        self._bulk_depth += 1
+        if self._bulk_depth==1:
+            target.setUpdatesEnabled(False)
+            if not self.virtual:
+                self.todo_layout.setEnabled(False)
+        try:
+            yield
+        finally:
+            self._bulk_depth -= 1
+            if self._bulk_depth==0:
+                if not self.virtual:
+                    self.todo_layout.setEnabled(True)
+                    self.todo_layout.activate()
+                target.setUpdatesEnabled(True)
+
+    def _rows(self):
+        # 控件模式下已物化的条目，按显示顺序（添加按钮那一行总在最后）
+        lay = self.todo_layout
+        return [lay.itemAt(i).widget() for i in range(lay.count()-1)]
+
+    def _relayout(self, widgets):
+        # 整体取出再按新顺序放回，O(n)；逐个 removeWidget 是 O(n²)
+        lay = self.todo_layout
+        while lay.count():
+            lay.takeAt(lay.count()-1)
+        for w in widgets:
+            lay.addWidget(w)
+        lay.addWidget(self.add_item_row)
+
+    def paste_lines(self, text, at=None):
+        # 多行文本一行一条插到第 at 条之前（默认末尾）；返回新增条数
+        rows = parse_lines(text)
+        if not rows:
+            return 0
+        n = self._count()
+        at = n if at is None else max(0, min(at, n))
+        if self.virtual:
+            with self._bulk():
+                ids = self.model.insert(at, rows)
+        else:
+            items = [{"id": self._new_id(), "text": t, "done": d} for t, d in rows]
+            ids = [it["id"] for it in items]
+            shown = self.todo_layout.count()-1
+            if at >= shown and (self._pending or len(items) > FETCH_BATCH):
+                # 落在还没物化的尾部：并入待物化队列，空闲时分批建控件
+                if not self._pending:
+                    QTimer.singleShot(0, self._materialize_more)
+                self._pending[at-shown:at-shown] = items
+            else:
+                with self._bulk():
+                    for i, it in enumerate(items):
+                        self.todo_layout.insertWidget(at+i, self._make_item(it))
+        ops = [("add", iid, t, int(d)) for iid, (t, d) in zip(ids, rows)]
+        if at < n:
+            ops += block_move_ops(ids, at, downward=False)     # add 总是追加在末尾
+        self._log_many(ops)
+        return len(rows)
+
+    def _paste_at(self, row, edit, text):
+        # 在某一条里粘贴多行：这条是空的就先填第一行，其余插在它后面
+        if not edit.text().strip():
+            rows = text.splitlines()
+            while rows and not parse_lines(rows[0]):
+                rows.pop(0)
+            if rows:
+                edit.setText(parse_lines(rows[0])[0][0])
+                text = "\n".join(rows[1:])
+        self.paste_lines(text, row+1)
+
+    def clear_completed(self):
+        # 返回删除的条数
+        if self.virtual:
+            with self._bulk():
+                gone = self.model.remove_done()
+        else:
+            widgets = self._rows()
+            done = [w for w in widgets if w.chk.isChecked()]
+            with self._bulk():
+                self._relayout([w for w in widgets if not w.chk.isChecked()])
+                for w in done:
+                    w.hide(); w.deleteLater()
+            gone = [w.item_id for w in done] + [it.get("id") for it in self._pending if it.get("done")]
+            self._pending = [it for it in self._pending if not it.get("done")]
+        self._log_many([("del", iid) for iid in gone])
+        return len(gone)
+
+    def sort_items(self, by="pending"):
+        key = SORT_KEYS[by]
+        if self.virtual:
+            self.model.sort_rows(key)
+        else:
+            with self._bulk():
+                self._flush_pending()
+                self._relayout(sorted(self._rows(), key=lambda w: key(w.txt.text(), w.chk.isChecked())))
+        # 整体换序：与其追加 n 条 move，不如直接按新顺序重写日志
+        if self.journal:
+            self.journal.compact(self._items(), self.title_edit.text(), self._geometry())
+
+    def move_block(self, first, count, dest):
+        # 把第 first 起的 count 条移到 dest 起的位置（dest 按移动后的顺序计）
+        n = self.model.loaded if self.virtual else self.todo_layout.count()-1
+        dest = max(0, min(dest, n-count))
+        if count <= 0 or first < 0 or first+count > n or dest==first:
+            return False
+        if self.virtual:
+            ids = [r[2] for r in self.model.rows[first:first+count]]
+            if not self.model.move_rows(first, count, dest):
+                return False
+        else:
+            widgets = self._rows()
+            block = widgets[first:first+count]
+            rest = widgets[:first] + widgets[first+count:]
+            with self._bulk():
+                self._relayout(rest[:dest] + block + rest[dest:])
+            ids = [w.item_id for w in block]
+        self._log_many(block_move_ops(ids, dest, dest > first))
+        return True
+
+    def _shift_current(self, step):
+        if self.virtual:
+            rows = sorted(i.row() for i in self.view.selectionModel().selectedRows())
+            if not rows and self.view.currentIndex().isValid():
+                rows = [self.view.currentIndex().row()]
+            if not rows or rows[-1]-rows[0]+1 != len(rows):
+                return      # 不连续的选择不移动
+            if self.move_block(rows[0], len(rows), rows[0]+step):
+                self.view.scrollTo(self.view.currentIndex())
+            return
+        w = self._focused_item()
+        if w is None:
+            return
+        i = self._rows().index(w)
+        if self.move_block(i, 1, i+step):
+            w.txt.setFocus()
+            self.scroll.ensureWidgetVisible(w)
+
+    def _focused_item(self, w=None):
+        w = QApplication.focusWidget() if w is None else w
+        while w is not None and not isinstance(w, TodoItem):
+            w = w.parentWidget()
+        return w if w is not None and w.parentWidget() is self.inner else None
+
+    def _list_menu(self, pos):
+        menu = QMenu(self)
+        clip = QApplication.clipboard().text()
+        act = menu.addAction("粘贴为多条", lambda: self.paste_lines(clip))
+        act.setEnabled(bool(parse_lines(clip)))
+        iid = self._item_at(pos)
+        act = menu.addAction("设置提醒…", lambda: self._edit_due(iid))
+        act.setEnabled(iid is not None)
+        menu.addAction("清除已完成", self.clear_completed)
+        sort = menu.addMenu("排序")
+        sort.addAction("未完成在前", lambda: self.sort_items("pending"))
+        sort.addAction("按内容", lambda: self.sort_items("text"))
+        menu.exec_(self.container.mapToGlobal(pos))
+
+    # ---- 到期与提醒 ----
+    def _item_at(self, pos):
+        # 右键位置下的条目 id；pos 为 None 或不在条目上时取当前条
+        w = self.container.childAt(pos) if pos is not None else None
+        if self.virtual:
+            idx = self.view.currentIndex()
+            if w is self.view.viewport():
+                idx = self.view.indexAt(self.view.viewport().mapFrom(self.container, pos))
+            return self.model.rows[idx.row()][2] if idx.isValid() else None
+        w = self._focused_item(w) or self._focused_item()
+        return w.item_id if w is not None else None
+
+    def _due_entry(self, item_id):
+        # 按 id 找条目，返回 (text, done, due, remind, 设置到期的函数)；找不到返回 None
+        if item_id is None:
+            return None
+        if self.virtual:
+            for i, r in enumerate(self.model.rows):
+                if r[2]==item_id:
+                    return r[0], r[1], r[3], r[4], lambda d, m, i=i: self.model.set_due(i, d, m)
+            return None
+        for w in self._rows():
+            if w.item_id==item_id:
+                return w.txt.text(), w.chk.isChecked(), w.due, w.remind, w.set_due
+        for it in self._pending:
+            if it.get("id")==item_id:
+                return (it.get("text",""), it.get("done",False), it.get("due"), it.get("remind"),
+                        lambda d, m, it=it: it.update(due=d, remind=m))
+        return None
+
+    def set_due(self, item_id, due, remind=None):
+        # epoch 秒；due 为 None 即清除，remind 为 None 表示不提醒
+        e = self._due_entry(item_id)
+        if e is None:
+            return False
+        if due is None:
+            remind = None
+        e[4](due, remind)
+        self._log(("due", item_id, due, remind))
+        return True
+
+    def _edit_due(self, item_id):
+        e = self._due_entry(item_id)
+        if e is None:
+            return
+        r = ask_due(self, e[2], e[3])
+        if r is not False:
+            self.set_due(item_id, *r)
+
+    def reminder_source(self):
+        # 提醒按 (来源, 条目 id) 登记；有文件的清单用文件路径，收起后也能按路径补登记
+        if self.journal:
+            return os.path.abspath(self.file_path)
+        if self.note_id and self.repo:
+            return "todo:"+self.note_id
+        return f"window:{id(self)}"
+
+    def _payload(self, text, due):
+        return {"text": text, "title": self.title_edit.text(), "due": due,
+                "path": os.path.abspath(self.file_path) if self.journal else None}
+
+    def _track_reminders(self):
+        src, reminders = self.reminder_source(), default_reminders()
+        reminders.owners[src] = self._reminder_fired
+        reminders.track_items(src, self._items(), self.title_edit.text(),
+                              os.path.abspath(self.file_path) if self.journal else None)
+
+    def _remind_op(self, op):
+        # 勾选完成、删除撤掉提醒；取消勾选、改到期时间重新登记
+        reminders, item_id = default_reminders(), op[1]
+        if op[0]=="del" or (op[0]=="check" and op[2]):
+            reminders.set(self.reminder_source(), item_id, None)
+            return
+        e = self._due_entry(item_id)
+        if e is None:
+            return
+        text, done, due, remind, _ = e
+        reminders.set(self.reminder_source(), item_id, None if done else remind, self._payload(text, due))
+
+    def _reminder_fired(self, payload):
+        # 提醒已发出：清掉提醒时间、保留到期时间（重启后不再弹）；通知里用当前的文字和标题
+        e = self._due_entry(payload["item_id"])
+        if e is None:
+            return
+        text, _, due, _, setter = e
+        payload.update(text=text, title=self.title_edit.text(), due=due)
+        setter(due, None)
+        self._log(("due", payload["item_id"], due, None))
+
+    def _drop_reminders(self, src):
+        # 关窗：有文件的清单提醒照常，到点由服务直接写日志；其余的撤掉
+        reminders = default_reminders()
+        reminders.owners.pop(src, None)
+        if self.journal is None or src != self.reminder_source():
+            reminders.cancel_source(src)
+            if self.journal:
+                reminders.track_file(self.file_path)    # 关闭时刚另存为文件
+
+    def _load(self, path):
+        try:
+            self.journal = TodoJournal(path)
+            items = self.journal.load()
+        except Exception as e:
+            self.journal = None
+            QMessageBox.warning(self,"加载失败",f"无法加载待办清单：\n{e}")
+            return None
+        return {"title": self.journal.title, "items": items, "geometry": self.journal.geometry}
+
+    def _save(self, path):
+        self.journal = TodoJournal(path)
+        items = [it for it in self._items() if it["text"]]
+        for it in items:
+            it["id"] = self.journal.new_id()
+        self.journal.compact(items, self.title_edit.text(), self._geometry())
+
+    def set_items(self, items):
+        if self.virtual:
+            self.model.set_items(items)
+            self._track_reminders(); return
+        for i in reversed(range(self.todo_layout.count())):
+            w = self.todo_layout.itemAt(i).widget()
+            if isinstance(w, TodoItem):
+                self.todo_layout.removeWidget(w); w.deleteLater()
+        self._pending = []
+        for it in items:
+            self.todo_layout.insertWidget(self.todo_layout.count() - 1, self._make_item(it))
+        self._track_reminders()
+
+    def _items(self):
+        if self.virtual:
+            return self.model.items()
+        out = []
+        for i in range(self.todo_layout.count()):
+            w = self.todo_layout.itemAt(i).widget()
+            if isinstance(w, TodoItem):
+                it = {"text": w.txt.text(), "done": w.chk.isChecked(), "id": w.item_id}
+                if w.due is not None or w.remind is not None:
+                    it["due"], it["remind"] = w.due, w.remind
+                out.append(it)
+        return out + [dict(it) for it in self._pending]
+
+    def _count(self):
+        if self.virtual:
+            return len(self.model.rows)
+        return self.todo_layout.count() - 1 + len(self._pending)
+
+    def _geometry(self):
+        return [self.x(), self.y(), self.width(), self.height()]
+
+    def _data(self):
+        return {
+            "title": self.title_edit.text(),
+            "items": self._items(),
+            "geometry": self._geometry()
+        }
+
+    def apply_theme(self, theme):
+        self.theme = theme
+        self.bg_color, self.btn_color = theme.bg, theme.btn
+        self.container.setStyleSheet(theme.todo_qss)
+
+    def suspend(self):
+        # 供窗口管理器收起：没有文件的清单先放进仓库，关闭时保存，不再弹窗
+        if not (self.journal or (self.note_id and self.repo)):
+            self.repo = default_repository()
+            self.note_id = self.repo.new_id()
+        return {"kind": "todo", "file_path": self.file_path if self.journal else None,
+                "note_id": self.note_id, "geometry": self._geometry()}
+
+    def closeEvent(self, e):
+        src = self.reminder_source()
+        if self.journal:
+            if not self.virtual:
+                for it in self.findChildren(TodoItem):
+                    self._text_edited(it)
+            self.journal.append("geo", self._geometry())
+            if self.journal.needs_compaction(self._count()):
+                self.journal.compact(self._items(), self.title_edit.text(), self._geometry())
+            self.journal.close()
+            data = self._data()
+            index_later("file:"+os.path.abspath(self.file_path),
+                        document_text(data), data["title"], "todo")
+        elif self.note_id and self.repo:
+            data = self._data()
+            self.repo.save(self.note_id, data, kind="todo")
+            index_later("todo:"+self.note_id, document_text(data), data["title"], "todo")
+        elif any(it["text"] for it in self._items()):
+            r = QMessageBox.question(
+                self,"保存待办清单","是否保存待办清单？",
+                QMessageBox.Yes|QMessageBox.No|QMessageBox.Cancel
+            )
+            if r==QMessageBox.Cancel:
+                e.ignore(); return
+            if r==QMessageBox.Yes:
+                p,_ = QFileDialog.getSaveFileName(
+                    self,"保存待办清单","","Todo List (*.snt)"
+                )
+                if not p:
+                    e.ignore(); return
+                self.file_path = p
+                self._save(p)
+                self.journal.close()
+        self._drop_reminders(src)
+        super().closeEvent(e)
 
     def resizeEvent(self, e):
         super().resizeEvent(e)
-        self.setMask(self.round_mask(16))
-
-    def eventFilter(self, s, e):
-        if s is self.title_bar:
-            if e.type()==QEvent.MouseButtonPress and e.button()==Qt.LeftButton:
-                self.old_pos = e.globalPos(); return True
-            if e.type()==QEvent.MouseMove and self.old_pos:
-                d = e.globalPos() - self.old_pos
-                self.move(self.x()+d.x(), self.y()+d.y())
-                self.old_pos = e.globalPos(); return True
-            if e.type()==QEvent.MouseButtonRelease:
-                self.old_pos = None; return True
-        return super().eventFilter(s, e)
-
-    def mousePressEvent(self, e):
-        if e.button()==Qt.LeftButton:
-            self.old_pos = e.globalPos()
-            self.resizing_edge = self._get_edge(e.pos())
-
-    def mouseMoveEvent(self, e):
-        if self.resizing_edge and self.old_pos:
-            d = e.globalPos() - self.old_pos; g = self.geometry()
-            if "left" in self.resizing_edge: g.setLeft(g.left()+d.x())
-            if "right" in self.resizing_edge: g.setRight(g.right()+d.x())
-            if "top" in self.resizing_edge: g.setTop(g.top()+d.y())
-            if "bottom" in self.resizing_edge: g.setBottom(g.bottom()+d.y())
-            self.setGeometry(g); self.old_pos = e.globalPos()
-        else:
-            ed = self._get_edge(e.pos())
-            cmap = {
-                "top_left": Qt.SizeFDiagCursor, "top_right": Qt.SizeBDiagCursor,
-                "bottom_left": Qt.SizeBDiagCursor, "bottom_right": Qt.SizeFDiagCursor,
-                "left": Qt.SizeHorCursor, "right": Qt.SizeHorCursor,
-                "top": Qt.SizeVerCursor, "bottom": Qt.SizeVerCursor, None: Qt.ArrowCursor
-            }
-            self.setCursor(cmap.get(ed, Qt.ArrowCursor))
-
-    def mouseReleaseEvent(self, e):
-        self.old_pos = None; self.resizing_edge = None
-        self.setMask(self.round_mask(16))
-        self.setCursor(Qt.ArrowCursor)
-
-    def _get_edge(self, pos):
-        r = self.rect(); x,y = pos.x(), pos.y()
-        return (
-            "top_left" if x<EDGE_MARGIN and y<EDGE_MARGIN else
-            "top_right" if x>r.width()-EDGE_MARGIN and y<EDGE_MARGIN else
-            "bottom_left" if x<EDGE_MARGIN and y>r.height()-EDGE_MARGIN else
-            "bottom_right" if x>r.width()-EDGE_MARGIN and y>r.height()-EDGE_MARGIN else
-            "left" if x<EDGE_MARGIN else "right" if x>r.width()-EDGE_MARGIN else
-            "top" if y<EDGE_MARGIN else "bottom" if y>r.height()-EDGE_MARGIN else None
-        )
+        # 缩放过程中不重算遮罩，手势结束后统一算一次
+        if not self.drag.active:
+            apply_rounded(self, 16)
+
+    def _drag_finished(self, mode):
+        if mode != "move":
+            apply_rounded(self, 16)
@@ -0,0 +1,235 @@
+# TodoModel.py —— TodoList 的虚拟化模式：模型 + 委托，只绘制可见行
+import re, time
+from PyQt5.QtWidgets import QApplication, QStyledItemDelegate, QLineEdit
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QSize
+from PyQt5.QtGui import QPen, QColor, QFont, QKeySequence
+
+from ReminderQueue import format_due
+
+ROW_HEIGHT = 34
+FETCH_BATCH = 500      # 大清单分批交给视图，打开时只物化第一批
+DUE_ROLE = Qt.UserRole + 1
+
+# 排序键，参数为 (text, done)；sorted 是稳定的，同键保持原有先后
+SORT_KEYS = {
+    "pending": lambda text, done: done,             # 未完成在前
+    "text": lambda text, done: text.casefold(),
+}
+
+_BULLET = re.compile(r"^\s*(?:[-*+\u2022]\s+|\d+[.)]\s+)?(?:\[([ xX])\]\s*)?")
+
+def parse_lines(text):
+    # 多行粘贴：一行一条，去掉空行和列表符号；"- [x] ..." 这样的清单行保留勾选状态
+    out = []
+    for line in text.splitlines():
+        m = _BULLET.match(line)
+        body = line[m.end():].strip()
+        if body:
+            out.append((body, (m.group(1) or " ") in "xX"))
+    return out
+
+def _row(it):
+    return [it.get("text",""), bool(it.get("done",False)), it.get("id"), it.get("due"), it.get("remind")]
+
+
+class PasteLineEdit(QLineEdit):
+    # 粘贴多行文本时不塞进一行，交给 paste_handler(编辑框, 文本) 拆成多条
+    paste_handler = None
+
+    def keyPressEvent(self, ev):
+        if self.paste_handler is not None and ev.matches(QKeySequence.Paste):
+            text = QApplication.clipboard().text()
+            if "\n" in text.strip():
+                self.paste_handler(self, text)
+                return
+        super().keyPressEvent(ev)
+
+
+class TodoListModel(QAbstractListModel):
+    # 每行只存 [text, done, id, due, remind]，不为行创建任何控件；
+    # listener(op) 收到 ("edit", id, text) / ("check", id, done) / ("add", id, text, done)
+    def __init__(self, items=None, parent=None, listener=None):
+        super().__init__(parent)
+        self.rows = [_row(it) for it in (items or [])]
+        self.loaded = min(len(self.rows), FETCH_BATCH)
+        self.listener = listener
+        self.id_factory = None
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.loaded
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.loaded < len(self.rows)
+
+    def fetchMore(self, parent=QModelIndex()):
+        n = min(len(self.rows)-self.loaded, FETCH_BATCH)
+        if n <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self.loaded, self.loaded+n-1)
+        self.loaded += n
+        self.endInsertRows()
+
+    def _fetch_all(self):
+        while self.canFetchMore():
+            self.fetchMore()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self.rows[index.row()]
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return row[0]
+        if role == Qt.CheckStateRole:
+            return Qt.Checked if row[1] else Qt.Unchecked
+        if role == DUE_ROLE:
+            return row[3]
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid():
+            return False
+        row = self.rows[index.row()]
+        if role == Qt.EditRole:
+            if row[0] == value:
+                return True
+            row[0] = value
+            op = ("edit", row[2], value)
+        elif role == Qt.CheckStateRole:
+            row[1] = (value == Qt.Checked)
+            op = ("check", row[2], int(row[1]))
+        else:
+            return False
+        self.dataChanged.emit(index, index, [role])
+        if self.listener:
+            self.listener(op)
+        return True
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled|Qt.ItemIsSelectable|Qt.ItemIsEditable|Qt.ItemIsUserCheckable
+
+    def set_items(self, items):
+        self.beginResetModel()
+        self.rows = [_row(it) for it in items]
+        self.loaded = min(len(self.rows), FETCH_BATCH)
+        self.endResetModel()
+
+    def append(self, text="", done=False):
+        self._fetch_all()
+        n = len(self.rows)
+        iid = self.id_factory() if self.id_factory else None
+        self.beginInsertRows(QModelIndex(), n, n)
+        self.rows.append([text, done, iid, None, None])
+        self.loaded += 1
+        self.endInsertRows()
+        if self.listener:
+            self.listener(("add", iid, text, int(done)))
+        return self.index(n)
+
+    def items(self):
+        out = []
+        for t, d, i, due, remind in self.rows:
+            it = {"text": t, "done": d, "id": i}
+            if due is not None or remind is not None:
+                it["due"], it["remind"] = due, remind
+            out.append(it)
+        return out
+
+    def set_due(self, row, due, remind):
+        # 日志由调用方写
+        r = self.rows[row]
+        r[3], r[4] = due, remind
+        if row < self.loaded:
+            idx = self.index(row)
+            self.dataChanged.emit(idx, idx, [DUE_ROLE])
+
+    # 批量操作各只发一次模型信号，视图只重排一次；
+    # 日志由调用方一次写入，这里不逐条通知 listener
+    def insert(self, at, rows):
+        # rows 为 [(text, done)]，插到第 at 行之前；返回新条目的 id
+        if not rows:
+            return []
+        if at > self.loaded:
+            self._fetch_all()
+        ids = [self.id_factory() if self.id_factory else None for _ in rows]
+        self.beginInsertRows(QModelIndex(), at, at+len(rows)-1)
+        self.rows[at:at] = [[t, bool(d), i, None, None] for (t, d), i in zip(rows, ids)]
+        self.loaded += len(rows)
+        self.endInsertRows()
+        return ids
+
+    def remove_done(self):
+        # 返回被删条目的 id
+        gone = [r[2] for r in self.rows if r[1]]
+        if gone:
+            shown = sum(1 for r in self.rows[:self.loaded] if r[1])
+            self.beginResetModel()
+            self.rows = [r for r in self.rows if not r[1]]
+            self.loaded = min(len(self.rows), max(self.loaded-shown, FETCH_BATCH))
+            self.endResetModel()
+        return gone
+
+    def sort_rows(self, key):
+        # 行数不变，只换顺序：layoutChanged 保留选中和当前行
+        order = sorted(range(len(self.rows)), key=lambda i: key(self.rows[i][0], self.rows[i][1]))
+        pos = [0]*len(order)
+        for new, old in enumerate(order):
+            pos[old] = new
+        self.layoutAboutToBeChanged.emit()
+        old = self.persistentIndexList()
+        self.rows = [self.rows[i] for i in order]
+        self.changePersistentIndexList(old, [self.index(pos[i.row()]) for i in old])
+        self.layoutChanged.emit()
+
+    def move_rows(self, first, count, dest):
+        # dest 为移动后块首行的位置
+        qdest = dest+count if dest > first else dest
+        if not self.beginMoveRows(QModelIndex(), first, first+count-1, QModelIndex(), qdest):
+            return False
+        block = self.rows[first:first+count]
+        del self.rows[first:first+count]
+        self.rows[dest:dest] = block
+        self.endMoveRows()
+        return True
+
+
+class TodoItemDelegate(QStyledItemDelegate):
+    # 复选框由基类绘制；勾选时划删除线（同 TodoItem._toggle_strike），下方画虚线分隔，
+    # 有到期时间的在右侧用小字画出，未完成且已过期的标红
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.sep_pen = QPen(QColor("#aaa"), 1, Qt.DashLine)
+        self.due_colors = (QColor("#777"), QColor("#c62828"))
+        self.paste_handler = None     # (行号, 编辑框, 文本)
+
+    def initStyleOption(self, option, index):
+        super().initStyleOption(option, index)
+        option.font.setStrikeOut(option.checkState == Qt.Checked)
+        option.backgroundBrush = Qt.NoBrush
+
+    def paint(self, painter, option, index):
+        super().paint(painter, option, index)
+        r = option.rect
+        painter.save()
+        painter.setPen(self.sep_pen)
+        painter.drawLine(r.left(), r.bottom(), r.right(), r.bottom())
+        due = index.data(DUE_ROLE)
+        if due is not None:
+            late = due < time.time() and index.data(Qt.CheckStateRole) != Qt.Checked
+            font = QFont(option.font)
+            font.setPointSizeF(max(7.0, font.pointSizeF()*0.8))
+            painter.setFont(font)
+            painter.setPen(self.due_colors[late])
+            painter.drawText(r.adjusted(0, 0, -6, 0), Qt.AlignRight|Qt.AlignVCenter, format_due(due))
+        painter.restore()
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), ROW_HEIGHT)
+
+    def createEditor(self, parent, option, index):
+        ed = PasteLineEdit(parent)
+        ed.setFrame(False)
+        if self.paste_handler is not None:
+            ed.paste_handler = lambda e, text, row=index.row(): self.paste_handler(row, e, text)
+        return ed
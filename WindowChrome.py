@@ -0,0 +1,98 @@
+# WindowChrome.py —— 窗口外观缓存：圆角遮罩、启动器胶囊的预渲染位图
+#
+# 按 (尺寸, 圆角, 颜色) 缓存，LRU 限定条数；拖动缩放时来回经过的尺寸不再重复生成。
+# 圆角可以用 setMask 裁剪，也可以只靠半透明背景 + 样式表圆角（平台支持合成时更省）。
+import os
+from collections import OrderedDict
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import Qt, QRect
+from PyQt5.QtGui import QPainter, QPainterPath, QRegion, QColor, QPixmap
+
+CACHE_SIZE = int(os.environ.get("STICKYNOTES_CHROME_CACHE", "64"))
+CHROME_MODE = os.environ.get("STICKYNOTES_CHROME", "auto")    # auto / mask / translucent
+
+class _LRU:
+    def __init__(self, size):
+        self.size = max(1, size)
+        self.items = OrderedDict()
+        self.hits = 0; self.misses = 0
+
+    def get(self, key, build):
+        v = self.items.get(key)
+        if v is not None:
+            self.items.move_to_end(key); self.hits += 1
+            return v
+        self.misses += 1
+        v = self.items[key] = build()
+        if len(self.items) > self.size:
+            self.items.popitem(last=False)
+        return v
+
+    def clear(self):
+        self.items.clear()
+
+_masks = _LRU(CACHE_SIZE)
+_pixmaps = _LRU(CACHE_SIZE)
+
+def rounded_region(w, h, r):
+    def build():
+        path = QPainterPath()
+        path.addRoundedRect(0,0,w,h,r,r)
+        return QRegion(path.toFillPolygon().toPolygon())
+    return _masks.get((w, h, r), build)
+
+def capsule_pixmap(w, h, r, bg, left, dpr=1.0):
+    # 整个胶囊底色 + 左半边的彩色半圆，画一次后按尺寸/颜色复用
+    def build():
+        pm = QPixmap(int(w*dpr), int(h*dpr))
+        pm.setDevicePixelRatio(dpr)
+        pm.fill(Qt.transparent)
+        p = QPainter(pm)
+        p.setRenderHint(QPainter.Antialiasing)
+        path = QPainterPath()
+        path.addRoundedRect(0,0,w,h,r,r)
+        p.fillPath(path, QColor(bg))
+        lr = QRect(0,0,w//2,h)
+        cp = QPainterPath()
+        cp.moveTo(lr.right(),0)
+        cp.lineTo(lr.x()+r,0)
+        cp.quadTo(lr.x(),0,lr.x(),r)
+        cp.lineTo(lr.x(),lr.bottom()-r)
+        cp.quadTo(lr.x(),lr.bottom(),lr.x()+r,lr.bottom())
+        cp.lineTo(lr.right(),lr.bottom())
+        cp.closeSubpath()
+        p.fillPath(cp, QColor(left))
+        p.end()
+        return pm
+    return _pixmaps.get((w, h, r, bg, left, dpr), build)
+
+_use_mask = None
+
+def use_mask():
+    # 窗口管理器能合成半透明时，圆角交给 WA_TranslucentBackground + 样式表即可
+    global _use_mask
+    if _use_mask is None:
+        if CHROME_MODE in ("mask", "translucent"):
+            _use_mask = CHROME_MODE=="mask"
+        else:
+            platform = QApplication.platformName()
+            if platform=="xcb":
+                try:
+                    from PyQt5.QtX11Extras import QX11Info
+                    _use_mask = not QX11Info.isCompositingManagerRunning()
+                except ImportError:
+                    _use_mask = True
+            else:
+                _use_mask = platform not in ("windows", "cocoa", "wayland", "offscreen")
+    return _use_mask
+
+def apply_rounded(widget, r):
+    if use_mask():
+        widget.setMask(rounded_region(widget.width(), widget.height(), r))
+
+def stats():
+    return {
+        "mode": "mask" if use_mask() else "translucent",
+        "masks": {"cached": len(_masks.items), "hits": _masks.hits, "misses": _masks.misses},
+        "pixmaps": {"cached": len(_pixmaps.items), "hits": _pixmaps.hits, "misses": _pixmaps.misses},
+    }
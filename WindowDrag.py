@@ -0,0 +1,132 @@
+# WindowDrag.py —— 无边框窗口的拖动 / 缩放控制器（便签、待办、启动器共用）
+#
+# 鼠标事件只记录目标位置，每个显示帧最多调用一次 move()/setGeometry()；
+# 目标总是由"手势开始时的几何 + 累计位移"算出，丢掉中间事件也不会漂移。
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import Qt, QObject, QEvent, QTimer, QRect, pyqtSignal
+
+EDGE_MARGIN = 6
+CURSORS = {
+    "top_left": Qt.SizeFDiagCursor, "top_right": Qt.SizeBDiagCursor,
+    "bottom_left": Qt.SizeBDiagCursor, "bottom_right": Qt.SizeFDiagCursor,
+    "left": Qt.SizeHorCursor, "right": Qt.SizeHorCursor,
+    "top": Qt.SizeVerCursor, "bottom": Qt.SizeVerCursor, None: Qt.ArrowCursor
+}
+TOTALS = {"events_in": 0, "updates_out": 0}   # 所有窗口累计
+
+def edge_at(rect, pos, margin=EDGE_MARGIN):
+    x, y, w, h = pos.x(), pos.y(), rect.width(), rect.height()
+    return (
+        "top_left"     if x<margin and y<margin else
+        "top_right"    if x>w-margin and y<margin else
+        "bottom_left"  if x<margin and y>h-margin else
+        "bottom_right" if x>w-margin and y>h-margin else
+        "left"   if x<margin else
+        "right"  if x>w-margin else
+        "top"    if y<margin else
+        "bottom" if y>h-margin else
+        None
+    )
+
+def resized(g, edge, dx, dy):
+    g = QRect(g)
+    if "left"   in edge: g.setLeft(g.left()+dx)
+    if "right"  in edge: g.setRight(g.right()+dx)
+    if "top"    in edge: g.setTop(g.top()+dy)
+    if "bottom" in edge: g.setBottom(g.bottom()+dy)
+    return g
+
+def frame_interval():
+    screen = QApplication.primaryScreen()
+    rate = screen.refreshRate() if screen else 60
+    return max(1, int(1000/(rate or 60)))
+
+
+class DragController(QObject):
+    finished = pyqtSignal(str)    # 手势结束："move" 或边缘名；昂贵的收尾放在这里做
+
+    def __init__(self, window, handle=None, resizable=True, threshold=0):
+        super().__init__(window)
+        self.window = window
+        self.handle = handle            # 标题栏：在这里按下只拖动
+        self.resizable = resizable
+        self.threshold = threshold      # 超过这个距离才算拖动（启动器要区分点击）
+        self.mode = None                # None / "move" / 边缘名
+        self.dragged = False            # 本次按下后是否真的拖动过，松开后保留到下次按下
+        self.pending = None
+        self.events_in = 0
+        self.updates_out = 0
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(frame_interval())
+        self.timer.timeout.connect(self._apply)
+        window.installEventFilter(self)
+        if handle is not None:
+            handle.installEventFilter(self)
+
+    @property
+    def active(self):
+        return self.mode is not None
+
+    def eventFilter(self, obj, ev):
+        t = ev.type()
+        on_handle = obj is self.handle
+        if obj is not self.window and not on_handle:
+            return False
+        if t==QEvent.MouseButtonPress and ev.button()==Qt.LeftButton:
+            edge = edge_at(self.window.rect(), ev.pos()) if (self.resizable and not on_handle) else None
+            self._begin(ev.globalPos(), edge or ("move" if (on_handle or not self.resizable) else None))
+            return on_handle
+        if t==QEvent.MouseMove:
+            if self.mode:
+                self._move(ev.globalPos())
+            elif not on_handle and self.resizable:
+                self.window.setCursor(CURSORS.get(edge_at(self.window.rect(), ev.pos()), Qt.ArrowCursor))
+            return on_handle
+        if t==QEvent.MouseButtonRelease and ev.button()==Qt.LeftButton:
+            self._end()
+            return on_handle
+        return False
+
+    def _begin(self, gpos, mode):
+        self.mode = mode
+        self.dragged = False
+        self.press_pos = gpos
+        self.start_geo = self.window.geometry()
+
+    def _move(self, gpos):
+        self.events_in += 1; TOTALS["events_in"] += 1
+        d = gpos - self.press_pos
+        if not self.dragged and d.manhattanLength() <= self.threshold:
+            return
+        self.dragged = True
+        if self.mode=="move":
+            self.pending = self.start_geo.topLeft() + d
+        else:
+            self.pending = resized(self.start_geo, self.mode, d.x(), d.y())
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def _apply(self):
+        p, self.pending = self.pending, None
+        if p is None:
+            return
+        self.updates_out += 1; TOTALS["updates_out"] += 1
+        if isinstance(p, QRect):
+            self.window.setGeometry(p)
+        else:
+            self.window.move(p)
+
+    def _end(self):
+        if self.mode is None:
+            return
+        self.timer.stop()
+        self._apply()       # 最后一个位置立即生效
+        mode, self.mode = self.mode, None
+        if self.resizable:
+            self.window.setCursor(Qt.ArrowCursor)
+        if self.dragged:
+            self.finished.emit(mode)
+
+    def stats(self):
+        return {"events_in": self.events_in, "updates_out": self.updates_out}
@@ -0,0 +1,82 @@
+# WindowPool.py —— 预热窗口池：空闲时预先构造隐藏的便签 / 待办窗口，点击时直接取用
+import os, time
+from collections import deque
+from PyQt5.QtCore import QObject, QTimer, QEvent
+
+POOL_SIZE = int(os.environ.get("STICKYNOTES_POOL_SIZE", "2"))
+WARMUP_DELAY = 500     # 启动后多久开始预热（毫秒）
+REFILL_DELAY = 300     # 取走后多久开始补充，避开新窗口的首帧
+PAINT_SAMPLES = 256    # 首帧耗时只留最近这些次算中位数，长时间运行也不涨内存
+
+class _FirstPaint(QObject):
+    # 记录从点击到窗口第一次绘制的耗时
+    def __init__(self, pool, t0):
+        super().__init__()
+        self.pool, self.t0 = pool, t0
+
+    def eventFilter(self, obj, ev):
+        if ev.type()==QEvent.Paint:
+            self.pool._painted((time.perf_counter()-self.t0)*1000)
+            obj.removeEventFilter(self)
+            self.pool._probes.discard(self)
+        return False
+
+
+class WindowPool(QObject):
+    # factories: {"note": 构造隐藏窗口的函数, ...}；窗口须提供 apply_theme()
+    def __init__(self, factories, size=POOL_SIZE, parent=None):
+        super().__init__(parent)
+        self.factories = factories
+        self.size = max(0, size)
+        self.free = {k: [] for k in factories}
+        self.hits = 0; self.misses = 0
+        self.paint_ms = deque(maxlen=PAINT_SAMPLES)
+        self.paint_count = 0; self.paint_max = 0.0
+        self._probes = set()
+        self.timer = QTimer(self)
+        self.timer.setInterval(0)       # 每轮事件循环只造一个，不卡界面
+        self.timer.timeout.connect(self._build_one)
+
+    def start(self, delay=WARMUP_DELAY):
+        if self.size:
+            QTimer.singleShot(delay, self.timer.start)
+
+    def _build_one(self):
+        for kind, lst in self.free.items():
+            if len(lst) < self.size:
+                lst.append(self.factories[kind]())
+                return
+        self.timer.stop()
+
+    def acquire(self, kind, theme=None, t_click=None):
+        t0 = t_click if t_click is not None else time.perf_counter()
+        lst = self.free[kind]
+        if lst:
+            w = lst.pop(); self.hits += 1
+            if theme is not None:
+                w.apply_theme(theme)
+        else:
+            w = self.factories[kind](); self.misses += 1
+        probe = _FirstPaint(self, t0)
+        self._probes.add(probe)
+        w.installEventFilter(probe)
+        w.show(); w.raise_(); w.activateWindow()
+        if self.size and not self.timer.isActive():
+            QTimer.singleShot(REFILL_DELAY, self.timer.start)
+        return w
+
+    def _painted(self, ms):
+        self.paint_ms.append(ms)
+        self.paint_count += 1
+        self.paint_max = max(self.paint_max, ms)
+
+    def stats(self):
+        p = sorted(self.paint_ms)
+        return {
+            "size": self.size,
+            "ready": {k: len(v) for k, v in self.free.items()},
+            "hits": self.hits, "misses": self.misses,
+            "first_paint_ms_p50": p[len(p)//2] if p else None,
+            "first_paint_ms_max": self.paint_max if p else None,
+            "first_paints": self.paint_count,
+        }
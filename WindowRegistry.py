@@ -0,0 +1,145 @@
+# WindowRegistry.py —— 窗口生命周期管理：关闭即释放，最小化过多时收起到磁盘
+import os, weakref
+from collections import OrderedDict
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QObject, QEvent, QRect, Qt, pyqtSignal
+
+MAX_MINIMIZED = int(os.environ.get("STICKYNOTES_MAX_MINIMIZED", "8"))
+
+def _rss_bytes():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class WindowRegistry(QObject):
+    # 打开中的窗口持有强引用（否则会被回收）；关闭后只留弱引用，用来发现泄漏
+    changed = pyqtSignal()
+
+    def __init__(self, max_minimized=MAX_MINIMIZED, parent=None):
+        super().__init__(parent)
+        self.max_minimized = max_minimized
+        self.live = {}                 # id -> (window, kind)
+        self.minimized = OrderedDict() # id -> window，按最小化先后排序
+        self.suspended = []            # 已收起窗口的恢复信息
+        self.refs = weakref.WeakValueDictionary()   # id -> 窗口（弱引用）
+        self.closed = set()            # 已销毁窗口的 id；对应弱引用仍活着即为泄漏
+        self.closed_total = 0
+
+    def track(self, w, kind=None):
+        key = id(w)
+        if key in self.live:
+            return w
+        kind = kind or type(w).__name__
+        w.setAttribute(Qt.WA_DeleteOnClose)
+        w.installEventFilter(self)
+        w.destroyed.connect(lambda *_, k=key: self._forget(k))
+        self.live[key] = (w, kind)
+        self.refs[key] = w
+        self.changed.emit()
+        return w
+
+    def windows(self, kind=None):
+        return [w for w, k in self.live.values() if kind is None or k==kind]
+
+    def _forget(self, key):
+        item = self.live.pop(key, None)
+        self.minimized.pop(key, None)
+        if item is not None:
+            self.closed.add(key)
+            self.closed_total += 1
+            self.changed.emit()
+
+    def eventFilter(self, obj, ev):
+        t = ev.type()
+        if t==QEvent.WindowStateChange:
+            key = id(obj)
+            if obj.windowState() & Qt.WindowMinimized and hasattr(obj, "suspend"):
+                self.minimized[key] = obj
+                self.minimized.move_to_end(key)
+                self._enforce_cap()
+            else:
+                self.minimized.pop(key, None)
+        return False
+
+    def _enforce_cap(self):
+        while len(self.minimized) > self.max_minimized:
+            _, w = self.minimized.popitem(last=False)
+            self.suspend(w)
+
+    def suspend(self, w):
+        # 内容落盘后关闭窗口，只保留恢复所需的少量信息
+        stub = w.suspend()
+        stub["title"] = w.title_edit.text()
+        self.suspended.append(stub)
+        w.close()
+        self.changed.emit()
+        return stub
+
+    def restore(self, stub):
+        from StickyNotes import StickyNote
+        from TodoList import TodoList
+        from NoteStore import default_repository
+        if stub in self.suspended:
+            self.suspended.remove(stub)
+        cls = TodoList if stub["kind"]=="todo" else StickyNote
+        if stub.get("file_path"):
+            w = cls(stub["file_path"], visible=False)
+        else:
+            w = cls(note_id=stub["note_id"], repo=default_repository(), visible=False)
+        # 收起 / 会话里记的位置比文件里的新；已不在任何屏幕上时沿用窗口自己的居中处理
+        geo = stub.get("geometry")
+        if geo and len(geo)==4 and any(s.availableGeometry().intersects(QRect(*geo))
+                                      for s in QApplication.screens()):
+            w.setGeometry(*geo)
+        w.show(); w.raise_(); w.activateWindow()
+        return self.track(w)
+
+    def diagnostics(self):
+        rss = _rss_bytes()
+        per = []
+        for w, kind in self.live.values():
+            per.append({
+                "kind": kind,
+                "title": w.title_edit.text() if hasattr(w, "title_edit") else w.windowTitle(),
+                "visible": w.isVisible(),
+                "minimized": bool(w.windowState() & Qt.WindowMinimized),
+                "qobjects": len(w.findChildren(QObject)),
+                "content_chars": (w.text_edit.document().characterCount()
+                                  if hasattr(w, "text_edit") else None),
+            })
+        self.closed = {k for k in self.closed if k in self.refs and k not in self.live}
+        leaked = self.closed
+        return {
+            "live": len(self.live),
+            "minimized": len(self.minimized),
+            "suspended": len(self.suspended),
+            "closed_total": self.closed_total,
+            "closed_but_referenced": len(leaked),
+            "rss_bytes": rss,
+            "rss_per_window": rss//len(self.live) if rss and self.live else None,
+            "windows": per,
+        }
+
+    def diagnostics_text(self):
+        d = self.diagnostics()
+        lines = [f"打开窗口：{d['live']}（最小化 {d['minimized']}，已收起 {d['suspended']}）",
+                 f"累计关闭：{d['closed_total']}，关闭后仍被引用：{d['closed_but_referenced']}"]
+        if d["rss_bytes"]:
+            lines.append(f"进程内存：{d['rss_bytes']/2**20:.1f} MB，"
+                         f"平均每窗口约 {(d['rss_per_window'] or 0)/2**20:.2f} MB")
+        for w in d["windows"]:
+            lines.append(f"  · {w['kind']} 「{w['title']}」 子对象 {w['qobjects']}"
+                         + (f"，正文 {w['content_chars']} 字" if w["content_chars"] is not None else ""))
+        return "\n".join(lines)
+
+
+_default = None
+
+def default_registry():
+    global _default
+    if _default is None:
+        _default = WindowRegistry(parent=QApplication.instance())
+    return _default
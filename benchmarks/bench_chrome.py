@@ -0,0 +1,79 @@
+# bench_chrome.py —— 窗口外观的绘制 / 缩放微基准（offscreen）
+# 用法：python benchmarks/bench_chrome.py [次数]   默认 2000
+# 对比：每次现算圆角遮罩 / 胶囊路径（旧做法） 与 WindowChrome 缓存
+import os, sys, time
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import Qt, QRect
+from PyQt5.QtGui import QPainter, QPainterPath, QRegion, QColor, QPixmap
+
+import WindowChrome
+from WindowChrome import rounded_region, capsule_pixmap
+
+def old_mask(w, h, r):
+    path = QPainterPath()
+    path.addRoundedRect(0,0,w,h,r,r)
+    return QRegion(path.toFillPolygon().toPolygon())
+
+def old_capsule(p, w, h, r, left):
+    p.setRenderHint(QPainter.Antialiasing)
+    path = QPainterPath()
+    path.addRoundedRect(0,0,w,h,r,r)
+    p.fillPath(path, QColor("#f5f5f5"))
+    lr = QRect(0,0,w//2,h)
+    cp = QPainterPath()
+    cp.moveTo(lr.right(),0)
+    cp.lineTo(lr.x()+r,0)
+    cp.quadTo(lr.x(),0,lr.x(),r)
+    cp.lineTo(lr.x(),lr.bottom()-r)
+    cp.quadTo(lr.x(),lr.bottom(),lr.x()+r,lr.bottom())
+    cp.lineTo(lr.right(),lr.bottom())
+    cp.closeSubpath()
+    p.fillPath(cp, QColor(left))
+
+def timed(fn, n):
+    t0 = time.perf_counter()
+    for i in range(n):
+        fn(i)
+    return (time.perf_counter()-t0)/n*1e6
+
+def resize_sizes(i):
+    # 模拟来回拖动边缘：宽度在 40 个值之间往返
+    k = i % 80
+    return 300 + (k if k < 40 else 80-k)*3, 400
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv)>1 else 2000
+    app = QApplication(sys.argv[:1])
+    rows = []
+
+    rows.append(("mask  uncached", timed(lambda i: old_mask(*resize_sizes(i), 16), n)))
+    rows.append(("mask  cached",   timed(lambda i: rounded_region(*resize_sizes(i), 16), n)))
+
+    target = QPixmap(160, 60); target.fill(Qt.transparent)
+    def paint_old(i):
+        p = QPainter(target); old_capsule(p, 160, 60, 30, "#e3f2fd"); p.end()
+    def paint_new(i):
+        p = QPainter(target); p.drawPixmap(0, 0, capsule_pixmap(160, 60, 30, "#f5f5f5", "#e3f2fd")); p.end()
+    rows.append(("capsule paint  uncached", timed(paint_old, n)))
+    rows.append(("capsule paint  cached",   timed(paint_new, n)))
+
+    # 整窗缩放：TodoList 在 mask / translucent 两种模式下的 resize 开销
+    from TodoList import TodoList
+    for mode in ("mask", "translucent"):
+        WindowChrome._use_mask = mode=="mask"
+        w = TodoList(); w.show(); app.processEvents()
+        m = max(1, n//10)
+        def step(i):
+            w.resize(*resize_sizes(i)); app.processEvents()
+        rows.append((f"TodoList resize  {mode}", timed(step, m)))
+        w.hide(); w.deleteLater(); app.processEvents()
+
+    for name, us in rows:
+        print(f"{name:<28}{us:>10.1f} us/op")
+    print(WindowChrome.stats())
+
+if __name__=="__main__":
+    main()
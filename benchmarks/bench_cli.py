@@ -0,0 +1,42 @@
+# bench_cli.py —— NotesCLI 批量导出：单进程 vs 进程池的耗时与峰值内存
+# 用法：python benchmarks/bench_cli.py [数量] [格式]   默认 100000 jsonl
+# 每次运行都是独立子进程，峰值 RSS 取所有子进程（含进程池工作进程）中的最大值
+import os, sys, time, random, tempfile, subprocess, resource
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from NoteFormat import write_note_file
+
+def populate(d, n):
+    for i in range(n):
+        sub = os.path.join(d, f"{i//1000:03d}")
+        if i % 1000 == 0:
+            os.makedirs(sub, exist_ok=True)
+        write_note_file(os.path.join(sub, f"{i}.sn"),
+                        {"title": f"便签 {i}", "content": "今天要做的事情\n" * random.randint(5, 200),
+                         "geometry": [100, 100, 300, 200]}, fmt="v2" if i % 2 else "json")
+
+def run(args):
+    t0 = time.perf_counter()
+    subprocess.run([sys.executable, os.path.join(ROOT, "NotesCLI.py")] + args,
+                   check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter()-t0
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv)>1 else 100000
+    fmt = sys.argv[2] if len(sys.argv)>2 else "jsonl"
+    root = tempfile.mkdtemp(prefix="sn-cli-")
+    src = os.path.join(root, "notes")
+    t0 = time.perf_counter(); populate(src, n)
+    print(f"generated {n} notes in {time.perf_counter()-t0:.1f} s")
+    cores = os.cpu_count() or 1
+    for jobs in sorted({1, cores}):
+        dest = os.path.join(root, f"out{jobs}" + (".jsonl" if fmt=="jsonl" else ""))
+        dt = run(["export", src, dest, "--to", fmt, "-j", str(jobs), "-q"])
+        rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+        print(f"export --to {fmt:<6} -j {jobs:<3} {dt:8.2f} s  {n/dt:9.0f} notes/s  peak RSS so far {rss:.0f} MB")
+    dt = run(["validate", src, "-j", str(cores), "-q"])
+    print(f"validate          -j {cores:<3} {dt:8.2f} s  {n/dt:9.0f} notes/s")
+
+if __name__=="__main__":
+    main()
@@ -0,0 +1,59 @@
+# bench_history.py —— 修订历史：存储开销与还原耗时
+# 用法：python benchmarks/bench_history.py [修订数] [初始字数]   默认 10000 8000
+# 模拟一天里反复编辑同一便签：每次自动保存前在随机位置插入 / 删除 / 改几个字
+import os, sys, time, random, tempfile, statistics
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import NoteHistory
+from NoteHistory import NoteHistory as History
+
+WORDS = ["今天", "要做", "的事情", " milk", " 会议", "\n", "。", "TODO ", "记得"]
+
+def edit(text):
+    k = random.randrange(len(text)+1)
+    r = random.random()
+    if r < 0.6:
+        return text[:k] + "".join(random.choices(WORDS, k=random.randint(1, 4))) + text[k:]
+    if r < 0.85:
+        return text[:k] + text[k+random.randint(1, 20):]
+    return text[:k] + random.choice(WORDS) + text[k+random.randint(1, 6):]
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv)>1 else 10000
+    size = int(sys.argv[2]) if len(sys.argv)>2 else 8000
+    NoteHistory.MAX_REVISIONS = max(NoteHistory.MAX_REVISIONS, n)
+    path = os.path.join(tempfile.mkdtemp(prefix="sn-hist-"), "bench.snh")
+    h = History(path, "file:bench")
+    text = "".join(random.choices(WORDS, k=size//3))
+    full_bytes = 0; rec_t = []; times = []
+    t = 1_700_000_000.0
+    while len(h) < n:
+        text = edit(text); t += random.uniform(1, 30)
+        t0 = time.perf_counter()
+        if h.record(text, "便签", t):
+            rec_t.append(time.perf_counter()-t0); times.append(t)
+            full_bytes += len(text.encode("utf-8"))
+    size_hist = os.path.getsize(path)
+
+    t0 = time.perf_counter(); h2 = History(path); t_open = time.perf_counter()-t0
+    sample = random.sample(range(n), min(n, 500))
+    rebuild = []
+    for i in sample:
+        t0 = time.perf_counter(); h2.text(i); rebuild.append(time.perf_counter()-t0)
+    t0 = time.perf_counter()
+    for _ in range(10000):
+        h2.index_at(random.uniform(times[0], times[-1]))
+    t_lookup = (time.perf_counter()-t0)/10000
+    rebuild.sort()
+
+    print(f"revisions             {n}  (final text {len(text)} chars, keyframe every {NoteHistory.KEYFRAME})")
+    print(f"history file          {size_hist/2**20:.2f} MB")
+    print(f"full copies would be  {full_bytes/2**20:.2f} MB  ({full_bytes/size_hist:.1f}x larger)")
+    print(f"record (per save)     avg {statistics.mean(rec_t)*1e6:.0f} us")
+    print(f"open / index scan     {t_open*1000:.1f} ms")
+    print(f"lookup by time        {t_lookup*1e6:.2f} us")
+    print(f"reconstruct revision  p50 {rebuild[len(rebuild)//2]*1000:.2f} ms  "
+          f"p95 {rebuild[int(len(rebuild)*0.95)]*1000:.2f} ms  max {rebuild[-1]*1000:.2f} ms")
+
+if __name__=="__main__":
+    main()
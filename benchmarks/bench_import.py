@@ -0,0 +1,46 @@
+# bench_import.py —— stickycore 的导入耗时，以及确认导入过程不碰 Qt
+# 用法：python benchmarks/bench_import.py [次数]   默认 20
+# 每次都在全新的解释器里测，取中位数；对照组是 import PyQt5.QtWidgets + 创建 QApplication
+import os, sys, json, subprocess, statistics
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CASES = {
+    "python (空)": "pass",
+    "import stickycore": "import stickycore",
+    "stickycore.open_note": "import stickycore; stickycore.open_note",
+    "stickycore.open_todos": "import stickycore; stickycore.open_todos",
+    "stickycore.get_theme": "import stickycore; stickycore.get_theme",
+    "PyQt5 + QApplication": "import PyQt5.QtWidgets as w; w.QApplication([])",
+}
+
+PROBE = """
+import sys, time, json
+t0 = time.perf_counter()
+{stmt}
+dt = time.perf_counter()-t0
+print(json.dumps({{"ms": dt*1000, "qt": any(m.startswith("PyQt5") for m in sys.modules),
+                   "modules": len(sys.modules)}}))
+"""
+
+def measure(stmt):
+    out = subprocess.run([sys.executable, "-c", PROBE.format(stmt=stmt)], cwd=ROOT,
+                         capture_output=True, text=True, env=dict(os.environ, PYTHONPATH=ROOT))
+    if out.returncode:
+        return None
+    return json.loads(out.stdout)
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv)>1 else 20
+    print(f"{'':<26}{'p50 ms':>9}{'min ms':>9}{'模块数':>8}  Qt")
+    for name, stmt in CASES.items():
+        runs = [measure(stmt) for _ in range(n)]
+        if None in runs:
+            print(f"{name:<26}{'不可用':>9}"); continue
+        ms = [r["ms"] for r in runs]
+        print(f"{name:<26}{statistics.median(ms):>9.2f}{min(ms):>9.2f}{runs[0]['modules']:>8}  "
+              f"{'是' if runs[0]['qt'] else '否'}")
+        if name.startswith("stickycore") or name=="import stickycore":
+            assert not runs[0]["qt"], f"{name} 导入了 PyQt5"
+
+if __name__=="__main__":
+    main()
@@ -0,0 +1,59 @@
+# bench_large_note.py —— 超大便签：整体加载 vs 分块加载的总耗时与首帧时间（offscreen）
+# 用法：python benchmarks/bench_large_note.py [MB ...]   默认 1 10 100
+# "首帧" 指编辑区第一次绘制；整体加载时它要等 setPlainText 全部完成
+import os, sys, time, tempfile
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ["STICKYNOTES_HOME"] = tempfile.mkdtemp(prefix="sn-bench-")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QObject, QEvent
+
+import NoteLoader
+from NoteFormat import write_note_file
+from StickyNotes import StickyNote
+
+class FirstPaint(QObject):
+    def __init__(self):
+        super().__init__(); self.t = None
+    def eventFilter(self, obj, ev):
+        if ev.type()==QEvent.Paint and self.t is None:
+            self.t = time.perf_counter()
+        return False
+
+def make_file(mb, d):
+    path = os.path.join(d, f"{mb}MB.sn")
+    line = "今天要做的事情 — remember the milk 1234567890\n"
+    n = mb * 2**20 // len(line.encode("utf-8"))
+    write_note_file(path, {"title": f"{mb} MB", "content": line*n, "geometry": [100,100,300,200]})
+    return path
+
+def run(path, chunked, app):
+    NoteLoader.LARGE_NOTE_BYTES = 1 << 20 if chunked else 1 << 62
+    probe = FirstPaint()
+    t0 = time.perf_counter()
+    w = StickyNote(path, visible=False)
+    w.text_edit.viewport().installEventFilter(probe)
+    w.show()
+    while probe.t is None or w.loader is not None:
+        app.processEvents()
+    total = time.perf_counter()-t0
+    first = probe.t-t0
+    kind = type(w.text_edit).__name__
+    w.autosaver.timer.stop(); w.hide(); w.deleteLater(); app.processEvents()
+    return total, first, kind
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or [1, 10, 100]
+    app = QApplication(sys.argv[:1])
+    d = tempfile.mkdtemp(prefix="sn-large-")
+    print(f"{'size':>6}  {'mode':<8}{'editor':<16}{'total(s)':>10}{'first paint(s)':>16}")
+    for mb in sizes:
+        path = make_file(mb, d)
+        for chunked in (False, True):
+            total, first, kind = run(path, chunked, app)
+            print(f"{mb:>4}MB  {'chunked' if chunked else 'whole':<8}{kind:<16}{total:>10.3f}{first:>16.3f}")
+        os.remove(path)
+
+if __name__=="__main__":
+    main()
@@ -0,0 +1,92 @@
+# bench_markdown.py —— Markdown 模式的按键延迟：10k 行便签上逐字输入
+#   每次按键 = 在光标处插入一个字符 + 处理事件（高亮在这里完成），记录 p50 / p95 / max
+#   对照组："每次按键整篇重新渲染"（setMarkdown / render_html），即不做增量时的代价
+#   另测：开 / 关 ``` 代码块（后面所有段的状态都会变，是增量高亮的最坏情况）与预览的一次渲染
+# 用法：python benchmarks/bench_markdown.py [行数] [按键数]   默认 10000 200
+import os, sys, time, statistics
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication, QTextEdit, QPlainTextEdit
+from PyQt5.QtGui import QTextCursor, QTextDocument
+from Markdown import MarkdownHighlighter, MarkdownPreview, scan_line, render_html
+from Theme import random_theme
+
+def make_note(lines):
+    out = []
+    for i in range(lines):
+        if i % 100 == 0: out.append(f"## 第 {i//100} 节")
+        elif i % 37 == 0: out.append("```")
+        elif i % 7 == 0: out.append(f"- [ ] 待办 **重要** 第 {i} 行 `code` https://example.com/{i}")
+        else: out.append(f"普通文字 *强调* 第 {i} 行，还有 [链接](http://x/{i})")
+    if out.count("```") % 2:
+        out.append("```")
+    return "\n".join(out)
+
+def pct(xs, q):
+    xs = sorted(xs)
+    return xs[min(len(xs)-1, int(len(xs)*q))]*1000
+
+def keystrokes(app, ed, n, where):
+    cur = ed.textCursor()
+    doc = ed.document()
+    times = []
+    for i in range(n):
+        if where=="end":
+            cur.movePosition(QTextCursor.End)
+        elif where=="middle":
+            cur.setPosition(doc.characterCount()//2)
+        else:
+            cur.movePosition(QTextCursor.Start)
+        ed.setTextCursor(cur)
+        t0 = time.perf_counter()
+        ed.insertPlainText("字")
+        app.processEvents()
+        times.append(time.perf_counter()-t0)
+    return times
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv)>1 else 10000
+    n = int(sys.argv[2]) if len(sys.argv)>2 else 200
+    app = QApplication([])
+    text = make_note(lines)
+    theme = random_theme()
+
+    t0 = time.perf_counter()
+    for line in text.splitlines():
+        scan_line(line)
+    print(f"scan_line 全部 {lines} 行: {(time.perf_counter()-t0)*1000:.1f} ms（纯 Python，不含 Qt 排版）")
+    print(f"{'编辑器':<15}{'位置':<8}{'p50 ms':>9}{'p95 ms':>9}{'max ms':>9}{'段/键':>8}")
+    for cls in (QTextEdit, QPlainTextEdit):
+        ed = cls(); ed.resize(320, 480); ed.setPlainText(text); ed.show()
+        hl = MarkdownHighlighter(ed.document(), theme)
+        app.processEvents()
+        for where in ("start", "middle", "end"):
+            b0 = hl.blocks
+            ts = keystrokes(app, ed, n, where)
+            print(f"{cls.__name__:<15}{where:<8}{pct(ts,.5):>9.3f}{pct(ts,.95):>9.3f}{max(ts)*1000:>9.2f}"
+                  f"{(hl.blocks-b0)/n:>8.1f}")
+        # 最坏情况：在开头插入 / 删除一个 ```，其后所有段状态翻转
+        cur = ed.textCursor(); cur.movePosition(QTextCursor.Start); ed.setTextCursor(cur)
+        b0 = hl.blocks; t0 = time.perf_counter()
+        ed.insertPlainText("```\n"); app.processEvents()
+        print(f"{cls.__name__:<15}{'开代码块':<8}{(time.perf_counter()-t0)*1000:>9.1f} ms，重扫 {hl.blocks-b0} 段")
+        ed.close()
+
+    ed = QTextEdit(); ed.setPlainText(text)
+    pv = MarkdownPreview(ed); pv.resize(320, 480); pv.show(); app.processEvents()
+    print(f"预览渲染一次: {pv.render_ms:.1f} ms（空闲 {pv.timer.interval()} ms 后才做，输入时不渲染）")
+    naive = []
+    doc = QTextDocument()
+    for _ in range(5):
+        t0 = time.perf_counter()
+        if hasattr(doc, "setMarkdown"):
+            doc.setMarkdown(text)
+        else:
+            doc.setHtml(render_html(text))
+        naive.append(time.perf_counter()-t0)
+    print(f"对照：每次按键整篇渲染 p50 {statistics.median(naive)*1000:.1f} ms")
+
+if __name__=="__main__":
+    main()
@@ -0,0 +1,81 @@
+# bench_reminders.py —— 待办提醒调度：ReminderQueue（最小堆 + 惰性删除）
+#   1) N 条 schedule、再全部改期一次、再取消一半：每步耗时与堆大小（看惰性删除的记录会不会堆积）
+#   2) 每次改期后取最早时间：堆 vs 每次在字典里线性找最小（规模 10000，线性做法是 O(n²)）
+#   3) 到期弹出：一次 pop_due 取出一万条
+#   4) 装了 PyQt5 时：ReminderService 对 N 条提醒只用一个 QTimer，统计上弦次数
+# 用法：python benchmarks/bench_reminders.py [数量]   默认 100000
+import os, sys, time, random
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from ReminderQueue import ReminderQueue
+
+def timed(label, fn, n):
+    t0 = time.perf_counter()
+    fn()
+    dt = time.perf_counter()-t0
+    print(f"{label:<34}{dt*1000:>9.1f} ms{dt/n*1e6:>9.2f} µs/次")
+    return dt
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv)>1 else 100000
+    rnd = random.Random(1)
+    now = time.time()
+    keys = [("bench.snt", i) for i in range(n)]
+    q = ReminderQueue()
+
+    timed(f"schedule × {n}", lambda: [q.schedule(k, now + rnd.uniform(60, 30*86400)) for k in keys], n)
+    print(f"    堆 {len(q.heap)} 条，有效 {len(q)} 条")
+    timed(f"reschedule × {n}", lambda: [q.schedule(k, now + rnd.uniform(60, 30*86400)) for k in keys], n)
+    print(f"    堆 {len(q.heap)} 条，有效 {len(q)} 条")
+    half = keys[::2]
+    timed(f"cancel × {len(half)}", lambda: [q.cancel(k) for k in half], len(half))
+    print(f"    堆 {len(q.heap)} 条，有效 {len(q)} 条")
+    timed("next_time（清掉堆顶作废记录）", q.next_time, 1)
+    timed("upcoming(8)", lambda: q.upcoming(8), 1)
+
+    m = min(n, 10000)
+    q2, plain = ReminderQueue(), {}
+    for i in range(m):
+        t = now + rnd.uniform(60, 86400)
+        q2.schedule(i, t); plain[i] = t
+    order = [rnd.randrange(m) for _ in range(m)]
+    timed(f"改期+取最早 × {m}（堆）",
+          lambda: [(q2.schedule(i, now + rnd.uniform(60, 86400)), q2.next_time()) for i in order], m)
+    timed(f"改期+取最早 × {m}（线性找最小）",
+          lambda: [(plain.__setitem__(i, now + rnd.uniform(60, 86400)), min(plain.values())) for i in order], m)
+
+    due = ReminderQueue()
+    for i in range(m):
+        due.schedule(i, now - rnd.uniform(0, 3600))
+    out = []
+    timed(f"pop_due 取出 {m} 条", lambda: out.extend(due.pop_due(now)), m)
+    assert len(out)==m and all(a[1] <= b[1] for a, b in zip(out, out[1:]))
+
+    try:
+        from PyQt5.QtWidgets import QApplication
+    except ImportError:
+        print("未安装 PyQt5，跳过 ReminderService 部分")
+        return
+    from Reminders import ReminderService
+    app = QApplication([])
+    svc = ReminderService()
+    t0 = time.perf_counter()
+    for i in range(n):
+        svc.set("bench.snt", i, now + rnd.uniform(60, 30*86400), {"text": f"待办 {i}"})
+    dt = time.perf_counter()-t0
+    print(f"ReminderService.set × {n}: {dt*1000:.1f} ms，QTimer 上弦 {svc.stats['armed']} 次，"
+          f"间隔 {svc.timer.interval()} ms")
+    fired = []
+    svc.due.connect(fired.append)
+    for i in range(100):
+        svc.set("bench.snt", i, time.time() - 1, {"text": f"待办 {i}"})
+    t0 = time.perf_counter()
+    end = t0 + 5
+    while len(fired) < 100 and time.perf_counter() < end:
+        app.processEvents(); time.sleep(0.001)
+    print(f"100 条到期 → 弹出 {len(fired)} 条，用时 {(time.perf_counter()-t0)*1000:.1f} ms；统计 {svc.stats}")
+
+if __name__ == "__main__":
+    main()
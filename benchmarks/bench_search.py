@@ -0,0 +1,44 @@
+# bench_search.py —— 全文索引：建索引、增量更新、查询、保存/加载耗时
+# 用法：python benchmarks/bench_search.py [文档数]   默认 100000
+import os, sys, time, random, tempfile
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from NoteSearch import SearchIndex
+
+ZH = "今天明天开会超市牛奶面包作业复习项目计划周报邮件电话医院银行快递生日礼物旅行机票酒店"
+EN = "meeting report budget milk bread travel hotel email review plan deadline invoice".split()
+
+def make_doc(rnd):
+    zh = "".join(rnd.choice(ZH) for _ in range(rnd.randint(10, 60)))
+    en = " ".join(rnd.choice(EN) for _ in range(rnd.randint(2, 10)))
+    return zh + " " + en
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv)>1 else 100000
+    rnd = random.Random(1)
+    idx = SearchIndex()
+    t0 = time.perf_counter()
+    for i in range(n):
+        idx.update(f"note:{i}", make_doc(rnd), f"便签{i}", mtime=i)
+    print(f"build {n} docs: {time.perf_counter()-t0:.2f} s")
+
+    t0 = time.perf_counter()
+    for i in range(1000):
+        idx.update(f"note:{rnd.randrange(n)}", make_doc(rnd), "edited")
+    print(f"incremental update: {(time.perf_counter()-t0):.3f} ms/edit")
+
+    for q in ("超市", "牛奶面包", "bud*", "\"milk bread\"", "会议 plan", "旅行机票酒店", "zzz"):
+        reps = 20
+        t0 = time.perf_counter()
+        for _ in range(reps):
+            hits = idx.search(q)
+        print(f"query {q!r:<18} {len(hits):>3} hits  {(time.perf_counter()-t0)/reps*1000:7.2f} ms")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        p = os.path.join(tmp, "search.idx")
+        t0 = time.perf_counter(); idx.save(p); ts = time.perf_counter()-t0
+        t0 = time.perf_counter(); SearchIndex.load(p); tl = time.perf_counter()-t0
+        print(f"save {ts:.2f} s, load {tl:.2f} s, {os.path.getsize(p)/1e6:.1f} MB")
+
+if __name__=="__main__":
+    main()
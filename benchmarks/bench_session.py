@@ -0,0 +1,62 @@
+# bench_session.py —— 工作区恢复：第一个窗口与全部可见窗口的耗时（offscreen）
+# 用法：python benchmarks/bench_session.py [窗口数] [最小化比例]   默认 250 0.2
+import os, sys, time, json, random, tempfile
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ["STICKYNOTES_HOME"] = tempfile.mkdtemp(prefix="sn-bench-")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtWidgets import QApplication
+
+from NoteFormat import write_note_file
+from TodoJournal import TodoJournal
+from WindowRegistry import WindowRegistry
+from Session import restore_session, SESSION_VERSION
+
+def make_workspace(n, minimized, d):
+    entries = []
+    for i in range(n):
+        geo = [random.randint(0, 400), random.randint(0, 300), 300, 200]
+        if i % 3 == 2:
+            path = os.path.join(d, f"todo{i}.snt")
+            j = TodoJournal(path)
+            j.compact([{"text": f"事项 {k}", "done": False} for k in range(20)], f"待办 {i}", geo)
+            j.close()
+            kind = "todo"
+        else:
+            path = os.path.join(d, f"note{i}.sn")
+            write_note_file(path, {"title": f"便签 {i}", "content": "今天要做的事情\n"*50, "geometry": geo})
+            kind = "note"
+        entries.append({"kind": kind, "file_path": path, "note_id": None, "title": f"#{i}",
+                        "geometry": geo, "minimized": random.random() < minimized})
+    path = os.path.join(d, "session.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"version": SESSION_VERSION, "windows": entries}, f)
+    return path
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv)>1 else 250
+    minimized = float(sys.argv[2]) if len(sys.argv)>2 else 0.2
+    app = QApplication(sys.argv[:1])
+    d = tempfile.mkdtemp(prefix="sn-session-")
+    path = make_workspace(n, minimized, d)
+    registry = WindowRegistry(parent=app)
+    done = []
+    t0 = time.perf_counter()
+    r = restore_session(registry, path)
+    r.finished.connect(done.append)
+    while not done:
+        app.processEvents()
+    t_total = time.perf_counter()-t0
+    s = done[0]
+    print(f"saved windows      {s['saved']}")
+    print(f"created (visible)  {s['visible']}")
+    print(f"deferred           {s['deferred']}  (minimized / off-screen)")
+    print(f"first window       {s['first_window_ms']:.1f} ms")
+    print(f"whole workspace    {s['workspace_ms']:.1f} ms  (loop total {t_total*1000:.1f} ms)")
+    stub = registry.suspended[0] if registry.suspended else None
+    if stub:
+        t0 = time.perf_counter(); registry.restore(stub); app.processEvents()
+        print(f"lazy restore of one deferred window  {(time.perf_counter()-t0)*1000:.1f} ms")
+
+if __name__=="__main__":
+    main()
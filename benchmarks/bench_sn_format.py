@@ -0,0 +1,48 @@
+# bench_sn_format.py —— 列出 N 个便签（只要标题和位置）：旧 JSON / 紧凑 JSON / v2 文件头
+# 用法：python benchmarks/bench_sn_format.py [数量]   默认 10000
+import os, sys, json, time, random, tempfile
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from NoteFormat import read_note_file, read_note_header, write_note_file
+
+def make_note(i):
+    return {
+        "title": f"便签 {i}",
+        "content": "今天要做的事情 remember the milk\n" * random.randint(20, 600),
+        "geometry": [100+i%500, 100+i%300, 300, 200],
+    }
+
+def populate(d, n, fmt):
+    os.makedirs(d)
+    for i in range(n):
+        p = os.path.join(d, f"{i}.sn")
+        data = make_note(i)
+        if fmt=="indent2":
+            with open(p, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+        else:
+            write_note_file(p, data, fmt=fmt)
+
+def listing(d, read):
+    t0 = time.perf_counter()
+    out = []
+    for name in os.listdir(d):
+        m = read(os.path.join(d, name))
+        out.append((m.get("title"), m.get("geometry")))
+    return time.perf_counter()-t0, len(out)
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv)>1 else 10000
+    root = tempfile.mkdtemp(prefix="sn-format-")
+    print(f"{'format':<22}{'files':>7}{'size(MB)':>10}{'list(s)':>10}{'per file(us)':>14}")
+    for fmt, read in (("indent2", read_note_file), ("json", read_note_file),
+                      ("v2", read_note_file), ("v2 header", read_note_header)):
+        d = os.path.join(root, fmt.split()[0])
+        if not os.path.isdir(d):
+            populate(d, n, fmt.split()[0])
+        size = sum(os.path.getsize(os.path.join(d, x)) for x in os.listdir(d)) / 2**20
+        dt, k = listing(d, read)
+        print(f"{fmt:<22}{k:>7}{size:>10.1f}{dt:>10.3f}{dt/k*1e6:>14.1f}")
+
+if __name__=="__main__":
+    main()
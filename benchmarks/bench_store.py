@@ -0,0 +1,48 @@
+# bench_store.py —— 对比一便签一文件 (.sn JSON) 与 SQLite 仓库的保存/列表/打开耗时
+# 用法：python benchmarks/bench_store.py [数量 ...]   默认 10 1000 50000
+import os, sys, time, random, tempfile
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from NoteStore import NoteRepository, SqliteBackend, JsonDirBackend
+
+def make_note(i):
+    return {
+        "title": f"便签 {i}",
+        "content": "今天要做的事情 " * random.randint(5, 80),
+        "geometry": [100+i%500, 100+i%300, 300, 200],
+    }
+
+def bench(repo, n):
+    notes = [(NoteRepository.new_id(), make_note(i)) for i in range(n)]
+    t0 = time.perf_counter()
+    repo.backend.put_many([(nid, "note", d, time.time()) for nid, d in notes])
+    t_save = time.perf_counter()-t0
+
+    t0 = time.perf_counter()
+    metas = repo.list()
+    t_list = time.perf_counter()-t0
+    assert len(metas)==n
+
+    sample = random.sample([nid for nid,_ in notes], min(n, 100))
+    t0 = time.perf_counter()
+    for nid in sample:
+        repo.get(nid)
+    t_open = (time.perf_counter()-t0)/len(sample)
+    return t_save, t_list, t_open
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or [10, 1000, 50000]
+    print(f"{'backend':<8}{'n':>8}{'save(s)':>12}{'list(ms)':>12}{'open(ms)':>12}")
+    for n in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            for name, backend in (
+                ("json", JsonDirBackend(os.path.join(tmp, "sn"), fmt="json")),   # 基线固定为 JSON
+                ("sqlite", SqliteBackend(os.path.join(tmp, "notes.db"))),
+            ):
+                repo = NoteRepository(backend)
+                s, l, o = bench(repo, n)
+                repo.close()
+                print(f"{name:<8}{n:>8}{s:>12.3f}{l*1000:>12.2f}{o*1000:>12.3f}")
+
+if __name__=="__main__":
+    main()
@@ -0,0 +1,57 @@
+# bench_sync.py —— NoteSync 增量同步：首轮全量、无变化、少量变化，以及哈希线程数的影响
+# 用法：python benchmarks/bench_sync.py [数量] [改动比例]   默认 100000 0.01
+# "远端"是临时目录里的另一个本地目录；清单放在临时目录，不碰 ~/.stickynotes
+import os, sys, time, random, tempfile
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from NoteFormat import write_note_file
+from NoteSync import SyncEngine
+
+def populate(d, n):
+    for i in range(n):
+        sub = os.path.join(d, f"{i//1000:03d}")
+        if i % 1000 == 0:
+            os.makedirs(sub, exist_ok=True)
+        write_note_file(os.path.join(sub, f"{i}.sn"),
+                        {"title": f"便签 {i}", "content": "今天要做的事情\n" * random.randint(5, 200)},
+                        fmt="v2" if i % 2 else "json")
+
+def run(tag, local, remote, state, jobs=None, dry_run=False):
+    eng = SyncEngine(local, remote, state=state, jobs=jobs)
+    r = eng.run(dry_run=dry_run)
+    t = r["times"]
+    acts = ", ".join(f"{k} {v}" for k, v in sorted(r["actions"].items())) or "-"
+    print(f"{tag:<28}{t['total_s']:>9.2f}{t['local_scan_s']:>9.2f}{t['remote_scan_s']:>9.2f}"
+          f"{t['local_hashed']+t['remote_hashed']:>9}  {acts}")
+    return r
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv)>1 else 100000
+    frac = float(sys.argv[2]) if len(sys.argv)>2 else 0.01
+    root = tempfile.mkdtemp(prefix="sn-sync-")
+    local, remote = os.path.join(root, "local"), os.path.join(root, "remote")
+    t0 = time.perf_counter(); populate(local, n)
+    print(f"生成 {n} 个便签 {time.perf_counter()-t0:.1f} s，{os.cpu_count()} 核")
+    print(f"{'':<28}{'总计 s':>9}{'本地 s':>9}{'远端 s':>9}{'哈希数':>9}  动作")
+
+    state = os.path.join(root, "state.json")
+    run("首轮同步", local, remote, state)
+    # 没有清单时两边都要全量哈希；dry-run 只比较哈希这一步
+    run("全量哈希（单线程）", local, remote, os.path.join(root, "s1.json"), jobs=1, dry_run=True)
+    run("全量哈希（线程池）", local, remote, os.path.join(root, "s2.json"), dry_run=True)
+    run("无变化", local, remote, state)
+
+    files = sorted(os.path.join(dp, f) for dp, _, fs in os.walk(local) for f in fs)
+    k = max(1, int(len(files)*frac))
+    for p in random.sample(files, k):
+        write_note_file(p, {"title": "本地改", "content": "改过的内容\n"})
+    rfiles = sorted(os.path.join(dp, f) for dp, _, fs in os.walk(remote) for f in fs)
+    for p in random.sample(rfiles, k//2):
+        write_note_file(p, {"title": "远端改", "content": "远端改过\n"})
+    run(f"本地改 {k}、远端改 {k//2}", local, remote, state)
+    run("再次（推送冲突副本）", local, remote, state)
+    run("再次（应无变化）", local, remote, state)
+
+if __name__=="__main__":
+    main()
@@ -0,0 +1,50 @@
+# bench_todo.py —— TodoList 控件模式 vs 虚拟化模式：创建耗时与 RSS
+# 用法：python benchmarks/bench_todo.py [数量 ...]   默认 100 10000 100000
+# 每个组合在独立子进程中运行，RSS 互不干扰；控件模式超过 20000 条默认跳过
+import os, sys, time, json, subprocess
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+WIDGET_LIMIT = 20000
+
+def rss_mb():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+def child(mode, n):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtWidgets import QApplication
+    from TodoList import TodoList
+    app = QApplication([])
+    items = [{"text": f"待办事项 {i}", "done": i%3==0} for i in range(n)]
+    base = rss_mb()
+    t0 = time.perf_counter()
+    w = TodoList(virtual=(mode=="virtual"))
+    w.set_items(items)
+    app.processEvents()
+    t_create = time.perf_counter()-t0
+    t0 = time.perf_counter()
+    bar = (w.view if w.virtual else w.scroll).verticalScrollBar()
+    for v in range(0, bar.maximum()+1, max(1, bar.maximum()//50)):
+        bar.setValue(v); w.repaint()
+    t_scroll = time.perf_counter()-t0
+    print(json.dumps({"mode": mode, "n": n, "create_s": t_create,
+                      "scroll_s": t_scroll, "rss_mb": rss_mb()-base}))
+
+def main():
+    if len(sys.argv)>1 and sys.argv[1]=="--child":
+        child(sys.argv[2], int(sys.argv[3])); return
+    sizes = [int(a) for a in sys.argv[1:]] or [100, 10000, 100000]
+    print(f"{'mode':<8}{'n':>8}{'create(s)':>12}{'scroll(s)':>12}{'RSS(MB)':>10}")
+    for n in sizes:
+        for mode in ("widgets", "virtual"):
+            if mode=="widgets" and n>WIDGET_LIMIT:
+                print(f"{mode:<8}{n:>8}{'skipped':>12}"); continue
+            out = subprocess.run([sys.executable, __file__, "--child", mode, str(n)],
+                                 capture_output=True, text=True, cwd=ROOT)
+            if out.returncode:
+                print(out.stderr); continue
+            r = json.loads(out.stdout.strip().splitlines()[-1])
+            print(f"{mode:<8}{n:>8}{r['create_s']:>12.3f}{r['scroll_s']:>12.3f}{r['rss_mb']:>10.1f}")
+
+if __name__=="__main__":
+    main()
@@ -0,0 +1,74 @@
+# bench_todo_bulk.py —— TodoList 批量操作耗时：多行粘贴、排序、移动整段、清除已完成
+# 用法：python benchmarks/bench_todo_bulk.py [数量 ...]   默认 1000 10000
+# 每个 (模式, 数量) 在独立子进程中运行，带 .snt 日志（计入写盘）；
+# "逐条添加" 是对照组：循环调用 add_todo_item 再填文字，即改动前粘贴一份清单的做法
+import os, sys, time, json, random, tempfile, subprocess
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+BASELINE_LIMIT = 10000
+MOVES = 100
+
+def child(mode, n):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtWidgets import QApplication
+    from TodoList import TodoList
+    from TodoJournal import TodoJournal
+    app = QApplication([])
+    d = tempfile.mkdtemp(prefix="snt-bulk-")
+    text = "\n".join(f"- [{'x' if i%3==0 else ' '}] 待办事项 {random.randint(0, n)}" for i in range(n))
+    out = {"mode": mode, "n": n}
+
+    def timed(name, fn):
+        t0 = time.perf_counter()
+        fn(); app.processEvents()
+        out[name] = time.perf_counter()-t0
+
+    def fresh(tag):
+        path = os.path.join(d, f"{tag}.snt")
+        TodoJournal(path).compact([])
+        w = TodoList(file_path=path, virtual=(mode=="virtual"))
+        app.processEvents()
+        return w
+
+    if n <= BASELINE_LIMIT:
+        w = fresh("baseline")
+        def one_by_one():
+            for i, line in enumerate(text.splitlines()):
+                if w.virtual:
+                    w.model.setData(w.model.append(), line)
+                else:
+                    w.add_todo_item(); w._rows()[-1].txt.setText(line)
+        timed("one_by_one_s", one_by_one)
+        w.close()
+
+    w = fresh("bulk")
+    timed("paste_s", lambda: w.paste_lines(text))
+    if not w.virtual:
+        timed("materialize_s", w._flush_pending)     # 超出第一批的部分由空闲时物化，这里一次做完计时
+    timed("sort_s", lambda: w.sort_items("text"))
+    blocks = [(random.randint(0, n-50), random.randint(0, n-50)) for _ in range(MOVES)]
+    timed("move_block_s", lambda: [w.move_block(a, 50, b) for a, b in blocks])
+    timed("clear_completed_s", w.clear_completed)
+    out["left"] = w._count()
+    w.close()
+    print(json.dumps(out))
+
+COLS = ("one_by_one_s", "paste_s", "materialize_s", "sort_s", "move_block_s", "clear_completed_s")
+
+def main():
+    if len(sys.argv)>1 and sys.argv[1]=="--child":
+        child(sys.argv[2], int(sys.argv[3])); return
+    sizes = [int(a) for a in sys.argv[1:]] or [1000, 10000]
+    print(f"{'mode':<8}{'n':>7}" + "".join(f"{c[:-2]:>18}" for c in COLS))
+    for n in sizes:
+        for mode in ("widgets", "virtual"):
+            r = subprocess.run([sys.executable, __file__, "--child", mode, str(n)],
+                               capture_output=True, text=True, cwd=ROOT)
+            if r.returncode:
+                print(r.stderr); continue
+            res = json.loads(r.stdout.strip().splitlines()[-1])
+            print(f"{mode:<8}{n:>7}" + "".join(
+                f"{res[c]:>18.3f}" if c in res else f"{'-':>18}" for c in COLS))
+
+if __name__=="__main__":
+    main()
@@ -0,0 +1,73 @@
+# bench_watch.py —— 外部修改的监视与重新载入
+#   1) 监视 N 个 .sn（共用一个 QFileSystemWatcher）的挂载耗时
+#   2) 每个文件连续原子替换 3 次：从最后一次写入到全部回调完成的延迟、回调次数（应为每文件一次）
+#   3) 大便签改一行：apply_text（只替换差异）vs setPlainText（整篇重排）
+# 用法：python benchmarks/bench_watch.py [文件数]   默认 500
+import os, sys, time, tempfile
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication, QTextEdit, QPlainTextEdit
+from NoteFormat import write_note_file
+from NoteWatcher import FileWatcher, apply_text
+
+def wait_until(app, cond, timeout=10.0):
+    end = time.perf_counter()+timeout
+    while not cond() and time.perf_counter() < end:
+        app.processEvents(); time.sleep(0.001)
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv)>1 else 500
+    app = QApplication([])
+    root = tempfile.mkdtemp(prefix="sn-watch-")
+    paths = []
+    for i in range(n):
+        d = os.path.join(root, f"{i//100:02d}")
+        os.makedirs(d, exist_ok=True)
+        p = os.path.join(d, f"{i}.sn")
+        write_note_file(p, {"title": f"便签 {i}", "content": "内容\n"*20})
+        paths.append(p)
+
+    w = FileWatcher()
+    hits = {}
+    cb = lambda p: hits.__setitem__(p, hits.get(p, 0)+1)
+    t0 = time.perf_counter()
+    for p in paths:
+        w.watch(p, cb)
+    print(f"watch {n} 个文件: {(time.perf_counter()-t0)*1000:.1f} ms，"
+          f"监视路径 {len(w.qfw.files())} 个文件 + {len(w.qfw.directories())} 个目录")
+
+    for rnd in range(3):
+        for p in paths:
+            write_note_file(p, {"title": "改", "content": f"外部修改 {rnd}\n"*20})
+    t0 = time.perf_counter()
+    wait_until(app, lambda: len(hits)==n and not w.pending and not w.timer.isActive())
+    print(f"{3*n} 次外部写入 → 回调 {sum(hits.values())} 次（{len(hits)} 个文件），"
+          f"写完到全部回调 {(time.perf_counter()-t0)*1000:.0f} ms（含 {w.timer.interval()} ms 防抖）")
+
+    hits.clear()
+    for p in paths[:50]:
+        write_note_file(p, {"title": "自己", "content": "自己写的\n"})
+        w.mark_written(p)
+    wait_until(app, lambda: not w.pending and not w.timer.isActive(), 2.0)
+    print(f"50 次自己写盘 → 回调 {sum(hits.values())} 次；统计 {w.stats()}")
+
+    for size in (1 << 20, 10 << 20):
+        line = "这是一行便签内容 abc 123\n"
+        text = line * (size // len(line.encode("utf-8")))
+        mid = len(text)//2
+        new = text[:mid] + "外部插入的一行\n" + text[mid:]
+        for cls in (QTextEdit, QPlainTextEdit):
+            ed = cls(); ed.setPlainText(text); ed.resize(400, 600); ed.show(); app.processEvents()
+            t0 = time.perf_counter(); apply_text(ed, new); app.processEvents()
+            t_diff = time.perf_counter()-t0
+            ed.setPlainText(text); app.processEvents()
+            t0 = time.perf_counter(); ed.setPlainText(new); app.processEvents()
+            t_full = time.perf_counter()-t0
+            print(f"{cls.__name__:<15}{size>>20:>3} MB  apply_text {t_diff*1000:8.1f} ms   "
+                  f"setPlainText {t_full*1000:8.1f} ms")
+            ed.close()
+
+if __name__=="__main__":
+    main()
@@ -0,0 +1,33 @@
+# bench_windows.py —— 窗口构造耗时（offscreen）
+# 用法：python benchmarks/bench_windows.py [窗口数]   默认 50
+# 只依赖 StickyNote()/TodoList() 构造函数，可在任意版本上运行以比较前后差异
+import os, sys, time
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtWidgets import QApplication
+from StickyNotes import StickyNote
+from TodoList import TodoList
+
+def bench(cls, n, app):
+    wins = []
+    t0 = time.perf_counter()
+    for _ in range(n):
+        wins.append(cls())
+    app.processEvents()     # 计入样式解析与首次布局
+    dt = time.perf_counter()-t0
+    for w in wins:
+        w.hide(); w.deleteLater()
+    app.processEvents()
+    return dt
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv)>1 else 50
+    app = QApplication(sys.argv[:1])
+    bench(StickyNote, 2, app)     # 预热
+    for cls in (StickyNote, TodoList):
+        dt = bench(cls, n, app)
+        print(f"{cls.__name__:<12}{n:>5} windows  {dt:.3f} s  ({dt/n*1000:.2f} ms/window)")
+
+if __name__=="__main__":
+    main()
@@ -0,0 +1,232 @@
+# suite.py —— 无界面基准套件（offscreen）：窗口构造、便签读写、待办添加、拖动/缩放事件流
+#
+# 用法：
+#   python benchmarks/suite.py                         # 跑全部，结果 JSON 打印到 stdout
+#   python benchmarks/suite.py --out r.json            # 写到文件
+#   python benchmarks/suite.py --save-baseline         # 写入 benchmarks/baseline.json
+#   python benchmarks/suite.py --baseline              # 与 baseline.json 比较，有回退时退出码为 1
+#   python benchmarks/suite.py --quick --only note     # 小规模、只跑名字含 note 的用例
+#
+# 所有指标都是耗时（越小越好），取 --repeat 次的中位数；计数类数据放在 info 里不参与比较。
+import os, sys, time, json, argparse, tempfile, statistics, platform
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+# 隔离数据目录，基准不碰用户的便签库与搜索索引
+os.environ["STICKYNOTES_HOME"] = tempfile.mkdtemp(prefix="sn-bench-")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import Qt, QEvent, QPoint, QPointF, QT_VERSION_STR, PYQT_VERSION_STR
+from PyQt5.QtGui import QMouseEvent
+
+CASES = []
+
+def case(name):
+    def deco(fn):
+        CASES.append((name, fn)); return fn
+    return deco
+
+def now():
+    return time.perf_counter()
+
+# ---------- 窗口构造 ----------
+def _construct(factory, n, app):
+    wins = []
+    t0 = now()
+    for _ in range(n):
+        wins.append(factory())
+    app.processEvents()
+    dt = now()-t0
+    for w in wins:
+        w.hide(); w.deleteLater()
+    app.processEvents()
+    return dt/n*1000
+
+@case("construct.StickyNote")
+def _(ctx):
+    from StickyNotes import StickyNote
+    return {"ms_per_window": _construct(StickyNote, ctx.windows, ctx.app)}
+
+@case("construct.TodoList")
+def _(ctx):
+    from TodoList import TodoList
+    return {"ms_per_window": _construct(TodoList, ctx.windows, ctx.app)}
+
+@case("construct.Launcher")
+def _(ctx):
+    from Launcher import Launcher
+    return {"ms_per_window": _construct(Launcher, ctx.windows, ctx.app)}
+
+# ---------- 便签保存 / 加载 ----------
+LOAD_TIMEOUT = 120
+NOTE_SIZES = [("1KB", 2**10), ("100KB", 100*2**10), ("1MB", 2**20), ("10MB", 10*2**20), ("50MB", 50*2**20)]
+
+def _note_text(size):
+    line = "今天要做的事情 — remember the milk 1234567890\n"
+    return line * max(1, size//len(line.encode("utf-8")))
+
+def _note_case(label, size):
+    def run(ctx):
+        from StickyNotes import StickyNote
+        path = os.path.join(ctx.tmp, f"bench-{label}.sn")
+        w = StickyNote(visible=False)
+        w.text_edit.setPlainText(_note_text(size))
+        t0 = now(); w._save(path); t_save = now()-t0
+        w.deleteLater()
+        r = StickyNote(visible=False)
+        # 超过 LARGE_NOTE_BYTES 的走 ChunkedLoader 异步加载：等 r.loader 清空才算加载完，
+        # 首屏时间由加载器的统计换算（同一时钟，从 t0 算起）
+        t0 = now(); r._load(path); ctx.app.processEvents()
+        while r.loader is not None:
+            if now()-t0 > LOAD_TIMEOUT:
+                raise RuntimeError(f"{label} 便签 {LOAD_TIMEOUT}s 内没有加载完")
+            ctx.app.processEvents()
+        t_load = now()-t0
+        t_first = t_load
+        if r.load_stats and "first_screen" in r.load_stats:
+            t_first = t_load - (r.load_stats["done"]-r.load_stats["first_screen"])/1000
+        r.deleteLater(); ctx.app.processEvents()
+        ctx.info[f"note.{label}.file_bytes"] = os.path.getsize(path)
+        os.remove(path)
+        return {"save_ms": t_save*1000, "first_screen_ms": t_first*1000, "load_ms": t_load*1000}
+    return run
+
+for _label, _size in NOTE_SIZES:
+    case(f"note.{_label}")(_note_case(_label, _size))
+
+# ---------- 待办添加 ----------
+@case("todo.add_todo_item")
+def _(ctx):
+    from TodoList import TodoList
+    w = TodoList(visible=False)
+    n = ctx.todos
+    t0 = now()
+    for _ in range(n):
+        w.add_todo_item()
+    ctx.app.processEvents()
+    dt = now()-t0
+    w.deleteLater(); ctx.app.processEvents()
+    return {"total_ms": dt*1000, "us_per_item": dt/n*1e6}
+
+# ---------- 拖动 / 缩放事件流 ----------
+def _mouse(t, local, glob, buttons):
+    btn = Qt.LeftButton if t!=QEvent.MouseMove else Qt.NoButton
+    return QMouseEvent(t, QPointF(local), QPointF(glob), btn, buttons, Qt.NoModifier)
+
+def _stream(ctx, w, target, local, steps):
+    # 按下 → steps 次移动（每 4 个事件处理一次事件循环，接近真实输入节奏）→ 松开
+    app = ctx.app
+    origin = target.mapToGlobal(local)
+    app.sendEvent(target, _mouse(QEvent.MouseButtonPress, local, origin, Qt.LeftButton))
+    t0 = now()
+    for i in range(1, steps+1):
+        d = QPoint(i % 200, i % 150)
+        app.sendEvent(target, _mouse(QEvent.MouseMove, local+d, origin+d, Qt.LeftButton))
+        if i % 4 == 0:
+            app.processEvents()
+    app.sendEvent(target, _mouse(QEvent.MouseButtonRelease, local, origin, Qt.NoButton))
+    app.processEvents()
+    return (now()-t0)/steps*1e6
+
+def _drag_case(kind, gesture):
+    def run(ctx):
+        if kind=="note":
+            from StickyNotes import StickyNote as cls
+        else:
+            from TodoList import TodoList as cls
+        w = cls(); ctx.app.processEvents()
+        if gesture=="drag":
+            us = _stream(ctx, w, w.title_bar, QPoint(60, 10), ctx.events)
+        else:
+            us = _stream(ctx, w, w, QPoint(w.width()-2, w.height()-2), ctx.events)
+        drag = getattr(w, "drag", None)
+        if drag is not None:
+            ctx.info[f"{kind}.{gesture}.updates_out"] = drag.stats()["updates_out"]
+            ctx.info[f"{kind}.{gesture}.events_in"] = drag.stats()["events_in"]
+        w.hide(); w.deleteLater(); ctx.app.processEvents()
+        return {"us_per_event": us}
+    return run
+
+for _kind in ("note", "todo"):
+    for _g in ("drag", "resize"):
+        case(f"events.{_kind}.{_g}")(_drag_case(_kind, _g))
+
+# ---------- 运行与比较 ----------
+class Context:
+    pass
+
+def run(args):
+    ctx = Context()
+    ctx.app = QApplication.instance() or QApplication(sys.argv[:1])
+    ctx.tmp = tempfile.mkdtemp(prefix="sn-bench-")
+    ctx.windows = 10 if args.quick else 50
+    ctx.todos = 1000 if args.quick else 10000
+    ctx.events = 500 if args.quick else 5000
+    ctx.info = {}
+    results = {}
+    for name, fn in CASES:
+        if args.only and not any(o in name for o in args.only):
+            continue
+        if args.quick and name in ("note.10MB", "note.50MB"):
+            continue
+        samples = [fn(ctx) for _ in range(args.repeat)]
+        for metric in samples[0]:
+            results[f"{name}.{metric}"] = statistics.median(s[metric] for s in samples)
+        print(f"  {name}", file=sys.stderr)
+    return {
+        "meta": {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(), "qt": QT_VERSION_STR, "pyqt": PYQT_VERSION_STR,
+            "platform": platform.platform(), "qpa": ctx.app.platformName(),
+            "quick": args.quick, "repeat": args.repeat,
+        },
+        "results": results,
+        "info": ctx.info,
+    }
+
+def compare(report, baseline, tolerance):
+    # 返回回退的指标列表；只比较两边都有的指标
+    base = baseline["results"]
+    regressions = []
+    print(f"{'metric':<40}{'baseline':>12}{'current':>12}{'change':>9}")
+    for k, v in sorted(report["results"].items()):
+        if k not in base or not base[k]:
+            continue
+        ratio = v/base[k]
+        flag = " !" if ratio > 1+tolerance else ""
+        print(f"{k:<40}{base[k]:>12.3f}{v:>12.3f}{(ratio-1)*100:>8.1f}%{flag}")
+        if flag:
+            regressions.append(k)
+    return regressions
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--out")
+    ap.add_argument("--baseline", nargs="?", const=BASELINE)
+    ap.add_argument("--save-baseline", nargs="?", const=BASELINE)
+    ap.add_argument("--tolerance", type=float, default=0.2, help="允许的变慢比例，默认 0.2")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--quick", action="store_true")
+    ap.add_argument("--only", action="append")
+    args = ap.parse_args()
+
+    report = run(args)
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    elif not args.baseline:
+        print(text)
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            f.write(text)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} regression(s): " + ", ".join(regressions))
+            sys.exit(1)
+
+if __name__=="__main__":
+    main()
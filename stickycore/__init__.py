@@ -0,0 +1,39 @@
+# stickycore —— 便签 / 待办的纯 Python 核心（不导入 Qt），给脚本、定时任务和无界面服务器用
+#
+#   import stickycore
+#   n = stickycore.open_note("a.sn"); n.append("\n明天开会"); n.save()
+#   t = stickycore.open_todos("b.snt"); t.add("买牛奶"); t.close()
+#
+# 子模块按需导入：import stickycore 本身只定义名字表，第一次用到某个名字时才加载
+# 对应的模块，所以只读一个便签的脚本不会为 sqlite、搜索索引等付出导入时间。
+# 这里列出的名字是对外的稳定接口。StickyNote 直接用 stickycore.notes.Note；
+# TodoList 有自己的行模型和 id 计数，和 TodoFile 一样直接写 TodoJournal 的操作日志，
+# 不经过 TodoFile——两者共用的是文件格式和 TodoJournal，而不是 TodoFile 对象。
+import importlib
+
+__version__ = "1.0"
+
+_EXPORTS = {
+    # 便签
+    "Note": "stickycore.notes", "open_note": "stickycore.notes", "new_note": "stickycore.notes",
+    "read_note_header": "NoteFormat", "validate_note_file": "NoteFormat",
+    # 待办
+    "TodoFile": "stickycore.todos", "open_todos": "stickycore.todos", "TODO_EXT": "TodoJournal",
+    # 配色
+    "COLOR_SCHEMES": "Theme", "get_theme": "Theme", "random_theme": "Theme",
+    # 仓库与搜索
+    "open_repository": "stickycore.notes", "open_index": "stickycore.notes",
+}
+
+__all__ = sorted(_EXPORTS)
+
+def __getattr__(name):
+    mod = _EXPORTS.get(name)
+    if mod is None:
+        raise AttributeError(f"module 'stickycore' has no attribute {name!r}")
+    value = getattr(importlib.import_module(mod), name)
+    globals()[name] = value     # 之后直接命中，不再走 __getattr__
+    return value
+
+def __dir__():
+    return __all__ + ["__version__"]
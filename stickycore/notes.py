@@ -0,0 +1,58 @@
+# stickycore/notes.py —— 便签数据模型：读写 .sn（JSON 或 v2），不依赖 Qt
+import os
+
+from NoteFormat import read_note_file, write_note_file
+
+class Note:
+    __slots__ = ("title", "content", "geometry", "path", "extra")
+
+    def __init__(self, title="", content="", geometry=None, path=None, extra=None):
+        self.title = title
+        self.content = content
+        self.geometry = list(geometry) if geometry else None
+        self.path = path
+        self.extra = dict(extra or {})     # 不认识的字段原样保留，写回时不丢
+
+    @classmethod
+    def from_dict(cls, d, path=None):
+        extra = {k: v for k, v in d.items() if k not in ("title", "content", "geometry")}
+        return cls(d.get("title",""), d.get("content",""), d.get("geometry"), path, extra)
+
+    def to_dict(self):
+        d = dict(self.extra)
+        d["title"] = self.title
+        d["content"] = self.content
+        if self.geometry:
+            d["geometry"] = list(self.geometry)
+        return d
+
+    def append(self, text):
+        self.content += text
+        return self
+
+    def save(self, path=None, fmt=None):
+        # 原子写入；返回写入的字节数
+        path = path or self.path
+        if not path:
+            raise ValueError("便签没有文件路径")
+        self.path = path
+        return write_note_file(path, self.to_dict(), fmt=fmt)
+
+    def __repr__(self):
+        return f"Note(title={self.title!r}, {len(self.content)} chars, path={self.path!r})"
+
+def open_note(path):
+    return Note.from_dict(read_note_file(path), path=os.path.abspath(path))
+
+def new_note(title="", content="", path=None):
+    return Note(title, content, path=path)
+
+def open_repository(path=None):
+    # 打开 SQLite 便签仓库；不给路径时用默认位置（STICKYNOTES_HOME 或 ~/.stickynotes）
+    from NoteStore import NoteRepository, SqliteBackend, default_repository
+    return NoteRepository(SqliteBackend(path)) if path else default_repository()
+
+def open_index():
+    # 全文索引（与图形界面共用同一份索引文件）
+    from NoteSearch import default_index
+    return default_index()
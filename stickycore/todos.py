@@ -0,0 +1,91 @@
+# stickycore/todos.py —— 待办清单数据模型：读写 .snt 操作日志，不依赖 Qt
+#
+# 每次修改只往文件末尾追加一行。
+# 同一个文件同时只支持一个写入方：TodoFile 和 TodoList 各自只在打开时重放一次日志，
+# 之后按自己的计数器分配 id，不会读到对方追加的内容；压缩时整体替换文件，
+# 另一方手里的追加句柄会落到旧文件上。脚本修改前先关掉图形界面里的这张清单。
+import os
+
+from TodoJournal import TodoJournal, TODO_EXT
+
+class TodoFile:
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+        self.journal = TodoJournal(self.path)
+        if os.path.exists(self.path):
+            self.items = self.journal.load()
+        else:
+            self.items = []
+            self.journal.compact([], "Todo List")
+
+    @property
+    def title(self):
+        return self.journal.title
+
+    @title.setter
+    def title(self, text):
+        self.journal.title = text
+        self.journal.append("title", text)
+
+    def _find(self, item_id):
+        for i, it in enumerate(self.items):
+            if it["id"]==item_id:
+                return i, it
+        raise KeyError(item_id)
+
+    def add(self, text, done=False):
+        it = {"id": self.journal.new_id(), "text": text, "done": bool(done)}
+        self.items.append(it)
+        self.journal.append("add", it["id"], text, int(bool(done)))
+        return it["id"]
+
+    def edit(self, item_id, text):
+        self._find(item_id)[1]["text"] = text
+        self.journal.append("edit", item_id, text)
+
+    def check(self, item_id, done=True):
+        self._find(item_id)[1]["done"] = bool(done)
+        self.journal.append("check", item_id, int(bool(done)))
+
+    def set_due(self, item_id, due, remind=None):
+        # epoch 秒；与 TodoList.set_due、日志里的 due 操作一致：remind 为 None 表示不提醒，
+        # 到期时提醒就传 remind=due；due 为 None 即清除两者
+        it = self._find(item_id)[1]
+        it.pop("due", None); it.pop("remind", None)
+        if due is not None: it["due"] = due
+        if remind is not None and due is not None: it["remind"] = remind
+        self.journal.append("due", item_id, it.get("due"), it.get("remind"))
+
+    def remove(self, item_id):
+        i, _ = self._find(item_id)
+        del self.items[i]
+        self.journal.append("del", item_id)
+
+    def move(self, item_id, index):
+        i, it = self._find(item_id)
+        del self.items[i]; self.items.insert(index, it)
+        self.journal.append("move", item_id, index)
+
+    def pending(self):
+        return [it for it in self.items if not it["done"]]
+
+    def close(self):
+        # 日志明显长于条目数时顺便压缩一次
+        if self.journal.needs_compaction(len(self.items)):
+            self.journal.compact(self.items)
+        self.journal.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __repr__(self):
+        return f"TodoFile({self.path!r}, {len(self.items)} items)"
+
+def open_todos(path):
+    # 文件不存在时新建；路径没有扩展名时补上 .snt
+    if not os.path.splitext(path)[1]:
+        path += TODO_EXT
+    return TodoFile(path)
@@ -0,0 +1,13 @@
+# 测试共用：无界面平台、隔离的数据目录；需要界面的用例没装 PyQt5 时跳过
+import os, sys, tempfile
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ["STICKYNOTES_HOME"] = tempfile.mkdtemp(prefix="sn-test-")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    QtWidgets = pytest.importorskip("PyQt5.QtWidgets")
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
@@ -0,0 +1,52 @@
+import json
+
+import NoteHistory
+from NoteHistory import NoteHistory as History, KEYFRAME, recording
+
+
+def _write_history(path, n):
+    h = History(str(path), "note:t")
+    for i in range(n):
+        h.record("第 %d 版\n" % i + "正文" * 50, "t", t=1000.0 + i)
+    return h
+
+
+def test_corrupted_line_is_skipped(tmp_path):
+    path = tmp_path / "a.snh"
+    _write_history(path, 5)
+    lines = path.read_bytes().splitlines(keepends=True)
+    lines[3] = b'["d",1002.0,"t",3,\xff\n'         # 第 3 个修订（差异）写坏了
+    path.write_bytes(b"".join(lines) + b'["f",1009')   # 外加写了一半的尾行
+
+    h = History(str(path))
+    assert h.bad_lines == [4, 5, 6]     # 坏行本身 + 之后缺了基准的差异
+    assert len(h) == 2
+    assert h.text(1).startswith("第 1 版")
+    assert not path.read_bytes().endswith(b"1009")
+
+    assert h.record("新的一版", "t") > 0
+    again = History(str(path))
+    assert len(again) == 3 and again.text(2) == "新的一版"
+    assert again.text(0).startswith("第 0 版")
+
+
+def test_keyframe_after_bad_line_restores_chain(tmp_path):
+    path = tmp_path / "b.snh"
+    _write_history(path, KEYFRAME + 3)
+    lines = path.read_bytes().splitlines(keepends=True)
+    lines[2] = b"garbage\n"
+    path.write_bytes(b"".join(lines))
+    h = History(str(path))
+    assert len(h) == KEYFRAME + 3 - (KEYFRAME - 1)
+    assert h.text(len(h)-1).startswith("第 %d 版" % (KEYFRAME + 2))
+    assert json.loads(lines[0])[0] == "snhist"
+
+
+def test_history_failure_does_not_fail_save(tmp_path, monkeypatch):
+    def broken(doc_id):
+        raise ValueError("不是修订历史文件")
+    monkeypatch.setattr(NoteHistory, "history_for", broken)
+    saved = []
+    run = recording(lambda d: saved.append(d) or 7, "note:x")
+    assert run({"content": "c", "title": "t"}) == 7
+    assert saved == [{"content": "c", "title": "t"}]
@@ -0,0 +1,34 @@
+import os, threading, time
+
+
+def _off_thread(qapp, fn, timeout=10):
+    # 客户端用的是阻塞式 waitFor*，放到线程里跑，主线程继续处理服务端的事件
+    out = {}
+    t = threading.Thread(target=lambda: out.setdefault("r", fn()))
+    t.start()
+    end = time.time() + timeout
+    while t.is_alive() and time.time() < end:
+        qapp.processEvents(); time.sleep(0.005)
+    t.join(0)
+    return out.get("r")
+
+
+def test_probe_and_handoff_open_one_window(qapp):
+    from SingleInstance import SingleInstanceServer, forward_or_listen, is_running
+    name = f"StickyNotes-test-{os.getpid()}"
+    first = SingleInstanceServer(name)
+    assert first.listen()
+    windows = []     # 同 Main.py：open_files(paths) or create_note()
+    first.open_requested.connect(lambda paths: windows.append(paths or ["<new note>"]))
+    try:
+        # 第二个实例试图监听：名字已被占用，只 ping 确认对方活着，不能顺带开窗口
+        second = _off_thread(qapp, lambda: SingleInstanceServer(name).listen())
+        assert second is False
+        assert _off_thread(qapp, lambda: is_running(name))
+        assert windows == []
+        # 真正的启动转交：恰好一个窗口
+        assert _off_thread(qapp, lambda: forward_or_listen([], name)) is None
+        qapp.processEvents()
+        assert windows == [["<new note>"]]
+    finally:
+        first.close()
@@ -0,0 +1,34 @@
+import time
+
+
+def test_paste_into_fresh_list_splits_lines(qapp):
+    from TodoList import TodoList
+    w = TodoList(visible=False)
+    first = w._rows()[0]
+    assert first.txt.paste_handler is not None
+    first.txt.paste_handler(first.txt, "买牛奶\n- 交周报\n[x] 订机票")
+    texts = [r.txt.text() for r in w._rows()]
+    assert texts[:3] == ["买牛奶", "交周报", "订机票"]
+    assert len(texts) == 9
+    assert w._rows()[2].chk.isChecked()
+
+
+def test_checking_default_row_cancels_reminder(qapp):
+    from TodoList import TodoList
+    from Reminders import default_reminders
+    queue = default_reminders().queue
+    w = TodoList(visible=False)
+    row = w._rows()[0]
+    due = time.time() + 3600
+    before = len(queue)
+    assert w.set_due(row.item_id, due, due)
+    assert len(queue) == before + 1
+    row.chk.setChecked(True)
+    assert len(queue) == before
+    row.chk.setChecked(False)
+    assert len(queue) == before + 1
+    w.clear_completed()         # 未勾选，不删
+    assert len(queue) == before + 1
+    row.chk.setChecked(True); row.chk.setChecked(False)
+    w._log_many([("del", row.item_id)])
+    assert len(queue) == before